@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import CONVERSIONS, time_stage
+from benchmarks.synthetic import create_config
+from datetime import datetime
+from lib.baseclasses import ConversionType, converttoobj
+from lib.buildcache import GENERATOR_VERSION
+
+__all__ = [
+    "compare_results",
+    "create_configs",
+]
+
+
+def create_configs(fields: int, tasks: int) -> list[tuple]:
+    """
+    It creates the parameters of the tasks of a TYPE1 and a HISTORY config
+
+    Args:
+      fields (int): the number of source_to_target fields per task.
+      tasks (int): the number of tasks per config.
+
+    Returns:
+      A list of the config and conversion type of each parameter of each task.
+    """
+    configs = []
+    for target_type in ["TYPE1", "HISTORY"]:
+        config = create_config(
+            f"bench_{target_type.lower()}",
+            tasks=tasks,
+            fields=fields,
+            joins=4,
+            target_type=target_type,
+            delta=True,
+        )
+        for task in config["tasks"]:
+            parameters = task["parameters"]
+            configs.extend(
+                (parameters[key], conversion)
+                for key, conversion in CONVERSIONS
+                if parameters.get(key)
+            )
+    return configs
+
+
+def compare_results(
+    results: list[dict], baseline: dict, tolerance: float = 0.1
+) -> list[str]:
+    """
+    It compares the minimum time of each conversion type with that of a previous run, i.e. of the
+    previous version of the decoders
+
+    Args:
+      results (list[dict]): the results of this run.
+      baseline (dict): the JSON written by a previous run.
+      tolerance (float): the fraction a time may exceed the previous time by. Defaults to 0.1
+
+    Returns:
+      The conversion types which are slower than in the previous run.
+    """
+    previous = {r["conversion"]: r["min"] for r in baseline.get("results", [])}
+    slower = []
+    for result in results:
+        before = previous.get(result["conversion"])
+        if not before:
+            continue
+        change = result["min"] / before - 1
+        print(
+            f"{result['conversion']:>16}: {change * 100:+6.1f}% against the baseline",
+            file=sys.stderr,
+        )
+        if change > tolerance:
+            slower.append(result["conversion"])
+    return slower
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It times converttoobj for each conversion type of the parameters of wide configs and writes the
+    results as JSON.  Where a baseline is given the results are compared with it, the expected output
+    of the decoders is checked by tests/test_decode.py
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    configs = create_configs(args.fields, args.tasks)
+
+    results = []
+    for conversiontype in ConversionType:
+        selected = [c for c, t in configs if t == conversiontype]
+        if not selected:
+            continue
+        result = time_stage(
+            lambda: [converttoobj(c, conversiontype) for c in selected], args.repeat
+        )
+        result["conversion"] = conversiontype.value
+        result["configs"] = len(selected)
+        results.append(result)
+        print(
+            f"{conversiontype.value:>16}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms",
+            file=sys.stderr,
+        )
+
+    slower = []
+    if args.baseline:
+        with open(args.baseline, "r") as sourcefile:
+            slower = compare_results(
+                results, json.loads(sourcefile.read()), args.tolerance
+            )
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "slower": slower,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the decoding of the configs of tasks to model objects"
+    )
+    parser.add_argument(
+        "--fields", type=int, default=500, help="number of source_to_target fields"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=10, help="number of tasks of each config"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs of each case"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="JSON results of a previous run, i.e. of the previous version, to compare with",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="fraction a time may exceed the baseline by before it is reported as slower",
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
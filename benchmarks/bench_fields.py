@@ -0,0 +1,352 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import create_tasks, time_stage
+from benchmarks.synthetic import SOURCE_DATASET, create_config, create_source_table
+from datetime import datetime
+from lib.baseclasses import ConversionType, Field, converttoobj
+from lib.buildcache import GENERATOR_VERSION
+from lib.helper import isnullorwhitespace
+from lib.logger import ILogger
+from lib.sql_helper import create_sql, create_sql_task, create_type_2_sql
+
+__all__ = [
+    "create_transformation_fields",
+    "check_fields",
+]
+
+
+def create_transformation_fields(count: int, joins: int) -> list[dict]:
+    """
+    It creates the source_to_target of a wide table where every field is a transformation with no name,
+    so the name is derived from the transformation.  The transformations are casts, functions, case
+    expressions and references to the dataset and table of the source table, which source() replaces
+    with its alias
+
+    Args:
+      count (int): the number of fields to create.
+      joins (int): the number of joined tables the fields are spread across.
+
+    Returns:
+      A list of source_to_target fields.
+    """
+    source_to_target = []
+    for i in range(count):
+        table = create_source_table(i % (joins + 1))
+        column = f"{table['alias']}.column_{i}"
+        transformation = [
+            f"cast(column_{i} as STRING)",
+            f"upper({column})",
+            f"case when {column} is null then 'N' else 'Y' end",
+            f"coalesce({SOURCE_DATASET}.{table['table_name']}.column_{i}, '')",
+        ][i % 4]
+        source_to_target.append(
+            {
+                "transformation": transformation,
+                "source_table": table,
+                "data_type": "STRING",
+            }
+        )
+    return source_to_target
+
+
+def legacy_name(field: Field) -> str:
+    """
+    It is Field.name before it was cached, kept as the reference the cached name is checked against
+
+    Args:
+      field (Field): the field.
+
+    Returns:
+      The name of the column
+    """
+    if isnullorwhitespace(field._name):
+        if isnullorwhitespace(field._source_column) and not isnullorwhitespace(
+            field.transformation
+        ):
+            regex = r"(?:(?P<function>\b\w+\b)?\()?(?:(?P<cast_col>\w+) as (?P<cast_type>\w+))?(?P<decode>case)?"
+            m = re.search(regex, field.transformation, re.IGNORECASE)
+            if m:
+                if not isnullorwhitespace(
+                    m.group("cast_col")
+                ) and not isnullorwhitespace(m.group("cast_type")):
+                    return f"{m.group('cast_col')}_{m.group('cast_type')}"
+                elif not isnullorwhitespace(m.group("decode")):
+                    return m.group("decode")
+                elif not isnullorwhitespace(m.group("function")):
+                    return m.group("function")
+        else:
+            return field._source_column
+
+    return field._name
+
+
+def legacy_source_column(field: Field) -> str:
+    """
+    It is Field.source_column before it was cached
+
+    Args:
+      field (Field): the field.
+
+    Returns:
+      The source column name.
+    """
+    if isnullorwhitespace(field._source_column) and isnullorwhitespace(
+        field.transformation
+    ):
+        return field._name
+
+    return field._source_column
+
+
+def legacy_source(field: Field, default_source_name: str = None) -> str:
+    """
+    It is Field.source() before it was cached
+
+    Args:
+      field (Field): the field.
+      default_source_name (str): The name of the source table if the source table is not specified.
+
+    Returns:
+      The source column name, the source table name, or the transformation.
+    """
+    if isnullorwhitespace(field.transformation):
+        if field.source_table is None and isnullorwhitespace(default_source_name):
+            return legacy_source_column(field)
+
+        if field.source_table:
+            return f"{field.source_table.alias}.{legacy_source_column(field)}"
+
+        return f"{default_source_name}.{legacy_source_column(field)}"
+
+    table = (
+        f"{field.source_table.dataset_name}.{field.source_table.table_name}"
+        if field.source_table
+        else None
+    )
+
+    return (
+        field.transformation.replace(table, field.source_table.alias)
+        if table
+        else field.transformation
+    )
+
+
+def read_fields(objects: list, reads: int, legacy: bool = False) -> int:
+    """
+    It reads the name, source_column and source() of each field reads times, as the sql generator
+    reads them once for each query a field appears in
+
+    Args:
+      objects (list): the Field objects.
+      reads (int): the number of times each field is read.
+      legacy (bool): where True the fields are read with the legacy functions. Defaults to False
+
+    Returns:
+      The number of values which are set, so the reads are not optimised away.
+    """
+    count = 0
+    for _ in range(reads):
+        for field in objects:
+            if legacy:
+                values = (
+                    legacy_name(field),
+                    legacy_source_column(field),
+                    legacy_source(field, "src"),
+                )
+            else:
+                values = (field.name, field.source_column, field.source("src"))
+            for value in values:
+                if value:
+                    count += 1
+    return count
+
+
+def compare_field(field: Field, description: str) -> int:
+    """
+    It compares the cached name, source_column and source() of a field with the legacy functions
+
+    Args:
+      field (Field): the field.
+      description (str): what was done to the field, for the error message.
+
+    Returns:
+      The number of values which differ.
+    """
+    errors = 0
+    for default_source_name in (None, "src"):
+        for attribute, cached, legacy in (
+            ("name", field.name, legacy_name(field)),
+            ("source_column", field.source_column, legacy_source_column(field)),
+            (
+                "source",
+                field.source(default_source_name),
+                legacy_source(field, default_source_name),
+            ),
+        ):
+            if cached != legacy:
+                errors += 1
+                print(
+                    f"{attribute} differs {description}: {cached!r} != {legacy!r}",
+                    file=sys.stderr,
+                )
+    return errors
+
+
+def check_fields(fields: list[dict]) -> int:
+    """
+    It checks the cached name, source_column and source() of each field match the legacy functions,
+    as converted and after each attribute they are derived from is set
+
+    Args:
+      fields (list[dict]): the source_to_target to check.
+
+    Returns:
+      The number of values which differ.
+    """
+    errors = 0
+    for field in converttoobj(fields, ConversionType.SOURCE):
+        errors += compare_field(field, f"for {field.transformation!r}")
+
+        field.source_column = "column"
+        errors += compare_field(field, "after the source_column is set")
+        field.source_column = None
+
+        field.name = "name"
+        errors += compare_field(field, "after the name is set")
+        field.name = None
+
+        field.transformation = "cast(changed as INT64)"
+        errors += compare_field(field, "after the transformation is set")
+        field.transformation = None
+
+        if field.source_table:
+            field.source_table.alias = "changed"
+            errors += compare_field(field, "after the source table alias is changed")
+        field.source_table = None
+        errors += compare_field(field, "after the source_table is set")
+    return errors
+
+
+def run_fields(
+    logger: ILogger, count: int, joins: int, reads: int, repeat: int
+) -> list[dict]:
+    """
+    It times reading the derived attributes of a wide table of transformation only fields with the
+    legacy functions and cached, cold and warm, and generating the sql of a TYPE1 task of the fields
+    and of a HISTORY task of the same width
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      count (int): the number of fields.
+      joins (int): the number of joined tables the fields are spread across.
+      reads (int): the number of times each field is read.
+      repeat (int): the number of times to run each case.
+
+    Returns:
+      A list of dictionaries, one for each case, of the timings.
+    """
+    fields = create_transformation_fields(count, joins)
+    objects = converttoobj(fields, ConversionType.SOURCE)
+
+    # a copy does not carry the cached values, so each cold run reads a fresh copy
+    cold = [copy.deepcopy(objects) for _ in range(repeat)]
+
+    config = create_config("bench_0", fields=count, joins=joins)
+    config["tasks"][0]["parameters"]["source_to_target"] = fields
+    task = create_tasks(config)[0]
+    history_task = create_sql_task(
+        create_tasks(create_config("bench_1", fields=count, target_type="HISTORY"))[0],
+        "bench_stg",
+    )
+
+    cases = {
+        "legacy": lambda: read_fields(objects, reads, legacy=True),
+        "cold": lambda: read_fields(cold.pop(), reads),
+        "warm": lambda: read_fields(objects, reads),
+        "create_sql": lambda: create_sql(logger, task, "bench_stg"),
+        "create_type_2_sql": lambda: create_type_2_sql(logger, history_task),
+    }
+
+    results = []
+    for case, function in cases.items():
+        result = time_stage(function, repeat)
+        result["case"] = case
+        result["fields"] = count
+        results.append(result)
+        print(
+            f"{case:>18}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It checks the cached attributes match the legacy functions, runs the cases and writes the results
+    as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    logger = ILogger("bench_fields", None, "CRITICAL")
+
+    errors = check_fields(create_transformation_fields(args.fields, args.joins))
+    results = run_fields(logger, args.fields, args.joins, args.reads, args.repeat)
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "errors": errors,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check and time the derived attributes of fields on a wide table of transformations"
+    )
+    parser.add_argument(
+        "--fields", type=int, default=2000, help="number of transformation fields"
+    )
+    parser.add_argument(
+        "--joins",
+        type=int,
+        default=4,
+        help="number of tables the fields are joined from",
+    )
+    parser.add_argument(
+        "--reads",
+        type=int,
+        default=5,
+        help="number of times each field is read in a run",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs of each case"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,266 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import buildjobs
+
+from benchmarks.synthetic import create_config, write_configs
+from datetime import datetime
+from lib.baseclasses import ConversionType, Task, converttoobj
+from lib.buildcache import GENERATOR_VERSION
+from lib.builddags import builddags
+from lib.jobmodel import create_job
+from lib.jsonhelper import IJSONValidate, clear_validators, get_json
+from lib.logger import ILogger
+from lib.sql_helper import create_sql, create_sql_task, create_type_2_sql
+
+__all__ = [
+    "run_workload",
+]
+
+STAGES = [
+    "IJSONValidate",
+    "IJSONValidate.compile",
+    "converttoobj",
+    "create_sql",
+    "create_type_2_sql",
+    "builddags",
+    "buildjobs.main",
+]
+
+CONVERSIONS = [
+    ("source_to_target", ConversionType.SOURCE),
+    ("source_tables", ConversionType.SOURCETABLES),
+    ("joins", ConversionType.JOIN),
+    ("where", ConversionType.WHERE),
+    ("delta", ConversionType.DELTA),
+    ("history", ConversionType.ANALYTIC),
+]
+
+
+def time_stage(function, repeat: int) -> dict:
+    """
+    It calls the function repeat times and returns statistics of the wall clock time of the calls
+
+    Args:
+      function: a function taking no arguments.
+      repeat (int): the number of times to call the function.
+
+    Returns:
+      A dictionary of the runs and the min, median, mean and max time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "runs": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+    }
+
+
+def create_tasks(config: dict) -> list[Task]:
+    """
+    It creates a Task object for each task of the config
+
+    Args:
+      config (dict): the content of the config file.
+
+    Returns:
+      A list of Task objects.
+    """
+    return [
+        Task(
+            t.get("task_id"),
+            t.get("operator"),
+            t.get("parameters"),
+            t.get("author"),
+            t.get("dependencies", []),
+            t.get("description"),
+        )
+        for t in config["tasks"]
+    ]
+
+
+def run_workload(
+    logger: ILogger, workload: dict, repeat: int, stages: list[str]
+) -> list[dict]:
+    """
+    It creates the synthetic configs of a workload and times each stage of the generator against them.
+    buildjobs.main builds every config of the workload, the other stages are timed against the first
+    config only
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      workload (dict): the arguments passed to create_config plus configs, the number of configs.
+      repeat (int): the number of times to run each stage.
+      stages (list[str]): the stages to time.
+
+    Returns:
+      A list of dictionaries, one for each stage, of the workload, stage and timings.
+    """
+    workload = dict(workload)
+    configs = workload.pop("configs")
+    config = create_config("bench_0", **workload)
+    tasks = create_tasks(config)
+    history_tasks = [
+        create_sql_task(task, "bench_stg")
+        for task in tasks
+        if task.parameters.get("target_type") == "HISTORY"
+    ]
+    schema = get_json(logger, "./bq_application/job/schema_cfg_job.json")
+
+    results = []
+    work_dir = tempfile.mkdtemp(prefix="bench_generator_")
+    try:
+        args = {
+            "config": os.path.join(work_dir, "cfg"),
+            "dag": os.path.join(work_dir, "dags"),
+            "dag_sql": os.path.join(work_dir, "dags_sql"),
+            "batch_scr": os.path.join(work_dir, "scr"),
+            "batch_sql": os.path.join(work_dir, "sql"),
+            "table_def_file": os.path.join(work_dir, "tables"),
+            "table_cfg": os.path.join(work_dir, "tcfg"),
+            "manifest": os.path.join(work_dir, "manifest.json"),
+            "force": True,
+            "workers": 1,
+        }
+        for key, value in args.items():
+            if key not in ["config", "manifest", "force", "workers"]:
+                os.makedirs(value, exist_ok=True)
+        write_configs(args["config"], configs, **workload)
+
+        functions = {
+            "IJSONValidate": lambda: IJSONValidate(logger, schema, config),
+            "IJSONValidate.compile": lambda: (
+                clear_validators(),
+                IJSONValidate(logger, schema, config),
+            ),
+            "converttoobj": lambda: [
+                converttoobj(task.parameters.get(key), conversion)
+                for task in tasks
+                for key, conversion in CONVERSIONS
+            ],
+            "create_sql": lambda: [
+                create_sql(logger, task, "bench_stg") for task in tasks
+            ],
+            "create_type_2_sql": lambda: [
+                create_type_2_sql(logger, task) for task in history_tasks
+            ],
+            "builddags": lambda: builddags(
+                logger, args, create_job(dict(config, type="DAG"))
+            ),
+            "buildjobs.main": lambda: buildjobs.main(logger, args),
+        }
+
+        for stage in stages:
+            if stage == "create_type_2_sql" and len(history_tasks) == 0:
+                continue
+            result = {"workload": dict(workload, configs=configs), "stage": stage}
+            result.update(time_stage(functions[stage], repeat))
+            results.append(result)
+            logger.critical(
+                f"{stage:>20}: median {result['median'] * 1000:10.3f} ms {result['workload']}"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return results
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It runs each combination of the workload sizes supplied and writes the results as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    logger = ILogger("bench_generator", None, "CRITICAL")
+
+    results = []
+    for configs, tasks, fields, joins, depth in itertools.product(
+        args.configs, args.tasks, args.fields, args.joins, args.depth
+    ):
+        workload = {
+            "configs": configs,
+            "tasks": tasks,
+            "fields": fields,
+            "joins": joins,
+            "target_type": args.target_type,
+            "delta": args.delta,
+            "depth": depth,
+        }
+        results.extend(run_workload(logger, workload, args.repeat, args.stages))
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the stages of the generator against synthetic configs"
+    )
+    parser.add_argument(
+        "--configs", type=int, nargs="+", default=[1], help="number of configs"
+    )
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[5], help="number of tasks per config"
+    )
+    parser.add_argument(
+        "--fields", type=int, nargs="+", default=[20], help="number of fields per task"
+    )
+    parser.add_argument(
+        "--joins", type=int, nargs="+", default=[2], help="number of joins per task"
+    )
+    parser.add_argument(
+        "--depth", type=int, nargs="+", default=[1], help="dependency chain length"
+    )
+    parser.add_argument(
+        "--target_type",
+        choices=["TYPE1", "HISTORY", "MIXED"],
+        default="MIXED",
+        help="target type of the tasks",
+    )
+    parser.add_argument("--delta", action="store_true", help="add a delta to tasks")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs of each stage"
+    )
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES, default=STAGES, help="stages to time"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from datetime import datetime
+
+__all__ = [
+    "measure_import",
+]
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules which are slow to import and should only be loaded on first use
+LAZY_MODULES = [
+    "black",
+    "jinja2",
+    "fastjsonschema",
+    "lib.sql_helper",
+    "lib.baseclasses",
+    "logging.handlers",
+    "tempfile",
+    "xml.etree.ElementTree",
+]
+
+# the cumulative import time of a module, in milliseconds, which --check fails
+# above.  both scripts import in about 45 ms here
+MAX_IMPORT_MS = 75.0
+
+IMPORTTIME_PATTERN = re.compile(
+    r"^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<indent>\s+)(?P<module>\S+)$"
+)
+
+
+def parse_importtime(output: str) -> dict:
+    """
+    It converts the output of python -X importtime to a dictionary of module name to self and
+    cumulative import time
+
+    Args:
+      output (str): the stderr of the python process.
+
+    Returns:
+      A dictionary of module name to a dictionary of self and cumulative time in microseconds.
+    """
+    modules = {}
+    for line in output.splitlines():
+        m = IMPORTTIME_PATTERN.match(line)
+        if m:
+            modules[m.group("module")] = {
+                "self": int(m.group("self")),
+                "cumulative": int(m.group("cumulative")),
+            }
+    return modules
+
+
+def run_import(statement: str, importtime: bool) -> tuple[float, str]:
+    """
+    It runs the statement in a new python process from the root of the repository
+
+    Args:
+      statement (str): the python statement to run.
+      importtime (bool): where True the process is run with -X importtime.
+
+    Returns:
+      A tuple of the wall time of the process in seconds and its stderr.
+    """
+    command = [sys.executable]
+    if importtime:
+        command.extend(["-X", "importtime"])
+    command.extend(["-c", statement])
+
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=REPO_PATH, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement} failed:\n{result.stderr}")
+    return (wall, result.stderr)
+
+
+def measure_import(module: str, repeat: int, top: int) -> dict:
+    """
+    It measures the start-up cost of importing a module in a new process.  The wall time of the
+    process is measured without -X importtime, which adds its own overhead, and the slowest imports
+    are taken from the fastest -X importtime run
+
+    Args:
+      module (str): the module to import.
+      repeat (int): the number of processes to run.
+      top (int): the number of slowest imports to report.
+
+    Returns:
+      A dictionary of the wall times, the cumulative import time, the slowest imports and the lazy
+      modules which were imported.
+    """
+    walls = [run_import(f"import {module}", False)[0] for _ in range(repeat)]
+
+    runs = [
+        parse_importtime(run_import(f"import {module}", True)[1]) for _ in range(repeat)
+    ]
+    best = min(runs, key=lambda r: r.get(module, {}).get("cumulative", 0))
+
+    slowest = sorted(
+        [(name, times) for name, times in best.items() if name != module],
+        key=lambda item: item[1]["cumulative"],
+        reverse=True,
+    )[:top]
+
+    return {
+        "module": module,
+        "runs": repeat,
+        "wall_min": min(walls),
+        "wall_median": statistics.median(walls),
+        "import_cumulative_us": best.get(module, {}).get("cumulative"),
+        "slowest_imports": [dict(module=name, **times) for name, times in slowest],
+        "lazy_modules_imported": [m for m in LAZY_MODULES if m in best],
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It measures the interpreter start-up and the import of each module, the results are written as
+    JSON.  Where --check is supplied the exit code is 1 if a module imports one of the lazy modules or
+    its cumulative import time is over --max_ms
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    baseline = [run_import("pass", False)[0] for _ in range(args.repeat)]
+    results = [measure_import(m, args.repeat, args.top) for m in args.modules]
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "interpreter_wall_min": min(baseline),
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    failed = False
+    for result in results:
+        import_ms = (result["import_cumulative_us"] or 0) / 1000
+        print(
+            f"{result['module']:>20}: {(result['wall_min'] - min(baseline)) * 1000:8.1f} ms over interpreter start-up, {import_ms:8.1f} ms importing, lazy modules imported: {result['lazy_modules_imported']}",
+            file=sys.stderr,
+        )
+        if result["lazy_modules_imported"] or import_ms > args.max_ms:
+            failed = True
+
+    if args.check and failed:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the start-up import time of the generator scripts"
+    )
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=["buildjobs", "validatedagconfig"],
+        help="modules to import",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of processes to run per module"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="number of slowest imports to report"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with 1 where a module imports one of the lazy modules or takes over --max_ms to import",
+    )
+    parser.add_argument(
+        "--max_ms",
+        type=float,
+        default=MAX_IMPORT_MS,
+        help="cumulative import time of a module, in milliseconds, which --check fails above",
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import run_workload
+from datetime import datetime
+from lib.buildcache import GENERATOR_VERSION
+from lib.logger import ILogger
+from logging import Handler
+
+__all__ = [
+    "run_level",
+]
+
+STAGES = ["create_sql", "create_type_2_sql", "builddags", "buildjobs.main"]
+
+
+class CountHandler(Handler):
+    """
+    It counts the records which reach the handlers of the logger, so the cost of each level can be
+    compared with the number of messages written
+    """
+
+    def __init__(self):
+        Handler.__init__(self)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def create_logger(level: str) -> tuple:
+    """
+    It creates the logger used by the generator, with the stream handler writing to the null device so
+    the time measured is the time to create and format the messages rather than to display them
+
+    Args:
+      level (str): the log level, i.e. INFO
+
+    Returns:
+      A tuple of the logger and the handler counting its records.
+    """
+    logger = ILogger("bench_logging", None, level)
+    for handler in logger.handlers:
+        handler.setStream(open(os.devnull, "w"))
+
+    counter = CountHandler()
+    logger.addHandler(counter)
+    return logger, counter
+
+
+def run_level(level: str, workload: dict, repeat: int, stages: list[str]) -> list[dict]:
+    """
+    It times the stages of the generator with the logger at the level supplied
+
+    Args:
+      level (str): the log level, i.e. INFO
+      workload (dict): the arguments passed to create_config plus configs, the number of configs.
+      repeat (int): the number of times to run each stage.
+      stages (list[str]): the stages to time.
+
+    Returns:
+      A list of dictionaries, one for each stage, of the level, stage, timings, tasks per second and
+      records logged per run.
+    """
+    logger, counter = create_logger(level)
+    results = []
+    for stage in stages:
+        counter.count = 0
+        for result in run_workload(logger, workload, repeat, [stage]):
+            tasks = workload["tasks"] * (
+                workload["configs"] if stage == "buildjobs.main" else 1
+            )
+            result["level"] = level
+            result["tasks_per_second"] = tasks / result["median"]
+            result["records_per_run"] = counter.count // repeat
+            results.append(result)
+            print(
+                f"{level:>8} {stage:>20}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms, {result['tasks_per_second']:10.1f} tasks/s, {result['records_per_run']:7d} records",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It runs the stages at each level supplied and writes the results as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    workload = {
+        "configs": args.configs,
+        "tasks": args.tasks,
+        "fields": args.fields,
+        "joins": args.joins,
+        "target_type": args.target_type,
+        "delta": args.delta,
+        "depth": 1,
+    }
+
+    results = []
+    for level in args.levels:
+        results.extend(run_level(level, workload, args.repeat, args.stages))
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the generator with the logger at each level"
+    )
+    parser.add_argument(
+        "--levels",
+        nargs="+",
+        default=["INFO", "WARNING"],
+        help="log levels to time the generator at",
+    )
+    parser.add_argument("--configs", type=int, default=5, help="number of configs")
+    parser.add_argument(
+        "--tasks", type=int, default=5, help="number of tasks per config"
+    )
+    parser.add_argument(
+        "--fields", type=int, default=20, help="number of fields per task"
+    )
+    parser.add_argument("--joins", type=int, default=2, help="number of joins per task")
+    parser.add_argument(
+        "--target_type",
+        choices=["TYPE1", "HISTORY", "MIXED"],
+        default="MIXED",
+        help="target type of the tasks",
+    )
+    parser.add_argument("--delta", action="store_true", help="add a delta to tasks")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of runs of each stage"
+    )
+    parser.add_argument(
+        "--stages", nargs="+", choices=STAGES, default=STAGES, help="stages to time"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,172 @@
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import time_stage
+from benchmarks.synthetic import create_fields
+from datetime import datetime
+from lib.baseclasses import ConversionType, converttoobj
+from lib.buildcache import GENERATOR_VERSION
+
+__all__ = [
+    "measure_memory",
+    "run_models",
+]
+
+
+def measure_memory(fields: list[dict]) -> dict:
+    """
+    It measures the memory allocated to convert the source_to_target into Field objects, the memory of
+    the dictionaries of the config is not included
+
+    Args:
+      fields (list[dict]): the source_to_target of a task.
+
+    Returns:
+      A dictionary of the bytes allocated in total and for each field.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = converttoobj(fields, ConversionType.SOURCE)
+    allocated = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    del objects
+    return {"bytes": allocated, "bytes_per_field": allocated / len(fields)}
+
+
+def read_attributes(objects: list) -> int:
+    """
+    It reads the attributes of each field which the sql generator reads, plain and computed
+
+    Args:
+      objects (list): the Field objects.
+
+    Returns:
+      The number of attributes which are set, so the reads are not optimised away.
+    """
+    count = 0
+    for field in objects:
+        for value in (
+            field.data_type,
+            field.transformation,
+            field.source_table,
+            field.default,
+            field.name,
+            field.source_column,
+            field.nullable,
+            field.pk,
+            field.hk,
+        ):
+            if value:
+                count += 1
+    return count
+
+
+def run_models(count: int, joins: int, repeat: int) -> list[dict]:
+    """
+    It times the conversion, attribute access, copy and todict of a source_to_target and measures its
+    memory
+
+    Args:
+      count (int): the number of fields in the source_to_target.
+      joins (int): the number of joined tables the fields are spread across.
+      repeat (int): the number of times to run each case.
+
+    Returns:
+      A list of dictionaries, one for each case, of the timings and, for the conversion, the memory.
+    """
+    fields = create_fields(count, joins)
+    objects = converttoobj(fields, ConversionType.SOURCE)
+
+    # todict is only needed here, it is imported late so the benchmark can be
+    # run against trees where it moved
+    from lib.baseclasses import todict
+
+    cases = {
+        "converttoobj": lambda: converttoobj(fields, ConversionType.SOURCE),
+        "attributes": lambda: read_attributes(objects),
+        "deepcopy": lambda: copy.deepcopy(objects),
+        "todict": lambda: todict(objects),
+    }
+
+    results = []
+    for case, function in cases.items():
+        result = time_stage(function, repeat)
+        result["case"] = case
+        result["fields"] = count
+        if case == "converttoobj":
+            result.update(measure_memory(fields))
+        results.append(result)
+
+        memory = (
+            f", {result['bytes_per_field']:8.1f} bytes/field"
+            if "bytes" in result
+            else ""
+        )
+        print(
+            f"{case:>14}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms{memory}",
+            file=sys.stderr,
+        )
+    return results
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It runs the cases and writes the results as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    results = run_models(args.fields, args.joins, args.repeat)
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the memory and time of the model classes on a large source_to_target"
+    )
+    parser.add_argument(
+        "--fields", type=int, default=10000, help="number of source_to_target fields"
+    )
+    parser.add_argument(
+        "--joins",
+        type=int,
+        default=4,
+        help="number of tables the fields are joined from",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs of each case"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import CONVERSIONS, create_tasks, time_stage
+from benchmarks.synthetic import create_config
+from datetime import datetime
+from enum import Enum
+from lib.baseclasses import converttoobj, get_slots, todict, tojson
+from lib.buildcache import GENERATOR_VERSION
+from lib.sql_helper import create_sql_task
+
+__all__ = [
+    "create_objects",
+    "check_objects",
+]
+
+
+def legacy_todict(obj, classkey=None):
+    """
+    It is todict before the conversion of each class was registered, kept as the reference the
+    conversions are checked against
+
+    Args:
+      obj: The object to convert to a dictionary.
+      classkey: If this is provided, the resulting dictionary will include a key for the class name of
+    the object.
+
+    Returns:
+      A dictionary of the object's attributes.
+    """
+    if isinstance(obj, dict):
+        data = {}
+        for (k, v) in obj.items():
+            data[k] = legacy_todict(v, classkey)
+        return data
+    elif hasattr(obj, "_ast"):
+        return legacy_todict(obj._ast())
+    elif hasattr(obj, "__iter__") and not isinstance(obj, str):
+        return [legacy_todict(v, classkey) for v in obj]
+    elif issubclass(type(obj), Enum):
+        return obj.name
+    elif hasattr(type(obj), "__slots__"):
+        data = {}
+        for slot, key in get_slots(type(obj)):
+            value = getattr(obj, slot, legacy_todict)
+            if value is not legacy_todict and not callable(value):
+                data[key] = legacy_todict(value, classkey)
+        if classkey is not None:
+            data[classkey] = obj.__class__.__name__
+        return data
+    elif hasattr(obj, "__dict__"):
+        data = dict(
+            [
+                (re.sub(r"^_", "", key, re.IGNORECASE), legacy_todict(value, classkey))
+                for key, value in obj.__dict__.items()
+                if not callable(value)
+            ]
+        )
+        if classkey is not None and hasattr(obj, "__class__"):
+            data[classkey] = obj.__class__.__name__
+        return data
+    else:
+        return obj
+
+
+def create_objects(fields: int, tasks: int) -> dict:
+    """
+    It creates the objects todict is called with: the tasks of a TYPE1 and a HISTORY config, their
+    SQL tasks and converted parameters
+
+    Args:
+      fields (int): the number of source_to_target fields per task.
+      tasks (int): the number of tasks per config.
+
+    Returns:
+      A dictionary of the name of each kind of object to a list of the objects.
+    """
+    objects = {"task": [], "sql_task": [], "parameters": []}
+    for target_type in ["TYPE1", "HISTORY"]:
+        config = create_config(
+            f"bench_{target_type.lower()}",
+            tasks=tasks,
+            fields=fields,
+            joins=2,
+            target_type=target_type,
+            delta=True,
+        )
+        for task in create_tasks(config):
+            objects["task"].append(task)
+            objects["parameters"].extend(
+                converttoobj(task.parameters.get(key), conversion)
+                for key, conversion in CONVERSIONS
+                if task.parameters.get(key)
+            )
+            objects["sql_task"].append(create_sql_task(task, "bench_stg"))
+    return objects
+
+
+def check_objects(objects: dict) -> int:
+    """
+    It checks todict and tojson of each object match the legacy todict, with and without a classkey,
+    and as compact and indented JSON
+
+    Args:
+      objects (dict): the objects by kind.
+
+    Returns:
+      The number of objects which differ.
+    """
+    errors = 0
+    for kind, values in objects.items():
+        for obj in values:
+            checks = [
+                ("todict", todict(obj), legacy_todict(obj)),
+                ("classkey", todict(obj, "cls"), legacy_todict(obj, "cls")),
+                (
+                    "tojson",
+                    tojson(obj),
+                    json.dumps(legacy_todict(obj), separators=(",", ":")),
+                ),
+                (
+                    "tojson indent",
+                    tojson(obj, indent=4, sort_keys=True),
+                    json.dumps(legacy_todict(obj), indent=4, sort_keys=True),
+                ),
+            ]
+            for check, value, legacy in checks:
+                if value != legacy:
+                    errors += 1
+                    print(f"{check} of a {kind} differs", file=sys.stderr)
+    return errors
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It checks the conversions match the legacy todict, times todict and tojson against the legacy
+    todict for each kind of object and writes the results as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    objects = create_objects(args.fields, args.tasks)
+    errors = check_objects(objects)
+
+    results = []
+    for kind, values in objects.items():
+        cases = {
+            "legacy": lambda: [legacy_todict(o) for o in values],
+            "todict": lambda: [todict(o) for o in values],
+            "legacy json": lambda: [
+                json.dumps(legacy_todict(o), separators=(",", ":")) for o in values
+            ],
+            "tojson": lambda: [tojson(o) for o in values],
+        }
+        for case, function in cases.items():
+            result = time_stage(function, args.repeat)
+            result["kind"] = kind
+            result["case"] = case
+            result["objects"] = len(values)
+            results.append(result)
+            print(
+                f"{kind:>12} {case:>12}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms",
+                file=sys.stderr,
+            )
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generator_version": GENERATOR_VERSION,
+            "errors": errors,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check and time the conversion of the model classes to dictionaries and JSON"
+    )
+    parser.add_argument(
+        "--fields", type=int, default=200, help="number of source_to_target fields"
+    )
+    parser.add_argument(
+        "--tasks", type=int, default=10, help="number of tasks of each config"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs of each case"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
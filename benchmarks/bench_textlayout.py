@@ -0,0 +1,228 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_generator import time_stage
+from datetime import datetime
+from lib.helper import FileType, format_comment, format_description
+from lib.logger import format_message
+from lib.textlayout import wrap_text
+
+__all__ = [
+    "create_texts",
+    "check_layouts",
+]
+
+FUNCTIONS = ["format_message", "format_comment", "format_description"]
+
+WORDS = [
+    "a",
+    "id",
+    "the",
+    "table",
+    "source",
+    "customer_id",
+    "dim_customer",
+    "LEFT_OUTER_JOIN",
+    "effective_from_date",
+    "spine_offer_fact_offer_history_delta",
+    "x" * 90,
+    "y" * 170,
+]
+
+
+def legacy_wrap(
+    text: str, width: int, prefix: str, first_prefix, continued_length: int
+) -> str:
+    """
+    It is the layout of format_message, format_comment and format_description before they shared
+    wrap_text, kept as the reference the layouts are checked against
+
+    Args:
+      text (str): the text to lay out.
+      width (int): the width a line must be less than.
+      prefix (str): the start of each line after the first.
+      first_prefix (str): the start of the first line, None for no prefix.
+      continued_length (int): the length each line after the first is counted from.
+
+    Returns:
+      The lines joined by new lines.
+    """
+    m = re.findall(r"([^\s]+)", text, re.IGNORECASE)
+
+    lines = []
+    line = [] if first_prefix is None else [first_prefix]
+    line_length_cnt = len(prefix) if first_prefix is None else len(first_prefix)
+    for word in m:
+        if (line_length_cnt + len(word) + len(line)) < width:
+            line.append(word)
+            line_length_cnt += len(word)
+        else:
+            lines.append(line)
+            line = [prefix, word.strip()]
+            line_length_cnt = len(word) + continued_length
+
+    if not line in lines:
+        lines.append(line)
+
+    joined_lines = []
+    for line in lines:
+        joined_lines.append(" ".join(line))
+
+    return "\n".join(joined_lines)
+
+
+def get_layouts() -> dict:
+    """
+    It returns the arguments of wrap_text used by each function
+
+    Returns:
+      A dictionary of function name to a function of the text returning the arguments.
+    """
+    return {
+        "format_message": lambda text: (text, 180, "".ljust(79), None, 20),
+        "format_comment": lambda text: (text, 80, "--", "--", 3),
+        "format_description": lambda text: (
+            text,
+            80,
+            "--               :",
+            "-- description   :",
+            20,
+        ),
+    }
+
+
+def call_function(name: str, text: str) -> str:
+    """
+    It calls the formatting function with the text
+
+    Args:
+      name (str): the name of the function, i.e. format_comment
+      text (str): the text to format.
+
+    Returns:
+      The formatted text.
+    """
+    if name == "format_message":
+        return format_message(text)
+    if name == "format_comment":
+        return format_comment(text, FileType.SQL)
+    return format_description(text, "description", FileType.SQL)
+
+
+def create_texts(count: int, seed: int = 0) -> list[str]:
+    """
+    It creates texts of random words and lengths, including the whitespace, long words and repeated
+    lines that exercise the edge cases of the layout
+
+    Args:
+      count (int): the number of texts.
+      seed (int): the seed of the random words. Defaults to 0
+
+    Returns:
+      A list of texts.
+    """
+    rand = random.Random(seed)
+    texts = [" ", "\t\n", "word", "y" * 170, "x" * 90 + " a", "a " + "x" * 90]
+    while len(texts) < count:
+        words = [rand.choice(WORDS) for _ in range(rand.randint(1, 60))]
+        if rand.random() < 0.2:
+            words = words[:3] * rand.randint(2, 6)
+        texts.append(rand.choice([" ", "  ", "\n", "\t"]).join(words))
+    return texts
+
+
+def check_layouts(texts: list[str]) -> int:
+    """
+    It checks that each function lays out each text as the legacy layout did
+
+    Args:
+      texts (list[str]): the texts to check.
+
+    Returns:
+      The number of texts laid out differently.
+    """
+    errors = 0
+    for name, arguments in get_layouts().items():
+        for text in texts:
+            if call_function(name, text) != legacy_wrap(*arguments(text)):
+                errors += 1
+                print(f"{name} differs for {text!r}", file=sys.stderr)
+    return errors
+
+
+def main(args: argparse.Namespace) -> int:
+    """
+    It checks the layouts match the legacy layout and times each function against the legacy layout,
+    with the cache of laid out blocks cold and warm, then writes the results as JSON
+
+    Args:
+      args (argparse.Namespace): the command line arguments.
+
+    Returns:
+      The return value is the exit code of the program.
+    """
+    texts = create_texts(args.texts)
+    errors = check_layouts(texts)
+
+    results = []
+    for name, arguments in get_layouts().items():
+        cases = {
+            "legacy": lambda: [legacy_wrap(*arguments(t)) for t in texts],
+            "cold": lambda: [
+                wrap_text.cache_clear(),
+                [call_function(name, t) for t in texts],
+            ],
+            "warm": lambda: [call_function(name, t) for t in texts],
+        }
+        for case, function in cases.items():
+            result = time_stage(function, args.repeat)
+            result["function"] = name
+            result["case"] = case
+            result["texts_per_second"] = len(texts) / result["median"]
+            results.append(result)
+            print(
+                f"{name:>20} {case:>6}: min {result['min'] * 1000:10.3f} ms, median {result['median'] * 1000:10.3f} ms, {result['texts_per_second']:12.1f} texts/s",
+                file=sys.stderr,
+            )
+
+    output = json.dumps(
+        {
+            "created": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "texts": len(texts),
+            "errors": errors,
+            "results": results,
+        },
+        indent=4,
+    )
+
+    if args.output:
+        with open(args.output, "w") as outfile:
+            outfile.write(output)
+    else:
+        print(output)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check and time the layout of messages, comments and descriptions"
+    )
+    parser.add_argument(
+        "--texts", type=int, default=2000, help="number of texts to lay out"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="number of runs of each case"
+    )
+    parser.add_argument("--output", help="file to write the JSON results to")
+
+    sys.exit(main(parser.parse_args()))
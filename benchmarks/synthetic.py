@@ -0,0 +1,298 @@
+import json
+import os
+
+__all__ = [
+    "create_config",
+    "write_configs",
+]
+
+SOURCE_DATASET = "bench_src"
+PUBLISH_DATASET = "bench_pub"
+STAGING_DATASET = "bench_stg"
+
+
+def create_source_table(index: int) -> dict:
+    """
+    It creates a source table entry, index 0 is the driving table and each join adds another table
+
+    Args:
+      index (int): the position of the table in the task.
+
+    Returns:
+      A dictionary containing the dataset_name, table_name and alias of the table.
+    """
+    return {
+        "dataset_name": SOURCE_DATASET,
+        "table_name": f"source_{index}",
+        "alias": f"s{index}",
+    }
+
+
+def create_fields(fields: int, joins: int) -> list[dict]:
+    """
+    It creates the source_to_target list of a TYPE1 task, the fields are spread across the driving
+    table and the joined tables with every fifth field a transformation rather than a column
+
+    Args:
+      fields (int): the number of fields to create.
+      joins (int): the number of joined tables.
+
+    Returns:
+      A list of source_to_target fields.
+    """
+    source_to_target = [
+        {
+            "name": "record_id",
+            "source_column": "id",
+            "source_table": create_source_table(0),
+            "data_type": "STRING",
+            "is_primary_key": True,
+            "pk": True,
+        }
+    ]
+
+    for i in range(1, fields):
+        table = create_source_table(i % (joins + 1))
+        if i % 5 == 0:
+            source_to_target.append(
+                {
+                    "name": f"field_{i}",
+                    "transformation": f"upper({table['alias']}.column_{i})",
+                    "source_table": table,
+                    "data_type": "STRING",
+                }
+            )
+        else:
+            source_to_target.append(
+                {
+                    "name": f"field_{i}",
+                    "source_column": f"column_{i}",
+                    "source_table": table,
+                    "data_type": "STRING",
+                }
+            )
+
+    return source_to_target
+
+
+def create_history_fields(fields: int) -> list[dict]:
+    """
+    It creates the source_to_target list of a HISTORY task, the key, effective from and sequence fields
+    followed by the tracked fields
+
+    Args:
+      fields (int): the number of fields to create.
+
+    Returns:
+      A list of source_to_target fields.
+    """
+    source_to_target = [
+        {
+            "name": "record_id",
+            "source_column": "id",
+            "data_type": "STRING",
+            "is_primary_key": True,
+            "is_history_key": True,
+            "pk": True,
+            "hk": True,
+        },
+        {
+            "name": "effective_from_dt",
+            "source_column": "last_modified",
+            "data_type": "TIMESTAMP",
+            "is_primary_key": True,
+            "pk": True,
+        },
+        {
+            "name": "effective_from_dt_csn_seq",
+            "transformation": "0",
+            "data_type": "INTEGER",
+        },
+        {
+            "name": "effective_from_dt_seq",
+            "transformation": "row_number() over (partition by id, last_modified order by id)",
+            "data_type": "INTEGER",
+        },
+    ]
+
+    for i in range(len(source_to_target), max(fields, len(source_to_target) + 1)):
+        source_to_target.append(
+            {
+                "name": f"field_{i}",
+                "source_column": f"column_{i}",
+                "data_type": "STRING",
+            }
+        )
+
+    return source_to_target
+
+
+def create_task(
+    name: str,
+    index: int,
+    fields: int,
+    joins: int,
+    target_type: str,
+    delta: bool,
+    depth: int,
+) -> dict:
+    """
+    It creates a CREATETABLE task.  Tasks are built in chains of depth tasks, each task in a chain
+    depending on the task before it
+
+    Args:
+      name (str): the name of the config, used to prefix the task_id.
+      index (int): the position of the task in the config.
+      fields (int): the number of source_to_target fields.
+      joins (int): the number of joined tables, TYPE1 tasks only.
+      target_type (str): TYPE1 or HISTORY.
+      delta (bool): where True the task has a delta on the last_modified column.
+      depth (int): the length of the dependency chains.
+
+    Returns:
+      A dictionary containing the task.
+    """
+    task_id = f"{name}_task_{index}"
+    dependencies = []
+    if depth > 1 and index % depth != 0:
+        dependencies.append(f"{name}_task_{index - 1}")
+
+    parameters = {
+        "destination_table": f"{name}_table_{index}",
+        "destination_dataset": PUBLISH_DATASET,
+        "target_type": target_type,
+        "driving_table": f"{SOURCE_DATASET}.source_0",
+        "write_disposition": "WRITETRUNCATE",
+        "block_data_check": True,
+    }
+
+    if target_type == "HISTORY":
+        parameters["source_tables"] = {
+            f"{SOURCE_DATASET}.source_0": create_source_table(0)
+        }
+        parameters["source_to_target"] = create_history_fields(fields)
+        parameters["history"] = {
+            "partition": [{"name": "record_id", "source_column": "id"}],
+            "order": [
+                {
+                    "field": {
+                        "name": "effective_from_dt",
+                        "source_column": "last_modified",
+                    }
+                }
+            ],
+            "driving_column": [
+                {"name": f["name"], "source_column": f["source_column"]}
+                for f in parameters["source_to_target"][4:]
+            ],
+        }
+    else:
+        tables = [create_source_table(i) for i in range(joins + 1)]
+        parameters["source_tables"] = {
+            f"{t['dataset_name']}.{t['table_name']}": t for t in tables
+        }
+        parameters["source_to_target"] = create_fields(fields, joins)
+        parameters["joins"] = [
+            {
+                "right": t,
+                "on": [{"fields": ["s0.id", f"{t['alias']}.id"]}],
+                "type": "left",
+            }
+            for t in tables[1:]
+        ]
+        parameters["where"] = [{"fields": ["s0.active", "true"]}]
+
+    if delta:
+        parameters["delta"] = {
+            "field": {"source_column": "last_modified"},
+            "lower_bound": "$YESTERDAY",
+            "upper_bound": 86400,
+        }
+
+    return {
+        "task_id": task_id,
+        "operator": "CREATETABLE",
+        "author": "benchmark",
+        "description": f"Synthetic task {index} of {name}.",
+        "dependencies": dependencies,
+        "parameters": parameters,
+    }
+
+
+def create_config(
+    name: str,
+    config_type: str = "BATCH",
+    tasks: int = 1,
+    fields: int = 10,
+    joins: int = 0,
+    target_type: str = "TYPE1",
+    delta: bool = False,
+    depth: int = 1,
+) -> dict:
+    """
+    It creates a synthetic job config in the shape consumed by the generator and which passes the job
+    schema; joins use a right table object, as converttoobj expects, rather than the string in the
+    createtable task schema.  Key fields set both the schema pk/hk flags and the is_primary_key and
+    is_history_key flags read by converttoobj.  Data check tasks are blocked so every task produces
+    sql, where target_type is MIXED the tasks alternate between TYPE1 and HISTORY
+
+    Args:
+      name (str): the name of the config.
+      config_type (str): BATCH or DAG. Defaults to BATCH
+      tasks (int): the number of tasks. Defaults to 1
+      fields (int): the number of source_to_target fields per task. Defaults to 10
+      joins (int): the number of joined tables per TYPE1 task. Defaults to 0
+      target_type (str): TYPE1, HISTORY or MIXED. Defaults to TYPE1
+      delta (bool): where True each task has a delta. Defaults to False
+      depth (int): the length of the task dependency chains. Defaults to 1
+
+    Returns:
+      A dictionary containing the config.
+    """
+    task_list = []
+    for i in range(tasks):
+        if target_type == "MIXED":
+            task_type = "HISTORY" if i % 2 else "TYPE1"
+        else:
+            task_type = target_type
+        task_list.append(create_task(name, i, fields, joins, task_type, delta, depth))
+
+    return {
+        "name": name,
+        "type": config_type,
+        "description": f"Synthetic {config_type} config {name}.",
+        "author": "benchmark",
+        "properties": {
+            "prefix": name,
+            "source_project": "benchmark-project",
+            "dataset_staging": STAGING_DATASET,
+            "dataset_publish": PUBLISH_DATASET,
+            "dataset_source": SOURCE_DATASET,
+        },
+        "tasks": task_list,
+    }
+
+
+def write_configs(path: str, count: int, **kwargs) -> list[str]:
+    """
+    It writes count synthetic configs to the directory, the configs are named so they are picked up
+    by buildjobs
+
+    Args:
+      path (str): the directory to write the configs to.
+      count (int): the number of configs to write.
+      kwargs: the arguments passed to create_config.
+
+    Returns:
+      A list of the paths of the config files.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    paths = []
+    for i in range(count):
+        config_path = os.path.join(path, f"cfg_bench_{i}.json")
+        with open(config_path, "w") as outfile:
+            outfile.write(json.dumps(create_config(f"bench_{i}", **kwargs), indent=4))
+        paths.append(config_path)
+
+    return paths
@@ -1,22 +1,68 @@
 import argparse
+import json
 import os
-import re
 import sys
+import time
 import traceback
 
 from datetime import datetime
-from lib.buildartifacts import buildartifacts
-from lib.buildbatch import buildbatch
-from lib.builddags import builddags
-from lib.helper import ifnull
+from itertools import repeat
+from lib.artifactwriter import (
+    add_write_stats,
+    get_artifact_paths,
+    get_write_stats,
+    reset_artifact_paths,
+    reset_write_stats,
+)
+from lib.buildcache import (
+    config_hash,
+    config_inputs,
+    filter_manifest,
+    generator_files,
+    is_unchanged,
+    load_manifest,
+    save_manifest,
+    update_manifest,
+)
+from lib.dependencyindex import create_dependency_index, get_dependents
+from lib.discovery import (
+    DEFAULT_INCLUDE,
+    discover_configs,
+    in_shard,
+    parse_patterns,
+    parse_shard,
+)
+from lib.gitchanges import get_changed_configs
+from lib.helper import get_created_date, ifnull
 from lib.jsonhelper import get_json
 from lib.logger import format_message, ILogger
+from lib.semanticvalidator import validate_semantics
+from lib.sqllint import find_sql_files, lint_sql_files
+from lib.timing import (
+    add_timings,
+    enable_timings,
+    get_timings,
+    profile,
+    reset_timings,
+    stage,
+    write_timings,
+)
 
 
 def main(logger: ILogger, args: dict) -> int:
     """
     The function creates a list of config files using the source directory (dpath), if the path provided
-    is a file add id otherwise append each filename in directory
+    is a file add id otherwise add each config file in the directory and its sub-directories matching
+    args["include"] and not args["exclude"].  Where args["shard"] is set only the configs of that shard
+    are built, the other configs are still read to find dependents.  Configs whose inputs have not changed
+    since the last build are skipped, unless args["force"] is set or they depend on a changed config.
+    Where args["changed_since"] is set the configs changed in git since that reference are built in place
+    of those changed since the last build.  The references of each config, i.e. to its tasks, aliases and
+    schema files, are validated and a config which fails is not built.  The remaining configs are built,
+    either one at a time or, where args["workers"] is greater than 1, in a pool of worker processes.
+    Where args["lint"] is set the generated sql is then linted with sqlfluff, only sql changed since it
+    was last linted is linted.  Where args["timings"] is set the time of each stage of the build is
+    written to that directory.
 
     Args:
       logger (ILogger): ILogger - this is the logger object that is passed to the function
@@ -28,44 +74,444 @@ def main(logger: ILogger, args: dict) -> int:
 
     logger.info(f"job files - STARTED".center(100, "-"))
 
-    dpath = args.get("config")
-    config_list = []
+    reset_timings()
+    config_list = create_config_list(
+        logger, args.get("config"), args.get("include"), args.get("exclude")
+    )
 
-    # create a list of config files using the source directory (dpath), if the
-    # path provided is a file add id otherwise append each filename in directory
-    logger.info(f"creating config list")
-    if not os.path.isdir(dpath) and os.path.exists(dpath):
-        config_list.append(dpath)
+    shard = parse_shard(args.get("shard"))
+    shard_list = [p for p in config_list if in_shard(p, args.get("config"), shard)]
+    if shard:
+        logger.info(
+            f"shard {shard[0]}/{shard[1]}: {len(shard_list)} of {len(config_list)} config(s)"
+        )
+
+    configs = {}
+    for path in config_list:
+        with stage("json_load", config=path):
+            configs[path] = get_json(logger, path)
+
+    # configs whose inputs are unchanged since the last build recorded in the
+    # manifest are skipped, unless the build is forced
+    manifest = load_manifest(logger, args.get("manifest"))
+    input_hashes = {}
+    for path in config_list:
+        with stage("hash", config=path):
+            input_hashes[path] = get_input_hash(logger, args, path, configs[path])
+    if args.get("changed_since"):
+        # the configs changed in git since the reference are built whether or
+        # not the manifest records them as built
+        changed = get_changed_configs(
+            logger,
+            args.get("changed_since"),
+            configs,
+            generator_files(),
+            config_inputs,
+            args.get("config"),
+        )
     else:
-        for filename in os.listdir(dpath):
-            logger.debug(format_message(f"filename: {filename}"))
-            m = re.search(r"^cfg_.*\.json$", filename, re.IGNORECASE)
-            if m:
-                config_list.append(filename)
-
-    # for each config file identified use the content of the JSON to create
-    # the python statements needed to be inserted into the template
-    for config in config_list:
-        path = config if os.path.exists(config) else os.path.join(dpath, config)
-        cfg = get_json(logger, path)
-        job_type = cfg.get("type")
-        if job_type == "DAG":
-            if builddags(logger, args, cfg) != 0:
-                logger.error(format_message(f"an error occured processing {path}"))
-                sys.exit(1)
-        elif job_type == "BATCH":
-            if buildbatch(logger, args, cfg) != 0:
-                logger.error(format_message(f"an error occured processing {path}"))
-                sys.exit(1)
+        changed = [
+            path
+            for path in config_list
+            if args.get("force") or not is_unchanged(manifest, path, input_hashes[path])
+        ]
+
+    # a changed config is rebuilt along with every config which depends on it
+    index = create_dependency_index(logger, configs)
+    rebuild = get_dependents(index, changed)
+    build_list = []
+    for path in shard_list:
+        if path in rebuild:
+            if path not in changed:
+                logger.info(format_message(f"rebuilding dependent config {path}"))
+            build_list.append(path)
         else:
-            logger.error(format_message(f"No job type supplied in {path}"))
+            logger.info(format_message(f"skipping unchanged config {path}"))
+
+    logger.info(f"{len(build_list)} of {len(shard_list)} config(s) to build")
+
+    # the references of each config are checked against the index before any
+    # sql is generated, a config which fails is not built
+    invalid = []
+    for path in build_list:
+        if not configs[path]:
+            continue
+        with stage("semantic_validation", config=path):
+            errors = validate_semantics(logger, configs[path], index)
+        for e in errors:
+            logger.error(format_message(f"{path} {e['location']}: {e['message']}"))
+        if errors:
+            invalid.append(path)
+    build_list = [path for path in build_list if path not in invalid]
+
+    reset_write_stats()
+    workers = args.get("workers") or 1
+    if workers > 1 and len(build_list) > 1:
+        logger.info(f"building {len(build_list)} config(s) with {workers} workers")
+        results = build_parallel(logger, args, build_list, configs, workers)
+    else:
+        results = []
+        for path in build_list:
+            reset_artifact_paths()
+            result = build_config(logger, args, path, configs[path])
+            results.append((path, result, get_artifact_paths()))
+    results.extend((path, 1, []) for path in invalid)
+
+    # the artifacts of each config are recorded so a config whose artifacts
+    # have been deleted is rebuilt
+    for path, result, outputs in results:
+        if result == 0 and input_hashes[path]:
+            update_manifest(manifest, path, input_hashes[path], outputs)
+
+    # a sharded build records only its own configs so the manifests of the
+    # shards can be merged
+    if shard:
+        manifest = filter_manifest(manifest, shard_list)
 
-        buildartifacts(logger, args, cfg)
+    if len(results) > 0 or shard:
+        save_manifest(logger, args.get("manifest"), manifest)
+
+    stats = get_write_stats()
+    logger.info(
+        format_message(
+            f"artifacts written: {stats['written']}, unchanged: {stats['unchanged']}"
+        )
+    )
+
+    lint_failed = []
+    if args.get("lint"):
+        lint_results = lint_sql_files(
+            logger,
+            find_sql_files([args.get("dag_sql"), args.get("batch_sql")]),
+            args.get("lint_config"),
+            args.get("lint_cache"),
+            workers,
+        )
+        lint_failed = [path for path, v in (lint_results or {}).items() if v]
+
+    if args.get("timings"):
+        write_timings(logger, args.get("timings"), get_timings())
+
+    failed = [path for path, result, _ in results if result != 0]
+    if len(failed) > 0:
+        for path in failed:
+            logger.error(format_message(f"an error occured processing {path}"))
+        logger.error(
+            format_message(
+                f"{len(failed)} of {len(results)} config(s) failed, check logs for more information."
+            )
+        )
+        logger.info(f"job files - FAILED".center(100, "-"))
+        return 1
+
+    if len(lint_failed) > 0:
+        logger.error(
+            format_message(
+                f"{len(lint_failed)} sql file(s) failed lint, check logs for more information."
+            )
+        )
+        logger.info(f"job files - FAILED".center(100, "-"))
+        return 1
 
     logger.info(f"job files COMPLETED SUCCESSFULLY".center(100, "-"))
     return 0
 
 
+def create_config_list(
+    logger: ILogger, dpath: str, include: list[str] = None, exclude: list[str] = None
+) -> list[str]:
+    """
+    It creates a list of config files using the source directory (dpath), if the path provided is a
+    file add it otherwise add each config file in the directory and its sub-directories
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      dpath (str): the path of a config file or a directory of config files
+      include (list[str]): glob patterns of the files to include. Defaults to cfg_*.json
+      exclude (list[str]): glob patterns of the files to exclude.
+
+    Returns:
+      A sorted list of config file paths.
+    """
+    logger.info(f"creating config list")
+    return discover_configs(logger, dpath, include, exclude)
+
+
+def watch(logger: ILogger, args: dict) -> int:
+    """
+    It keeps the generator resident and polls the config files, templates and schema objects for
+    changes.  When a change is found the configs are built again, the build manifest means only the
+    configs whose inputs changed are rebuilt.  Templates, the Jinja environment and black stay loaded
+    between builds.  The watch runs until interrupted
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      args (dict): a dictionary of the command line arguments
+
+    Returns:
+      The exit code of the last build.
+    """
+    interval = args.get("watch_interval") or 2
+    result = 0
+    snapshot = None
+
+    logger.info(format_message(f"watching {args.get('config')} for changes"))
+    try:
+        while True:
+            current = create_watch_snapshot(
+                args.get("config"), args.get("include"), args.get("exclude")
+            )
+            if current != snapshot:
+                snapshot = current
+                result = main(logger, args)
+
+                # only the first build is forced, later builds use the manifest
+                args = dict(args, force=False)
+                logger.info(format_message(f"waiting for changes"))
+
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        logger.info(f"watch stopped")
+
+    return result
+
+
+def create_watch_snapshot(
+    dpath: str, include: list[str] = None, exclude: list[str] = None
+) -> dict:
+    """
+    It records the modified time and size of each config file and the inputs used to build it.  The
+    configs are read directly, rather than with get_json, to keep polling quiet in the logs
+
+    Args:
+      dpath (str): the path of a config file or a directory of config files
+      include (list[str]): glob patterns of the files to include. Defaults to cfg_*.json
+      exclude (list[str]): glob patterns of the files to exclude.
+
+    Returns:
+      A dictionary of file path to a tuple of modified time and size.
+    """
+    paths = set()
+    for path in create_config_list(NULL_LOGGER, dpath, include, exclude):
+        paths.add(path)
+        try:
+            with open(path, "r") as sourcefile:
+                paths.update(config_inputs(json.loads(sourcefile.read())))
+        except (OSError, ValueError):
+            continue
+
+    snapshot = {}
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            snapshot[path] = None
+
+    return snapshot
+
+
+def build_config(logger: ILogger, args: dict, path: str, cfg: dict) -> int:
+    """
+    It uses the content of the JSON config file, as parsed by main, to create the job files and
+    artifacts for a single config.  Errors are logged and returned as a non-zero exit code so the remaining configs can still
+    be built.
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      args (dict): a dictionary of the command line arguments
+      path (str): the path of the config file to build
+      cfg (dict): the content of the config file
+
+    Returns:
+      The exit code for the config, 0 where the build was successful.
+    """
+
+    profile_file = (
+        os.path.join(
+            args.get("timings"),
+            "profile",
+            f"{os.path.splitext(os.path.basename(path))[0]}.prof",
+        )
+        if args.get("profile") and args.get("timings")
+        else None
+    )
+
+    with profile(profile_file), stage("config", config=path):
+        try:
+            if not cfg:
+                return 1
+
+            # the builders, and sql_helper, jinja2 and black which they use, are
+            # only imported once a config is built so validation and no-op
+            # incremental runs start quickly
+            from lib.buildartifacts import buildartifacts
+            from lib.buildbatch import buildbatch
+            from lib.builddags import builddags
+            from lib.jobmodel import create_job
+
+            args = config_args(args, path, cfg)
+
+            # the config is parsed once into a job shared by the builders, none
+            # of which change it
+            with stage("job"):
+                job = create_job(cfg)
+
+            if job.type == "DAG":
+                with stage("builddags"):
+                    if builddags(logger, args, job) != 0:
+                        return 1
+            elif job.type == "BATCH":
+                with stage("buildbatch"):
+                    if buildbatch(logger, args, job) != 0:
+                        return 1
+            else:
+                logger.error(format_message(f"No job type supplied in {path}"))
+
+            with stage("buildartifacts"):
+                return buildartifacts(logger, args, job)
+        except:
+            logger.error(f"{traceback.format_exc():}")
+            return 1
+
+
+def get_input_hash(logger: ILogger, args: dict, path: str, cfg: dict) -> str:
+    """
+    It returns the hash of the inputs used to build a config, where the hash can't be created the
+    config is always built so the error is reported by the build
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      args (dict): a dictionary of the command line arguments
+      path (str): the path of the config file
+      cfg (dict): the content of the config file
+
+    Returns:
+      The hex digest, or None where the hash could not be created.
+    """
+    if not cfg:
+        return None
+
+    try:
+        return config_hash(logger, config_args(args, path, cfg), path, cfg)
+    except ValueError:
+        return None
+
+
+def config_args(args: dict, path: str, config: dict) -> dict:
+    """
+    It returns the args used to build a single config.  For a reproducible build the created date
+    written to generated files is fixed from the config, SOURCE_DATE_EPOCH or the git commit time of
+    the config rather than the current date
+
+    Args:
+      args (dict): a dictionary of the command line arguments
+      path (str): the path of the config file
+      config (dict): the content of the config file
+
+    Returns:
+      A dictionary of the arguments for the config.
+    """
+    if not args.get("reproducible"):
+        return args
+
+    created_date = get_created_date(config, path)
+    if not created_date:
+        raise ValueError(
+            f"No created date could be identified for reproducible build of {path}."
+        )
+
+    return dict(args, created_date=created_date)
+
+
+def build_parallel(
+    logger: ILogger, args: dict, config_list: list[str], configs: dict, workers: int
+) -> list[tuple]:
+    """
+    It builds each config in its own task in a pool of worker processes.  Results are returned in the
+    order of config_list, not the order in which the workers finish.
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      args (dict): a dictionary of the command line arguments
+      config_list (list[str]): the paths of the config files to build
+      configs (dict): the content of each config file, keyed by path
+      workers (int): the maximum number of worker processes
+
+    Returns:
+      A list of (path, exit code, artifact paths) tuples.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # workers log to a queue which is written to the log by this process
+    with logger.worker_queue() as log_queue, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(logger.name, logger.level, log_queue),
+    ) as executor:
+        results = list(
+            executor.map(
+                build_config_worker,
+                repeat(args),
+                config_list,
+                [configs[path] for path in config_list],
+            )
+        )
+
+    # add the artifact counts and stage timings from each worker to those of
+    # this process
+    for _, stats, spans, _ in results:
+        add_write_stats(stats)
+        add_timings(spans)
+
+    return [
+        (path, result, outputs)
+        for path, (result, _, _, outputs) in zip(config_list, results)
+    ]
+
+
+# logger used where log messages are not required, such as when polling for changes
+NULL_LOGGER = ILogger("buildjobs.watch", None, "CRITICAL")
+
+# each worker process creates its own logger when the pool starts
+WORKER_LOGGER = None
+
+
+def init_worker(name: str, level: int, log_queue) -> None:
+    """
+    It creates the logger used by a worker process.
+
+    Args:
+      name (str): the name of the logger
+      level (int): the log level
+      log_queue: the queue the records of the worker are written to the log from
+    """
+    global WORKER_LOGGER
+    WORKER_LOGGER = ILogger(name, level=level, log_queue=log_queue)
+
+
+def build_config_worker(args: dict, path: str, cfg: dict) -> tuple:
+    """
+    It builds a single config inside a worker process.
+
+    Args:
+      args (dict): a dictionary of the command line arguments
+      path (str): the path of the config file to build
+      cfg (dict): the content of the config file
+
+    Returns:
+      A tuple of the exit code for the config, the counts of artifacts written and unchanged, the
+      stage timings and the paths of the artifacts.
+    """
+    reset_write_stats()
+    reset_artifact_paths()
+    reset_timings()
+    enable_timings(bool(args.get("timings")))
+    result = build_config(WORKER_LOGGER, args, path, cfg)
+    return (result, get_write_stats(), get_timings(), get_artifact_paths())
+
+
 def create_parameters(path: str = None) -> dict:
     """
     > This function creates a dictionary of parameters for the application
@@ -94,6 +540,9 @@ def create_parameters(path: str = None) -> dict:
     )
     table_def_file_default = "./bq_application/tables/"
     table_cfg_default = "./bq_application/cfg/"
+    manifest_default = "./.buildmanifest.json"
+    lint_config_default = "./.github/linters/.sqlfluff"
+    lint_cache_default = "./.lintcache.json"
     project_id = os.environ.get("PROJECT_ID")
 
     parameters = {
@@ -109,6 +558,21 @@ def create_parameters(path: str = None) -> dict:
         "table_cfg": os.path.normpath(cfg.get("table_cfg", table_cfg_default)),
         "project_id": cfg.get("logs", project_id),
         "debug_level": cfg.get("debug_level", "DEBUG"),
+        "log_queue": cfg.get("log_queue", False),
+        "log_format": cfg.get("log_format", "text"),
+        "workers": cfg.get("workers", 1),
+        "manifest": os.path.normpath(cfg.get("manifest", manifest_default)),
+        "force": cfg.get("force", False),
+        "reproducible": cfg.get("reproducible", False),
+        "timings": cfg.get("timings"),
+        "profile": cfg.get("profile", False),
+        "include": cfg.get("include", DEFAULT_INCLUDE),
+        "exclude": cfg.get("exclude", []),
+        "shard": cfg.get("shard"),
+        "changed_since": cfg.get("changed_since"),
+        "lint": cfg.get("lint", False),
+        "lint_config": os.path.normpath(cfg.get("lint_config", lint_config_default)),
+        "lint_cache": os.path.normpath(cfg.get("lint_cache", lint_cache_default)),
     }
 
     return parameters
@@ -122,20 +586,154 @@ if __name__ == "__main__":
         dest="config_path",
         help="Specify the location of the config file which define script parameters",
     )
+    parser.add_argument(
+        "--workers",
+        required=False,
+        type=int,
+        dest="workers",
+        help="Specify the number of worker processes used to build configs (default: 1).",
+    )
+    parser.add_argument(
+        "--force",
+        required=False,
+        action="store_true",
+        dest="force",
+        help="Build all configs, ignoring the build manifest.",
+    )
+    parser.add_argument(
+        "--reproducible",
+        required=False,
+        action="store_true",
+        dest="reproducible",
+        help="Take created dates from the config, SOURCE_DATE_EPOCH or git so identical inputs produce identical output. The generated files are identical, the default DAG start_date is still datetime.now(), evaluated when Airflow parses the DAG; set dag.start_date in the config for a fixed date.",
+    )
+    parser.add_argument(
+        "--timings",
+        required=False,
+        dest="timings",
+        help="Specify a directory to write the time of each stage of the build to, as a JSON report and a Chrome trace.",
+    )
+    parser.add_argument(
+        "--profile",
+        required=False,
+        action="store_true",
+        dest="profile",
+        help="Write cProfile stats for each config to the timings directory (default: ./timings/).",
+    )
+    parser.add_argument(
+        "--include",
+        required=False,
+        dest="include",
+        help="Specify a comma separated list of glob patterns of the config files to build (default: cfg_*.json).",
+    )
+    parser.add_argument(
+        "--exclude",
+        required=False,
+        dest="exclude",
+        help="Specify a comma separated list of glob patterns of the config files not to build.",
+    )
+    parser.add_argument(
+        "--shard",
+        required=False,
+        dest="shard",
+        help="Specify the shard of the configs to build as i/N, i.e. 1/4, so the build can be split across runners.",
+    )
+    parser.add_argument(
+        "--changed_since",
+        required=False,
+        dest="changed_since",
+        help="Specify a git reference, i.e. origin/main, to build only the configs changed since it, or whose templates or schema objects changed, and their dependents.",
+    )
+    parser.add_argument(
+        "--lint",
+        required=False,
+        action="store_true",
+        dest="lint",
+        help="Lint the generated sql with sqlfluff, only sql changed since it was last linted is linted.",
+    )
+    parser.add_argument(
+        "--watch",
+        required=False,
+        action="store_true",
+        dest="watch",
+        help="Stay resident and rebuild configs when their inputs change.",
+    )
+    parser.add_argument(
+        "--watch_interval",
+        required=False,
+        type=float,
+        dest="watch_interval",
+        help="Specify the number of seconds between checks for changes when watching (default: 2).",
+    )
+    parser.add_argument(
+        "--log_queue",
+        required=False,
+        action="store_true",
+        dest="log_queue",
+        help="Write log records from a background thread, in batches, so the build does not wait on the terminal or log file.",
+    )
+    parser.add_argument(
+        "--log_format",
+        required=False,
+        choices=["text", "json"],
+        dest="log_format",
+        help="Specify the format of the log, text or json; json writes each record as a line of JSON with the config, task, stage and elapsed time (default: text).",
+    )
 
     known_args, args = parser.parse_known_args()
     parameters = create_parameters(known_args.config_path)
+    if known_args.workers:
+        parameters["workers"] = known_args.workers
+    if known_args.force:
+        parameters["force"] = True
+    if known_args.reproducible:
+        parameters["reproducible"] = True
+    if known_args.watch_interval:
+        parameters["watch_interval"] = known_args.watch_interval
+    if known_args.log_queue:
+        parameters["log_queue"] = True
+    if known_args.log_format:
+        parameters["log_format"] = known_args.log_format
+    if known_args.include:
+        parameters["include"] = parse_patterns(known_args.include)
+    if known_args.exclude:
+        parameters["exclude"] = parse_patterns(known_args.exclude)
+    if known_args.shard:
+        parameters["shard"] = known_args.shard
+    if known_args.changed_since:
+        parameters["changed_since"] = known_args.changed_since
+    if known_args.lint:
+        parameters["lint"] = True
+    if known_args.timings:
+        parameters["timings"] = known_args.timings
+    if known_args.profile:
+        parameters["profile"] = True
+    if parameters["profile"] and not parameters["timings"]:
+        parameters["timings"] = "./timings/"
+
+    enable_timings(bool(parameters["timings"]))
 
     log_file_name = os.path.join(
         parameters.get("log"),
         f'buildjobs_{datetime.now().strftime("%Y-%m-%dT%H%M%S")}.log',
     )
 
-    logger = ILogger("buildjobs", log_file_name, parameters.get("debug_level"))
+    logger = ILogger(
+        "buildjobs",
+        log_file_name,
+        parameters.get("debug_level"),
+        queued=parameters.get("log_queue"),
+        log_format=parameters.get("log_format"),
+    )
 
     try:
-        main(logger, parameters)
+        result = (
+            watch(logger, parameters) if known_args.watch else main(logger, parameters)
+        )
     except:
         logger.error(f"{traceback.format_exc():}")
         logger.debug(f"{sys.exc_info()[1]:}")
         logger.info(f"job files - FAILED".center(100, "-"))
+        result = 1
+
+    sys.exit(result)
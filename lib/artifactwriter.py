@@ -0,0 +1,107 @@
+import os
+
+from lib.logger import format_message, ILogger
+from lib.timing import stage
+
+__all__ = [
+    "write_artifact",
+    "reset_write_stats",
+    "get_write_stats",
+    "add_write_stats",
+    "reset_artifact_paths",
+    "get_artifact_paths",
+]
+
+# counts of the artifacts written and left unchanged by this process, workers
+# return their counts so they can be added to the parent process counts
+WRITE_STATS = {"written": 0, "unchanged": 0}
+
+# paths of the artifacts written or left unchanged since the paths were last
+# reset, recorded in the build manifest so a deleted artifact is rebuilt
+ARTIFACT_PATHS = []
+
+
+def write_artifact(logger: ILogger, path: str, content: str) -> bool:
+    """
+    It writes content to a file only when it differs from the content already in the file.  The content
+    is written to a temporary file in the same directory which is then renamed over the target, so a
+    reader never sees a partially written file and an unchanged file keeps its modified time
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the file to write.
+      content (str): the rendered content of the file.
+
+    Returns:
+      True where the file was written, False where the content was unchanged.
+    """
+    with stage("write", path=path):
+        ARTIFACT_PATHS.append(os.path.normpath(path))
+        if os.path.isfile(path):
+            with open(path, "r") as sourcefile:
+                if sourcefile.read() == content:
+                    logger.debug(format_message(f"artifact unchanged {path}"))
+                    WRITE_STATS["unchanged"] += 1
+                    return False
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as outfile:
+                outfile.write(content)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        logger.debug(format_message(f"artifact written {path}"))
+        WRITE_STATS["written"] += 1
+        return True
+
+
+def reset_write_stats() -> None:
+    """
+    It resets the counts of artifacts written and unchanged
+    """
+    WRITE_STATS["written"] = 0
+    WRITE_STATS["unchanged"] = 0
+    return None
+
+
+def get_write_stats() -> dict:
+    """
+    It returns a copy of the counts of artifacts written and unchanged
+
+    Returns:
+      A dictionary with the keys written and unchanged.
+    """
+    return dict(WRITE_STATS)
+
+
+def add_write_stats(stats: dict) -> None:
+    """
+    It adds counts returned from another process to the counts of this process
+
+    Args:
+      stats (dict): a dictionary with the keys written and unchanged.
+    """
+    for key in WRITE_STATS.keys():
+        WRITE_STATS[key] += stats.get(key, 0)
+    return None
+
+
+def reset_artifact_paths() -> None:
+    """
+    It clears the paths of the artifacts written and unchanged
+    """
+    ARTIFACT_PATHS.clear()
+    return None
+
+
+def get_artifact_paths() -> list[str]:
+    """
+    It returns the paths of the artifacts written and unchanged since the paths were last reset
+
+    Returns:
+      A sorted list of file paths.
+    """
+    return sorted(set(ARTIFACT_PATHS))
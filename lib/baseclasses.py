@@ -1,12 +1,12 @@
 import json
 import re
 
+from copy import deepcopy
 from enum import Enum
 from typing import Union
-from unittest.util import strclass
 from warnings import warn
 
-from lib.helper import isnullorwhitespace
+from lib.helper import DEFAULT_SOURCE_ALIAS, isnullorwhitespace
 
 __all__ = [
     "Condition",
@@ -23,6 +23,7 @@ __all__ = [
     "SQLParameter",
     "SQLDataCheckParameter",
     "todict",
+    "tojson",
     "converttoobj",
     "TableType",
     "DEFAULT_SOURCE_ALIAS",
@@ -30,7 +31,26 @@ __all__ = [
     "WRITE_DISPOSITION_MAP",
 ]
 
-DEFAULT_SOURCE_ALIAS = "src"
+# the slots of each model class, in the order todict writes them
+SLOTS = {}
+
+# the function todict converts an object with, by its class, see get_serializer
+SERIALIZERS = {}
+
+# the function converttoobj decodes a config with, by conversion type, see
+# get_decoder
+DECODERS = {}
+
+# the keys of a source table in a config, each is passed to the argument of
+# SourceTable of the same name
+SOURCE_TABLE_KEYS = ("source_project", "dataset_name", "table_name", "alias")
+
+# the name of a field derived from its transformation, i.e. the function, the
+# cast column and type or case
+NAME_PATTERN = re.compile(
+    r"(?:(?P<function>\b\w+\b)?\()?(?:(?P<cast_col>\w+) as (?P<cast_type>\w+))?(?P<decode>case)?",
+    re.IGNORECASE,
+)
 
 # this maps the intended behaviour to the actual
 # behaviour based on the defined approach for sql
@@ -118,7 +138,60 @@ class TableType(Enum):
     TYPE6 = 6
 
 
-class SourceTable(object):
+class Model(object):
+    """
+    The base of the model classes.  A model stores its attributes in slots rather than a per-instance
+    __dict__, configs with thousands of fields create tens of thousands of models
+    """
+
+    __slots__ = ()
+
+    def __deepcopy__(self, memo: dict):
+        """
+        It copies the model and, recursively, the value of each slot.  The copy protocol of a slotted
+        object builds a dictionary of its slots, this copies them directly
+
+        Args:
+          memo (dict): the objects already copied, by id.
+
+        Returns:
+          A copy of the model.
+        """
+        cls = type(self)
+        obj = cls.__new__(cls)
+        memo[id(self)] = obj
+        for slot, _ in get_slots(cls):
+            value = getattr(self, slot, memo)
+            if value is not memo:
+                setattr(obj, slot, deepcopy(value, memo))
+        return obj
+
+    def with_(self, **changes):
+        """
+        It creates a copy of the model with the attributes supplied changed.  The copy is shallow, the
+        attributes not changed are shared with the model, so a list of fields, joins or conditions which
+        is to be changed must be replaced rather than changed in place
+
+        Args:
+          changes: the attributes to change and their new value, i.e. destination_table="td_p1"
+
+        Returns:
+          A copy of the model.
+        """
+        cls = type(self)
+        obj = cls.__new__(cls)
+        for slot, _ in get_slots(cls):
+            value = getattr(self, slot, obj)
+            if value is not obj:
+                setattr(obj, slot, value)
+        for key, value in changes.items():
+            setattr(obj, key, value)
+        return obj
+
+
+class SourceTable(Model):
+    __slots__ = ("source_project", "dataset_name", "table_name", "alias")
+
     def __init__(
         self,
         source_project: str = None,
@@ -126,10 +199,10 @@ class SourceTable(object):
         table_name: str = None,
         alias: str = None,
     ) -> None:
-        self._source_project = source_project
-        self._dataset_name = dataset_name
-        self._table_name = table_name
-        self._alias = alias
+        self.source_project = source_project
+        self.dataset_name = dataset_name
+        self.table_name = table_name
+        self.alias = alias
 
     def __str__(self) -> str:
         """
@@ -138,7 +211,7 @@ class SourceTable(object):
         Returns:
           The name of the dataset, the name of the table, and the alias.
         """
-        return f"{self._dataset_name}.{self._table_name} {self._alias}"
+        return f"{self.dataset_name}.{self.table_name} {self.alias}"
 
     def __eq__(self, other) -> bool:
         """
@@ -170,89 +243,10 @@ class SourceTable(object):
         """
         return not self.__eq__(other)
 
-    @property
-    def source_project(self) -> str:
-        """
-        It returns the source project.
-
-        Returns:
-          The source project.
-        """
-        return self._source_project
-
-    @source_project.setter
-    def source_project(self, value: str) -> None:
-        """
-        This function sets the value of the source_project attribute of the object that calls it
-
-        Args:
-          value (str): The value of the parameter.
-        """
-        self._source_project = value
-
-    @property
-    def dataset_name(self) -> str:
-        """
-        This function returns the name of the dataset
-
-        Returns:
-          The dataset name.
-        """
-        return self._dataset_name
-
-    @dataset_name.setter
-    def dataset_name(self, value: str) -> None:
-        """
-        This function takes in a string value and sets the value of the dataset_name attribute to the
-        value of the string
-
-        Args:
-          value (str): The value to set the parameter to.
-        """
-        self._dataset_name = value
-
-    @property
-    def table_name(self) -> str:
-        """
-        This function returns the table name of the class
-
-        Returns:
-          The table name.
-        """
-        return self._table_name
-
-    @table_name.setter
-    def table_name(self, value: str) -> None:
-        """
-        This function takes in a string and returns None
-
-        Args:
-          value (str): The value to be set.
-        """
-        self._table_name = value
-
-    @property
-    def alias(self) -> str:
-        """
-        It returns the alias of the object.
-
-        Returns:
-          The alias of the object.
-        """
-        return self._alias
-
-    @alias.setter
-    def alias(self, value: str) -> None:
-        """
-        This function takes in a string and sets the alias of the object to that string
-
-        Args:
-          value (str): The value of the parameter.
-        """
-        self._alias = value
 
+class Condition(Model):
+    __slots__ = ("fields", "condition", "operator")
 
-class Condition(object):
     def __init__(
         self,
         fields: list[str],
@@ -265,9 +259,9 @@ class Condition(object):
         elif len(fields) > 2:
             warn("Only the first 2 fields will be considered", SyntaxWarning, 1)
 
-        self._fields = fields
-        self._condition = condition
-        self._operator = operator
+        self.fields = fields
+        self.condition = condition
+        self.operator = operator
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -275,50 +269,10 @@ class Condition(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def fields(self) -> str:
-        """
-        Returns the fields
-        """
-        return self._fields
-
-    @fields.setter
-    def fields(self, value: str) -> None:
-        """
-        Sets the fields
-        """
-        self._fields = value
-
-    @property
-    def condition(self) -> LogicOperator:
-        """
-        Returns the condition
-        """
-        return self._condition
-
-    @condition.setter
-    def condition(self, value: LogicOperator) -> None:
-        """
-        Sets the condition
-        """
-        self._condition = value
-
-    @property
-    def operator(self) -> Operator:
-        """
-        Returns the operator
-        """
-        return self._operator
-
-    @operator.setter
-    def operator(self, value: Operator) -> None:
-        """
-        Sets the operator
-        """
-        self._operator = value
 
+class Join(Model):
+    __slots__ = ("left", "right", "on", "join_type")
 
-class Join(object):
     def __init__(
         self,
         right: str,
@@ -327,10 +281,10 @@ class Join(object):
         join_type: JoinType = JoinType.LEFT,
     ) -> None:
 
-        self._left = left
-        self._right = right
-        self._on = on
-        self._join_type = join_type
+        self.left = left
+        self.right = right
+        self.on = on
+        self.join_type = join_type
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -338,64 +292,26 @@ class Join(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def right(self) -> str:
-        """
-        Returns the right table
-        """
-        return self._right
-
-    @right.setter
-    def right(self, value: str) -> None:
-        """
-        Sets the right table
-        """
-        self._right = value
-
-    @property
-    def on(self) -> list[Condition]:
-        """
-        Returns the on conditions
-        """
-        return self._on
-
-    @on.setter
-    def on(self, value: list[Condition]) -> None:
-        """
-        Sets the on conditions
-        """
-        self._on = value
-
-    @property
-    def left(self) -> strclass:
-        """
-        Returns the left
-        """
-        return self._left
-
-    @left.setter
-    def left(self, value: str) -> None:
-        """
-        Sets the left
-        """
-        self._left = value
-
-    @property
-    def join_type(self) -> JoinType:
-        """
-        Returns the join_type
-        """
-        return self._join_type
-
-    @join_type.setter
-    def join_type(self, value: JoinType) -> None:
-        """
-        Sets the join_type
-        """
-        self._join_type = value
 
+class Field(Model):
+    # name, source_column and source() are derived from the other attributes
+    # and cached in the _cached_ slots, the setters of the attributes they are
+    # derived from clear them
+    __slots__ = (
+        "_transformation",
+        "_source_column",
+        "_source_table",
+        "_name",
+        "data_type",
+        "_nullable",
+        "_pk",
+        "_hk",
+        "default",
+        "_cached_name",
+        "_cached_source_column",
+        "_cached_source",
+    )
 
-class Field(object):
     def __init__(
         self,
         name: str = None,
@@ -413,11 +329,11 @@ class Field(object):
         self._source_column = source_column
         self._source_table = source_table
         self._name = name
-        self._data_type = data_type
+        self.data_type = data_type
         self._nullable = nullable
         self._pk = pk
         self._hk = hk
-        self._default = default
+        self.default = default
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -425,6 +341,15 @@ class Field(object):
     def __repr__(self):
         return str(self)
 
+    def __clear_cache(self) -> None:
+        """
+        It clears the values derived from the attributes of the field, they are derived again when next
+        read
+        """
+        for slot in ("_cached_name", "_cached_source_column", "_cached_source"):
+            if hasattr(self, slot):
+                delattr(self, slot)
+
     @property
     def name(self) -> str:
         """
@@ -432,30 +357,37 @@ class Field(object):
         transformation is not null or whitespace, then if the transformation contains a cast column and
         cast type, then return the cast column and cast type, else if the transformation contains a
         decode, then return the decode, else if the transformation contains a function, then return the
-        function, else return the source column, else return the name
+        function, else return the source column, else return the name.  The name is derived once and
+        cached until the name, source column or transformation is set
 
         Returns:
           The name of the column
         """
-        if isnullorwhitespace(self._name):
+        try:
+            return self._cached_name
+        except AttributeError:
+            pass
+
+        name = self._name
+        if isnullorwhitespace(name):
             if isnullorwhitespace(self._source_column) and not isnullorwhitespace(
                 self._transformation
             ):
-                regex = r"(?:(?P<function>\b\w+\b)?\()?(?:(?P<cast_col>\w+) as (?P<cast_type>\w+))?(?P<decode>case)?"
-                m = re.search(regex, self._transformation, re.IGNORECASE)
+                m = NAME_PATTERN.search(self._transformation)
                 if m:
                     if not isnullorwhitespace(
                         m.group("cast_col")
                     ) and not isnullorwhitespace(m.group("cast_type")):
-                        return f"{m.group('cast_col')}_{m.group('cast_type')}"
+                        name = f"{m.group('cast_col')}_{m.group('cast_type')}"
                     elif not isnullorwhitespace(m.group("decode")):
-                        return m.group("decode")
+                        name = m.group("decode")
                     elif not isnullorwhitespace(m.group("function")):
-                        return m.group("function")
+                        name = m.group("function")
             else:
-                return self._source_column
+                name = self._source_column
 
-        return self._name
+        self._cached_name = name
+        return name
 
     @name.setter
     def name(self, value: str) -> None:
@@ -463,42 +395,31 @@ class Field(object):
         Sets the name
         """
         self._name = value
-
-    @property
-    def data_type(self) -> str:
-        """
-        It returns the data type of the object
-
-        Returns:
-          The data type of the variable.
-        """
-        return self._data_type
-
-    @data_type.setter
-    def data_type(self, value: str) -> None:
-        """
-        This function takes in a string and returns None
-
-        Args:
-          value (str): The value to be converted to the specified data type.
-        """
-        self._data_type = value
+        self.__clear_cache()
 
     @property
     def source_column(self) -> str:
         """
         If the source column is null or whitespace, and the transformation is null or whitespace, then
-        return the name of the column
+        return the name of the column.  The source column is derived once and cached until the name,
+        source column or transformation is set
 
         Returns:
           The source column name.
         """
-        if isnullorwhitespace(self._source_column) and isnullorwhitespace(
+        try:
+            return self._cached_source_column
+        except AttributeError:
+            pass
+
+        source_column = self._source_column
+        if isnullorwhitespace(source_column) and isnullorwhitespace(
             self._transformation
         ):
-            return self._name
+            source_column = self._name
 
-        return self._source_column
+        self._cached_source_column = source_column
+        return source_column
 
     @source_column.setter
     def source_column(self, value: str) -> None:
@@ -506,6 +427,7 @@ class Field(object):
         Sets the source_column
         """
         self._source_column = value
+        self.__clear_cache()
 
     @property
     def source_table(self) -> SourceTable:
@@ -520,6 +442,7 @@ class Field(object):
         Sets the source_table
         """
         self._source_table = value
+        self.__clear_cache()
 
     @property
     def transformation(self) -> str:
@@ -534,6 +457,7 @@ class Field(object):
         Sets the transformation
         """
         self._transformation = value
+        self.__clear_cache()
 
     @property
     def nullable(self) -> bool:
@@ -586,27 +510,11 @@ class Field(object):
         """
         self._hk = value
 
-    @property
-    def default(self) -> str:
-        """
-        It returns the default value of the object.
-
-        Returns:
-          The default value of the question.
-        """
-        return self._default
-
-    @default.setter
-    def default(self, value: str) -> None:
-        """
-        Sets the default
-        """
-        self._default = value
-
     def source(self, default_source_name: str = None) -> str:
         """
         If the transformation is not null, return the transformation, otherwise return the source
-        column.
+        column.  The source is cached with the default source name and the alias and table of the source
+        table it was derived from, so a change to the source table derives it again
 
         Args:
           default_source_name (str): The name of the source table if the source table is not specified.
@@ -614,31 +522,59 @@ class Field(object):
         Returns:
           The source column name, the source table name, or the transformation.
         """
+        source_table = self._source_table
+        key = (
+            (
+                default_source_name,
+                source_table.alias,
+                source_table.dataset_name,
+                source_table.table_name,
+            )
+            if source_table
+            else default_source_name
+        )
+        try:
+            cached = self._cached_source
+            if cached[0] == key:
+                return cached[1]
+        except AttributeError:
+            pass
 
         if isnullorwhitespace(self._transformation):
-            if self._source_table is None and isnullorwhitespace(default_source_name):
-                return self.source_column
-
-            if self._source_table:
-                return f"{self._source_table.alias}.{self.source_column}"
-
-            return f"{default_source_name}.{self.source_column}"
+            if source_table is None and isnullorwhitespace(default_source_name):
+                source = self.source_column
+            elif source_table:
+                source = f"{source_table.alias}.{self.source_column}"
+            else:
+                source = f"{default_source_name}.{self.source_column}"
 
         else:
             table = (
-                f"{self._source_table.dataset_name}.{self._source_table.table_name}"
-                if self._source_table
+                f"{source_table.dataset_name}.{source_table.table_name}"
+                if source_table
                 else None
             )
 
-            return (
-                self._transformation.replace(table, self._source_table.alias)
+            source = (
+                self._transformation.replace(table, source_table.alias)
                 if table
                 else self._transformation
             )
 
+        self._cached_source = (key, source)
+        return source
+
+
+class Task(Model):
+    __slots__ = (
+        "_task_id",
+        "operator",
+        "parameters",
+        "dependencies",
+        "_description",
+        "author",
+    )
 
-class Task(object):
     def __init__(
         self,
         task_id: str,
@@ -649,14 +585,14 @@ class Task(object):
         description=None,
     ) -> None:
         self._task_id = task_id
-        self._operator = operator
-        self._parameters = parameters
-        self._dependencies = dependencies
+        self.operator = operator
+        self.parameters = parameters
+        self.dependencies = dependencies
         self._description = description
-        self._author = author
+        self.author = author
 
     def __str__(self) -> str:
-        return json.dumps(todict(self), indent=4, sort_keys=True)
+        return tojson(self, indent=4, sort_keys=True)
 
     def __repr__(self):
         return str(self)
@@ -675,64 +611,14 @@ class Task(object):
         """
         return self._description
 
-    @property
-    def author(self) -> str:
-        """Returns the author"""
-        return self._author
-
-    @author.setter
-    def author(self, value: str) -> None:
-        """Sets the author"""
-        self._author = value
-
-    @property
-    def operator(self) -> str:
-        """
-        Returns the operator
-        """
-        return self._operator
-
-    @operator.setter
-    def operator(self, value: str) -> None:
-        """
-        Sets the operator
-        """
-        self._operator = value
-
-    @property
-    def parameters(self) -> dict:
-        """
-        Returns the parameters
-        """
-        return self._parameters
-
-    @parameters.setter
-    def parameters(self, value: dict) -> None:
-        """
-        Sets the parameters
-        """
-        self._parameters = value
-
-    @property
-    def dependencies(self) -> list[str]:
-        """
-        Returns the dependencies
-        """
-        return self._dependencies
-
-    @dependencies.setter
-    def dependencies(self, value: list[str]) -> None:
-        """
-        Sets the dependencies
-        """
-        self._dependencies = value
 
+class Delta(Model):
+    __slots__ = ("field", "lower_bound", "upper_bound")
 
-class Delta(object):
     def __init__(self, field: Field, lower_bound: str, upper_bound: int = None) -> None:
-        self._field = field
-        self._lower_bound = lower_bound
-        self._upper_bound = upper_bound
+        self.field = field
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -740,38 +626,10 @@ class Delta(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def field(self) -> Field:
-        """Returns the field"""
-        return self._field
-
-    @field.setter
-    def field(self, value: Field) -> None:
-        """Sets the field"""
-        self._field = value
-
-    @property
-    def lower_bound(self) -> str:
-        """Returns the lower_bound"""
-        return self._lower_bound
-
-    @lower_bound.setter
-    def lower_bound(self, value: str) -> None:
-        """Sets the lower_bound"""
-        self._lower_bound = value
-
-    @property
-    def upper_bound(self) -> int:
-        """Returns the upper_bound"""
-        return self._upper_bound
-
-    @upper_bound.setter
-    def upper_bound(self, value: int) -> None:
-        """Sets the upper_bound"""
-        self._upper_bound = value
-
 
 class OrderField(Field):
+    __slots__ = ("is_desc",)
+
     def __init__(
         self,
         name: str = None,
@@ -790,25 +648,25 @@ class OrderField(Field):
             source_column,
             source_table,
             transformation,
-            nullable,
-            pk,
-            hk,
+            nullable=nullable,
+            pk=pk,
+            hk=hk,
         )
 
-        self._is_desc = is_desc
-
-    @property
-    def is_desc(self) -> bool:
-        """Returns the is_desc"""
-        return self._is_desc
+        self.is_desc = is_desc
 
-    @is_desc.setter
-    def is_desc(self, value: bool) -> None:
-        """Sets the is_desc"""
-        self._is_desc = value
 
+class Analytic(Model):
+    __slots__ = (
+        "partition",
+        "driving_column",
+        "order",
+        "type",
+        "column",
+        "offset",
+        "default",
+    )
 
-class Analytic(object):
     def __init__(
         self,
         partition: list[Field],
@@ -819,13 +677,13 @@ class Analytic(object):
         offset: int = None,
         default: str = None,
     ) -> None:
-        self._partition = partition
-        self._driving_column = driving_column
-        self._order = order
-        self._type = type
-        self._column = column
-        self._offset = offset
-        self._default = default
+        self.partition = partition
+        self.driving_column = driving_column
+        self.order = order
+        self.type = type
+        self.column = column
+        self.offset = offset
+        self.default = default
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -833,78 +691,18 @@ class Analytic(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def partition(self) -> Field:
-        """Returns the partition"""
-        return self._partition
-
-    @partition.setter
-    def partition(self, value: Field) -> None:
-        """Sets the partition"""
-        self._partition = value
-
-    @property
-    def driving_column(self) -> Field:
-        """Returns the driving_column"""
-        return self._driving_column
-
-    @driving_column.setter
-    def driving_column(self, value: Field) -> None:
-        """Sets the driving_column"""
-        self._driving_column = value
-
-    @property
-    def order(self) -> list[OrderField]:
-        """Returns the order"""
-        return self._order
-
-    @order.setter
-    def order(self, value: list[OrderField]) -> None:
-        """Sets the order"""
-        self._order = value
-
-    @property
-    def type(self) -> AnalyticType:
-        """Returns the type"""
-        return self._type
-
-    @type.setter
-    def type(self, value: AnalyticType) -> None:
-        """Sets the type"""
-        self._type = value
 
-    @property
-    def column(self) -> Field:
-        """Returns the column"""
-        return self._column
-
-    @column.setter
-    def column(self, value: Field) -> None:
-        """Sets the column"""
-        self._column = value
-
-    @property
-    def offset(self) -> int:
-        """Returns the offset"""
-        return self._offset
-
-    @offset.setter
-    def offset(self, value: int) -> None:
-        """Sets the offset"""
-        self._offset = value
-
-    @property
-    def default(self) -> str:
-        """Returns the default"""
-        return self._default
-
-    @default.setter
-    def default(self, value: str) -> None:
-        """Sets the default"""
-        self._default = value
+class UpdateTask(Model):
+    __slots__ = (
+        "target_dataset",
+        "target_table",
+        "source_dataset",
+        "source_table",
+        "source_to_target",
+        "tables",
+        "where",
+    )
 
-
-class UpdateTask(object):
     def __init__(
         self,
         target_dataset: str,
@@ -916,13 +714,13 @@ class UpdateTask(object):
         where: list[Condition],
     ) -> None:
 
-        self._target_dataset = target_dataset
-        self._target_table = target_table
-        self._source_dataset = source_dataset
-        self._source_table = source_table
-        self._source_to_target = source_to_target
-        self._tables = tables
-        self._where = where
+        self.target_dataset = target_dataset
+        self.target_table = target_table
+        self.source_dataset = source_dataset
+        self.source_table = source_table
+        self.source_to_target = source_to_target
+        self.tables = tables
+        self.where = where
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -930,106 +728,26 @@ class UpdateTask(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def target_dataset(self):
-        """
-        Returns the target_dataset
-        """
-        return self._target_dataset
-
-    @target_dataset.setter
-    def target_dataset(self, value):
-        """
-        Sets the target_dataset
-        """
-        self._target_dataset = value
-
-    @property
-    def target_table(self):
-        """
-        Returns the target_table
-        """
-        return self._target_table
-
-    @target_table.setter
-    def target_table(self, value):
-        """
-        Sets the target_table
-        """
-        self._target_table = value
-
-    @property
-    def source_dataset(self):
-        """
-        Returns the source_dataset
-        """
-        return self._source_dataset
-
-    @source_dataset.setter
-    def source_dataset(self, value):
-        """
-        Sets the source_dataset
-        """
-        self._source_dataset = value
-
-    @property
-    def source_table(self):
-        """
-        Returns the source_table
-        """
-        return self._source_table
-
-    @source_table.setter
-    def source_table(self, value):
-        """
-        Sets the source_table
-        """
-        self._source_table = value
-
-    @property
-    def source_to_target(self) -> list[Field]:
-        """
-        Returns the source_to_target
-        """
-        return self._source_to_target
-
-    @source_to_target.setter
-    def source_to_target(self, value: list[Field]):
-        """
-        Sets the source_to_target
-        """
-        self._source_to_target = value
-
-    @property
-    def tables(self):
-        """
-        Returns the tables
-        """
-        return self._tables
-
-    @tables.setter
-    def tables(self, value):
-        """
-        Sets the tables
-        """
-        self._tables = value
-
-    @property
-    def where(self):
-        """
-        Returns the where
-        """
-        return self._where
-
-    @where.setter
-    def where(self, value):
-        """
-        Sets the where
-        """
-        self._where = value
 
+class SQLParameter(Model):
+    __slots__ = (
+        "block_data_check",
+        "destination_table",
+        "target_type",
+        "driving_table",
+        "source_to_target",
+        "source_tables",
+        "write_disposition",
+        "sql",
+        "joins",
+        "where",
+        "delta",
+        "destination_dataset",
+        "staging_dataset",
+        "history",
+        "build_artifacts",
+    )
 
-class SQLParameter(object):
     def __init__(
         self,
         destination_table: str,
@@ -1048,21 +766,21 @@ class SQLParameter(object):
         block_data_check: bool = False,
         build_artifacts: bool = True,
     ) -> None:
-        self._block_data_check = block_data_check
-        self._destination_table = destination_table
-        self._target_type = target_type
-        self._driving_table = driving_table
-        self._source_to_target = source_to_target
-        self._source_tables = source_tables
-        self._write_disposition = write_disposition
-        self._sql = sql
-        self._joins = joins
-        self._where = where
-        self._delta = delta
-        self._destination_dataset = destination_dataset
-        self._staging_dataset = staging_dataset
-        self._history = history
-        self._build_artifacts = build_artifacts
+        self.block_data_check = block_data_check
+        self.destination_table = destination_table
+        self.target_type = target_type
+        self.driving_table = driving_table
+        self.source_to_target = source_to_target
+        self.source_tables = source_tables
+        self.write_disposition = write_disposition
+        self.sql = sql
+        self.joins = joins
+        self.where = where
+        self.delta = delta
+        self.destination_dataset = destination_dataset
+        self.staging_dataset = staging_dataset
+        self.history = history
+        self.build_artifacts = build_artifacts
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -1070,158 +788,10 @@ class SQLParameter(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def block_data_check(self) -> bool:
-        """Returns the block_data_check"""
-        return self._block_data_check
-
-    @block_data_check.setter
-    def block_data_check(self, value: bool) -> None:
-        """Sets the block_data_check"""
-        self._block_data_check = value
-
-    @property
-    def build_artifacts(self) -> bool:
-        """Returns the build_artifacts"""
-        return self._build_artifacts
-
-    @build_artifacts.setter
-    def build_artifacts(self, value: bool) -> None:
-        """Sets the build_artifacts"""
-        self.build_artifacts = value
-
-    @property
-    def target_type(self) -> TableType:
-        """Returns the target_type"""
-        return self._target_type
-
-    @target_type.setter
-    def target_type(self, value: TableType) -> None:
-        """Sets the target_type"""
-        self._target_type = value
-
-    @property
-    def driving_table(self) -> str:
-        """Returns the driving_table"""
-        return self._driving_table
-
-    @driving_table.setter
-    def driving_table(self, value: str) -> None:
-        """Sets the driving_table"""
-        self._driving_table = value
-
-    @property
-    def source_to_target(self) -> list[Field]:
-        """Returns the source_to_target"""
-        return self._source_to_target
-
-    @source_to_target.setter
-    def source_to_target(self, value: list[Field]) -> None:
-        """Sets the source_to_target"""
-        self._source_to_target = value
-
-    @property
-    def source_tables(self) -> dict:
-        """Returns the source_tables"""
-        return self._source_tables
-
-    @source_tables.setter
-    def source_tables(self, value: dict) -> None:
-        """Sets the source_tables"""
-        self._source_tables = value
-
-    @property
-    def write_disposition(self) -> WriteDisposition:
-        """Returns the write_disposition"""
-        return self._write_disposition
-
-    @write_disposition.setter
-    def write_disposition(self, value: WriteDisposition) -> None:
-        """Sets the write_disposition"""
-        self._write_disposition = value
-
-    @property
-    def sql(self) -> str:
-        """Returns the sql"""
-        return self._sql
-
-    @sql.setter
-    def sql(self, value: str) -> None:
-        """Sets the sql"""
-        self._sql = value
-
-    @property
-    def joins(self) -> list[Join]:
-        """Returns the joins"""
-        return self._joins
-
-    @joins.setter
-    def joins(self, value: list[Join]) -> None:
-        """Sets the joins"""
-        self._joins = value
-
-    @property
-    def where(self) -> list[Condition]:
-        """Returns the where"""
-        return self._where
-
-    @where.setter
-    def where(self, value: list[Condition]) -> None:
-        """Sets the where"""
-        self._where = value
-
-    @property
-    def delta(self) -> Delta:
-        """Returns the delta"""
-        return self._delta
-
-    @delta.setter
-    def delta(self, value: Delta) -> None:
-        """Sets the delta"""
-        self._delta = value
-
-    @property
-    def destination_dataset(self) -> str:
-        """Returns the destination_dataset"""
-        return self._destination_dataset
-
-    @destination_dataset.setter
-    def destination_dataset(self, value: str) -> None:
-        """Sets the destination_dataset"""
-        self._destination_dataset = value
-
-    @property
-    def destination_table(self) -> str:
-        """Returns the destination_table"""
-        return self._destination_table
-
-    @destination_table.setter
-    def destination_table(self, value: str) -> None:
-        """Sets the destination_table"""
-        self._destination_table = value
-
-    @property
-    def staging_dataset(self) -> str:
-        """Returns the staging_dataset"""
-        return self._staging_dataset
-
-    @staging_dataset.setter
-    def staging_dataset(self, value: str) -> None:
-        """Sets the staging_dataset"""
-        self._staging_dataset = value
-
-    @property
-    def history(self) -> Analytic:
-        """Returns the history"""
-        return self._history
-
-    @history.setter
-    def history(self, value: Analytic) -> None:
-        """Sets the history"""
-        self._history = value
-
 
 class SQLTask(Task):
+    __slots__ = ()
+
     def __init__(
         self,
         task_id: str,
@@ -1235,23 +805,6 @@ class SQLTask(Task):
             task_id, operator, parameters, author, dependencies, description
         )
 
-    @property
-    def author(self) -> str:
-        """Returns the author"""
-        return self._author
-
-    @author.setter
-    def author(self, value: str) -> None:
-        """Sets the author"""
-        self._author = value
-
-    @property
-    def operator(self) -> TaskOperator:
-        """
-        Returns the operator
-        """
-        return self._operator
-
     @property
     def description(self) -> str:
         """
@@ -1259,27 +812,6 @@ class SQLTask(Task):
         """
         return self._description
 
-    @operator.setter
-    def operator(self, value: TaskOperator) -> None:
-        """
-        Sets the operator
-        """
-        self._operator = value
-
-    @property
-    def parameters(self) -> SQLParameter:
-        """
-        Returns the parameters
-        """
-        return self._parameters
-
-    @parameters.setter
-    def parameters(self, value: SQLParameter) -> None:
-        """
-        Sets the parameters
-        """
-        self._parameters = value
-
     @property
     def history_keys(self) -> list[str]:
         """
@@ -1396,10 +928,12 @@ class SQLTask(Task):
         return None
 
 
-class SQLDataCheckParameter(object):
+class SQLDataCheckParameter(Model):
+    __slots__ = ("sql", "params")
+
     def __init__(self, sql: str, params: dict = None) -> None:
-        self._sql = sql
-        self._params = params
+        self.sql = sql
+        self.params = params
 
     def __str__(self) -> str:
         return str(todict(self))
@@ -1407,28 +941,10 @@ class SQLDataCheckParameter(object):
     def __repr__(self):
         return str(self)
 
-    @property
-    def sql(self) -> str:
-        """Returns the sql"""
-        return self._sql
-
-    @sql.setter
-    def sql(self, value: str) -> None:
-        """Sets the sql"""
-        self._sql = value
-
-    @property
-    def params(self) -> dict:
-        """Returns the params"""
-        return self._params
-
-    @params.setter
-    def params(self, value: dict) -> None:
-        """Sets the params"""
-        self._params = value
-
 
 class SQLDataCheckTask(Task):
+    __slots__ = ()
+
     def __init__(
         self,
         task_id: str,
@@ -1438,39 +954,205 @@ class SQLDataCheckTask(Task):
     ) -> None:
         super().__init__(task_id, operator, parameters, dependencies)
 
-    @property
-    def operator(self) -> TaskOperator:
-        """
-        Returns the operator
-        """
-        return self._operator
 
-    @operator.setter
-    def operator(self, value: TaskOperator) -> None:
-        """
-        Sets the operator
-        """
-        self._operator = value
+def get_slots(cls: type) -> list[tuple]:
+    """
+    It returns the slots of a class and its base classes, in the order they are assigned by __init__,
+    with the key each is written to by todict; the slot with any leading underscore removed.  Slots
+    starting _cached_ hold values derived from the others and are not returned, so they are not written
+    by todict nor copied
 
-    @property
-    def parameters(self) -> SQLDataCheckParameter:
-        """
-        Returns the parameters
-        """
-        return self._parameters
+    Args:
+      cls (type): the class.
 
-    @parameters.setter
-    def parameters(self, value: SQLDataCheckParameter) -> None:
-        """
-        Sets the parameters
-        """
-        self._parameters = value
+    Returns:
+      A list of tuples of the slot and key.
+    """
+    if cls not in SLOTS:
+        SLOTS[cls] = [
+            (slot, re.sub(r"^_", "", slot))
+            for c in reversed(cls.__mro__)
+            for slot in c.__dict__.get("__slots__", ())
+            if not slot.startswith("_cached_")
+        ]
+    return SLOTS[cls]
+
+
+def serialize_value(obj, classkey):
+    """
+    It returns the object unchanged, i.e. a str, int, float, bool or None
+
+    Args:
+      obj: The object.
+      classkey: Not used.
+
+    Returns:
+      The object.
+    """
+    return obj
+
+
+def serialize_dict(obj: dict, classkey) -> dict:
+    """
+    It converts each value of a dictionary
+
+    Args:
+      obj (dict): The dictionary.
+      classkey: The key of the class name, passed to the conversion of each value.
+
+    Returns:
+      A dictionary of the keys and converted values.
+    """
+    return {k: todict(v, classkey) for k, v in obj.items()}
+
+
+def serialize_ast(obj, classkey):
+    """
+    It converts the result of the _ast method of the object, without the class name
+
+    Args:
+      obj: The object.
+      classkey: Not used.
+
+    Returns:
+      The converted result of _ast.
+    """
+    return todict(obj._ast())
+
+
+def serialize_iterable(obj, classkey) -> list:
+    """
+    It converts each item of an iterable
+
+    Args:
+      obj: The iterable.
+      classkey: The key of the class name, passed to the conversion of each item.
+
+    Returns:
+      A list of the converted items.
+    """
+    return [todict(v, classkey) for v in obj]
+
+
+def serialize_enum(obj: Enum, classkey) -> str:
+    """
+    It returns the name of an enum member
+
+    Args:
+      obj (Enum): The enum member.
+      classkey: Not used.
+
+    Returns:
+      The name of the member.
+    """
+    return obj.name
+
+
+def create_slots_serializer(cls: type):
+    """
+    It creates the function which converts an object of a slotted class, the slots and the keys they
+    are written to are looked up once here rather than for each object
+
+    Args:
+      cls (type): the class.
+
+    Returns:
+      A function of the object and classkey returning a dictionary of its slots which are set.
+    """
+    slots = tuple(get_slots(cls))
+    name = cls.__name__
+
+    def serialize_slots(obj, classkey) -> dict:
+        data = {}
+        for slot, key in slots:
+            value = getattr(obj, slot, todict)
+            if value is not todict and not callable(value):
+                serializer = SERIALIZERS.get(type(value))
+                if serializer is serialize_value:
+                    data[key] = value
+                else:
+                    data[key] = todict(value, classkey)
+        if classkey is not None:
+            data[classkey] = name
+        return data
+
+    return serialize_slots
+
+
+def serialize_object(obj, classkey):
+    """
+    It converts the attributes of an object which are not callable, with any leading underscore
+    removed from their name, or where it has no attributes returns it unchanged
+
+    Args:
+      obj: The object.
+      classkey: If this is provided, the resulting dictionary will include a key for the class name of
+    the object.
+
+    Returns:
+      A dictionary of the object's attributes, or the object.
+    """
+    if not hasattr(obj, "__dict__"):
+        return obj
+
+    data = {
+        (key[1:] if key[:1] == "_" else key): todict(value, classkey)
+        for key, value in obj.__dict__.items()
+        if not callable(value)
+    }
+    if classkey is not None:
+        data[classkey] = obj.__class__.__name__
+    return data
+
+
+def get_serializer(cls: type):
+    """
+    It returns the function which converts an object of the class to a dictionary, list or value, and
+    registers it for the class so the checks are made once.  The checks are those todict has always
+    made for each object, in the same order, made of the class: a dictionary, an object with an _ast
+    method, an iterable other than a str, an enum, a slotted class, then an object with attributes
+    or a value
+
+    Args:
+      cls (type): the class.
+
+    Returns:
+      A function of the object and classkey.
+    """
+    try:
+        return SERIALIZERS[cls]
+    except KeyError:
+        pass
+
+    # an attribute of an object is looked up on its class and base classes, not
+    # on the metaclass as hasattr of the class would, i.e. an enum class is
+    # iterable but its members are not
+    attributes = {name for c in cls.__mro__ for name in c.__dict__}
+
+    if issubclass(cls, dict):
+        serializer = serialize_dict
+    elif "_ast" in attributes:
+        serializer = serialize_ast
+    elif "__iter__" in attributes and not issubclass(cls, str):
+        serializer = serialize_iterable
+    elif issubclass(cls, Enum):
+        serializer = serialize_enum
+    elif hasattr(cls, "__slots__"):
+        serializer = create_slots_serializer(cls)
+    elif cls in (str, int, float, bool, type(None)):
+        serializer = serialize_value
+    else:
+        serializer = serialize_object
+
+    SERIALIZERS[cls] = serializer
+    return serializer
 
 
 def todict(obj, classkey=None):
     """
     It converts an object to a dictionary, and if the object is a class, it converts the class to a
-    dictionary, and if the class has a class, it converts that class to a dictionary, and so on
+    dictionary, and if the class has a class, it converts that class to a dictionary, and so on.  How
+    an object is converted is decided once for its class, see get_serializer
 
     Args:
       obj: The object to convert to a dictionary.
@@ -1480,30 +1162,250 @@ def todict(obj, classkey=None):
     Returns:
       A dictionary of the object's attributes.
     """
-    if isinstance(obj, dict):
-        data = {}
-        for (k, v) in obj.items():
-            data[k] = todict(v, classkey)
-        return data
-    elif hasattr(obj, "_ast"):
-        return todict(obj._ast())
-    elif hasattr(obj, "__iter__") and not isinstance(obj, str):
-        return [todict(v, classkey) for v in obj]
-    elif issubclass(type(obj), Enum):
-        return obj.name
-    elif hasattr(obj, "__dict__"):
-        data = dict(
-            [
-                (re.sub(r"^_", "", key, re.IGNORECASE), todict(value, classkey))
-                for key, value in obj.__dict__.items()
-                if not callable(value)
-            ]
-        )
-        if classkey is not None and hasattr(obj, "__class__"):
-            data[classkey] = obj.__class__.__name__
-        return data
-    else:
-        return obj
+    cls = type(obj)
+    serializer = SERIALIZERS.get(cls)
+    if serializer is None:
+        serializer = get_serializer(cls)
+    return serializer(obj, classkey)
+
+
+def tojson(obj, indent: int = None, sort_keys: bool = False) -> str:
+    """
+    It converts an object to JSON, the same as json.dumps of todict of the object.  The dictionaries,
+    lists and values are written by the json encoder and only the objects it cannot write are
+    converted by todict, without indent the JSON is compact
+
+    Args:
+      obj: The object to convert to JSON.
+      indent (int): the indent of the JSON. Defaults to None
+      sort_keys (bool): where True the keys of each dictionary are sorted. Defaults to False
+
+    Returns:
+      The JSON of the object.
+    """
+    return json.dumps(
+        obj,
+        default=todict,
+        indent=indent,
+        separators=(",", ":") if indent is None else None,
+        sort_keys=sort_keys,
+    )
+
+
+def create_decoder(cls: type, arguments: tuple):
+    """
+    It creates the function which decodes a dictionary of a config to an object of the class.  The
+    arguments are declared in the order of the parameters of the class, as the key each is read from,
+    the function it is decoded with and its default.  The function is generated from the arguments, as
+    namedtuple and dataclasses generate their methods, so each key is read once in a single call of the
+    class with no loop over the arguments and only the arguments with a decode function are decoded
+
+    Args:
+      cls (type): the class.
+      arguments (tuple): the key, decode function and default of each argument.  Where the decode
+    function is None the value of the key is passed as is, where the key is None the argument is None.
+
+    Returns:
+      A function of the dictionary returning the object.
+    """
+    namespace = {"cls": cls}
+    values = []
+    for index, (key, decode, default) in enumerate(arguments):
+        if key is None:
+            values.append("None")
+        elif decode is None:
+            values.append(f"get({key!r})")
+        else:
+            namespace[f"decode_{index}"] = decode
+            namespace[f"default_{index}"] = default
+            values.append(f"decode_{index}(get({key!r}, default_{index}))")
+
+    source = (
+        "def decode_object(data):\n"
+        "    get = data.get\n"
+        f"    return cls({', '.join(values)})\n"
+    )
+    exec(compile(source, f"<decoder {cls.__name__}>", "exec"), namespace)
+    return namespace["decode_object"]
+
+
+def create_list_decoder(decode):
+    """
+    It creates the function which decodes each item of a list
+
+    Args:
+      decode: the function which decodes an item.
+
+    Returns:
+      A function of the list returning a list of the decoded items.
+    """
+
+    def decode_list(values: list) -> list:
+        return [decode(value) for value in values]
+
+    return decode_list
+
+
+def create_optional_decoder(decode):
+    """
+    It creates the function which decodes a value which may be missing or empty
+
+    Args:
+      decode: the function which decodes the value.
+
+    Returns:
+      A function of the value returning the decoded value, or None where the value is empty.
+    """
+
+    def decode_optional(value):
+        return decode(value) if value else None
+
+    return decode_optional
+
+
+def create_enum_decoder(cls: type):
+    """
+    It creates the function which decodes the value of an enum in any case
+
+    Args:
+      cls (type): the enum, its values are lower case.
+
+    Returns:
+      A function of the value returning the member of the enum.
+    """
+
+    def decode_enum(value: str) -> Enum:
+        return cls(value.lower())
+
+    return decode_enum
+
+
+def create_decoders() -> dict:
+    """
+    It creates the decoder of each conversion type, see create_decoder.  Fields of the source_to_target
+    are decoded with their data type, nullable and default, the fields of an analytic or delta without.
+    The source table of a field is decoded where it is not empty, the source table of a join always
+
+    Returns:
+      A dictionary of the conversion type to a function of the config returning the object.
+    """
+    decode_source_table = create_decoder(
+        SourceTable, tuple((key, None, None) for key in SOURCE_TABLE_KEYS)
+    )
+    decode_optional_source_table = create_optional_decoder(decode_source_table)
+
+    decode_field = create_decoder(
+        Field,
+        (
+            ("name", None, None),
+            (None, None, None),
+            ("source_column", None, None),
+            ("source_table", decode_optional_source_table, None),
+            ("transformation", None, None),
+            (None, None, None),
+            (None, None, None),
+            ("is_primary_key", None, None),
+            ("is_history_key", None, None),
+        ),
+    )
+    decode_fields = create_list_decoder(decode_field)
+
+    decode_order_field_values = create_decoder(
+        OrderField,
+        (
+            ("name", None, None),
+            (None, None, None),
+            ("source_column", None, None),
+            ("source_table", decode_optional_source_table, None),
+            ("transformation", None, None),
+            (None, None, None),
+            ("is_primary_key", None, None),
+            ("is_history_key", None, None),
+        ),
+    )
+
+    def decode_order_field(data: dict) -> OrderField:
+        field = decode_order_field_values(data.get("field", {}))
+        field.is_desc = data.get("is_desc")
+        return field
+
+    decode_condition = create_decoder(
+        Condition,
+        (
+            ("fields", list, ()),
+            ("condition", create_enum_decoder(LogicOperator), "and"),
+            ("operator", Operator, "="),
+        ),
+    )
+
+    return {
+        ConversionType.ANALYTIC: create_decoder(
+            Analytic,
+            (
+                ("partition", decode_fields, None),
+                ("order", create_list_decoder(decode_order_field), None),
+                ("type", AnalyticType, None),
+                ("driving_column", decode_fields, None),
+                ("column", decode_field, {}),
+                ("offset", None, None),
+                ("default", None, None),
+            ),
+        ),
+        ConversionType.DELTA: create_decoder(
+            Delta,
+            (
+                ("field", decode_field, {}),
+                ("lower_bound", None, None),
+                ("upper_bound", None, None),
+            ),
+        ),
+        ConversionType.JOIN: create_list_decoder(
+            create_decoder(
+                Join,
+                (
+                    ("right", decode_source_table, {}),
+                    ("on", create_list_decoder(decode_condition), ()),
+                    ("left", decode_source_table, {}),
+                    ("type", create_enum_decoder(JoinType), "left"),
+                ),
+            )
+        ),
+        ConversionType.SOURCE: create_list_decoder(
+            create_decoder(
+                Field,
+                (
+                    ("name", None, None),
+                    ("data_type", None, None),
+                    ("source_column", None, None),
+                    ("source_table", decode_optional_source_table, None),
+                    ("transformation", None, None),
+                    ("default", None, None),
+                    ("is_nullable", None, None),
+                    ("is_primary_key", None, None),
+                    ("is_history_key", None, None),
+                ),
+            )
+        ),
+        ConversionType.SOURCETABLES: lambda tables: {
+            key: decode_source_table(table) for key, table in tables.items()
+        },
+        ConversionType.WHERE: create_list_decoder(decode_condition),
+    }
+
+
+def get_decoder(conversiontype: ConversionType):
+    """
+    It returns the decoder of the conversion type, the decoders are created when first used
+
+    Args:
+      conversiontype (ConversionType): The type of object to decode to.
+
+    Returns:
+      A function of the config returning the object.
+    """
+    if not DECODERS:
+        DECODERS.update(create_decoders())
+    return DECODERS[conversiontype]
 
 
 def converttoobj(
@@ -1511,7 +1413,8 @@ def converttoobj(
     conversiontype: ConversionType,
 ) -> Union[Analytic, Delta, list[Join], list[Condition], list[Field]]:
     """
-    It takes a list or dictionary and converts it to a list of Join, Condition, or Field objects
+    It takes a list or dictionary and converts it to a list of Join, Condition, or Field objects.  It is
+    decoded by the decoder of the conversion type, see create_decoders
 
     Args:
       input (Union[list, dict]): The input to be converted.
@@ -1544,192 +1447,4 @@ def converttoobj(
                 f"A dictionary input must be provided for conversion to {conversiontype.value}"
             )
 
-    if conversiontype == ConversionType.ANALYTIC:
-        obj = Analytic(
-            [
-                Field(
-                    name=field.get("name"),
-                    source_column=field.get("source_column"),
-                    source_table=SourceTable(
-                        source_project=field.get("source_table", {}).get(
-                            "source_project"
-                        ),
-                        dataset_name=field.get("source_table", {}).get("dataset_name"),
-                        table_name=field.get("source_table", {}).get("table_name"),
-                        alias=field.get("source_table", {}).get("alias"),
-                    )
-                    if field.get("source_table")
-                    else None,
-                    transformation=field.get("transformation"),
-                    pk=field.get("is_primary_key"),
-                    hk=field.get("is_history_key"),
-                )
-                for field in input.get("partition")
-            ],
-            [
-                OrderField(
-                    name=field.get("field", {}).get("name"),
-                    source_column=field.get("field", {}).get("source_column"),
-                    source_table=SourceTable(
-                        source_project=field.get("field", {})
-                        .get("source_table", {})
-                        .get("source_project"),
-                        dataset_name=field.get("field", {})
-                        .get("source_table", {})
-                        .get("dataset_name"),
-                        table_name=field.get("field", {})
-                        .get("source_table", {})
-                        .get("table_name"),
-                        alias=field.get("field", {})
-                        .get("source_table", {})
-                        .get("alias"),
-                    )
-                    if field.get("source_table")
-                    else None,
-                    transformation=field.get("field", {}).get("transformation"),
-                    pk=field.get("field", {}).get("is_primary_key"),
-                    hk=field.get("field", {}).get("is_history_key"),
-                    is_desc=field.get("is_desc"),
-                )
-                for field in input.get("order")
-            ],
-            AnalyticType(input.get("type")),
-            [
-                Field(
-                    name=field.get("name"),
-                    source_column=field.get("source_column"),
-                    source_table=SourceTable(
-                        source_project=field.get("source_table", {}).get(
-                            "source_project"
-                        ),
-                        dataset_name=field.get("source_table", {}).get("dataset_name"),
-                        table_name=field.get("source_table", {}).get("table_name"),
-                        alias=field.get("source_table", {}).get("alias"),
-                    )
-                    if field.get("source_table")
-                    else None,
-                    transformation=field.get("transformation"),
-                    pk=field.get("is_primary_key"),
-                    hk=field.get("is_history_key"),
-                )
-                for field in input.get("driving_column")
-            ],
-            Field(
-                name=input.get("column", {}).get("name"),
-                source_column=input.get("column", {}).get("source_column"),
-                source_table=SourceTable(
-                    source_project=input.get("column", {})
-                    .get("source_table", {})
-                    .get("source_project"),
-                    dataset_name=input.get("column", {})
-                    .get("source_table", {})
-                    .get("dataset_name"),
-                    table_name=input.get("column", {})
-                    .get("source_table", {})
-                    .get("table_name"),
-                    alias=input.get("column", {}).get("source_table", {}).get("alias"),
-                )
-                if input.get("source_table")
-                else None,
-                transformation=input.get("column", {}).get("transformation"),
-                pk=input.get("column", {}).get("is_primary_key"),
-                hk=input.get("column", {}).get("is_history_key"),
-            ),
-            input.get("offset"),
-            input.get("default"),
-        )
-
-    elif conversiontype == ConversionType.DELTA:
-        field = input.get("field", {})
-        obj = Delta(
-            Field(
-                name=field.get("name"),
-                source_column=field.get("source_column"),
-                source_table=SourceTable(
-                    source_project=field.get("source_table", {}).get("source_project"),
-                    dataset_name=field.get("source_table", {}).get("dataset_name"),
-                    table_name=field.get("source_table", {}).get("table_name"),
-                    alias=field.get("source_table", {}).get("alias"),
-                )
-                if field.get("source_table")
-                else None,
-                transformation=field.get("transformation"),
-                pk=field.get("is_primary_key"),
-                hk=field.get("is_history_key"),
-            ),
-            input.get("lower_bound"),
-            upper_bound=input.get("upper_bound"),
-        )
-
-    elif conversiontype == ConversionType.JOIN:
-        obj = [
-            Join(
-                SourceTable(
-                    source_project=j.get("right", {}).get("source_project"),
-                    dataset_name=j.get("right", {}).get("dataset_name"),
-                    table_name=j.get("right", {}).get("table_name"),
-                    alias=j.get("right", {}).get("alias"),
-                ),
-                [
-                    Condition(
-                        [field for field in c.get("fields", [])],
-                        operator=Operator(c.get("operator", "=")),
-                        condition=LogicOperator(c.get("condition", "and").lower()),
-                    )
-                    for c in j.get("on", [])
-                ],
-                SourceTable(
-                    source_project=j.get("left", {}).get("source_project"),
-                    dataset_name=j.get("left", {}).get("dataset_name"),
-                    table_name=j.get("left", {}).get("table_name"),
-                    alias=j.get("left", {}).get("alias"),
-                ),
-                JoinType(j.get("type", "left").lower()),
-            )
-            for j in input
-        ]
-
-    elif conversiontype == ConversionType.SOURCE:
-        obj = [
-            Field(
-                name=field.get("name"),
-                data_type=field.get("data_type"),
-                source_column=field.get("source_column"),
-                source_table=SourceTable(
-                    source_project=field.get("source_table", {}).get("source_project"),
-                    dataset_name=field.get("source_table", {}).get("dataset_name"),
-                    table_name=field.get("source_table", {}).get("table_name"),
-                    alias=field.get("source_table", {}).get("alias"),
-                )
-                if field.get("source_table")
-                else None,
-                transformation=field.get("transformation"),
-                nullable=field.get("is_nullable"),
-                default=field.get("default"),
-                pk=field.get("is_primary_key"),
-                hk=field.get("is_history_key"),
-            )
-            for field in input
-        ]
-    elif conversiontype == ConversionType.SOURCETABLES:
-        obj = {
-            key: SourceTable(
-                source_project=input[key].get("source_project"),
-                dataset_name=input[key].get("dataset_name"),
-                table_name=input[key].get("table_name"),
-                alias=input[key].get("alias"),
-            )
-            for key in input
-        }
-
-    elif conversiontype == ConversionType.WHERE:
-        obj = [
-            Condition(
-                [field for field in c.get("fields", [])],
-                operator=Operator(c.get("operator", "=")),
-                condition=LogicOperator(c.get("condition", "and").lower()),
-            )
-            for c in input
-        ]
-
-    return obj
+    return get_decoder(conversiontype)(input)
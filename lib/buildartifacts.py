@@ -1,17 +1,20 @@
+import copy
 import json
 import os
 import re
 
-from lib.baseclasses import converttoobj, ConversionType, Field, Task, WriteDisposition
+from lib.artifactwriter import write_artifact
+from lib.baseclasses import Field, WriteDisposition
 from lib.helper import ifnull
-from lib.logger import format_message, ILogger
+from lib.jobmodel import Job
+from lib.logger import ILogger, lazy_format_message
 
 __all__ = [
     "buildartifacts",
 ]
 
 
-def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
+def buildartifacts(logger: ILogger, args: dict, job: Job) -> int:
     """
     This function creates the table definition and table build config files for the objects defined in
     the config file
@@ -20,42 +23,32 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
       logger (ILogger): ILogger - this is the logger object that is used to log messages to the console
     and to the log file.
       args (dict): The command line arguments passed to the script.
-      config (dict): The configuration file that was passed in.
+      job (Job): The job created from the configuration file that was passed in.
 
     Returns:
       The return value is the exit code of the function.
     """
-    logger.info(format_message(f"buildartifacts - STARTED".center(100, "-")))
+    logger.started()
 
     # for config file provided use the content of the JSON to create
     # the statements needed to be inserted into the template
-    logger.info(format_message(f"creating object artifacts - {config['name']}"))
+    logger.info(lazy_format_message(f"creating object artifacts - {job.name}"))
 
     # for each item in the task array, check the operator type and use this
     # to determine the task parameters to be used
-    for t in config["tasks"]:
-        task = Task(
-            t.get("task_id"),
-            t.get("operator"),
-            t.get("parameters", {}),
-            t.get("author"),
-            t.get("dependencies"),
-            t.get("description"),
-        )
+    for job_task in job.tasks:
+        task = job_task.to_task()
 
-        task.parameters["source_to_target"] = converttoobj(
-            task.parameters.get("source_to_target", []), ConversionType.SOURCE
-        )
+        if task.parameters.get("write_disposition") == "DELETE":
+            continue
 
-        task.parameters["source_tables"] = converttoobj(
-            task.parameters.get("source_tables", {}), ConversionType.SOURCETABLES
-        )
+        # the fields and source tables are shared with the other builders, the
+        # list is copied before the dw fields are added to it
+        task.parameters["source_to_target"] = list(job_task.source_to_target)
+        task.parameters["source_tables"] = job_task.source_tables
 
         dw_index = 1
 
-        if task.parameters.get("write_disposition") == "DELETE":
-            continue
-
         if task.parameters.get("target_type") == "TYPE1":
             for i, field in enumerate(task.parameters["source_to_target"]):
                 if not field.pk:
@@ -96,30 +89,23 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
                 ),
             )
 
-        task.parameters["joins"] = converttoobj(
-            task.parameters.get("joins", []), ConversionType.JOIN
-        )
-        task.parameters["where"] = converttoobj(
-            task.parameters.get("where", []), ConversionType.WHERE
-        )
-
         if task.parameters.get("build_artifacts", True):
             table_definition = task.parameters["destination_table"]
 
             tables = []
-            logger.info(format_message(f'creating artifacts for "{task.task_id}"'))
+            logger.info(lazy_format_message(f'creating artifacts for "{task.task_id}"'))
 
             # for each source table, remove alias to create a unique list
             # even if we use the same source more than once
             for key in task.parameters["source_tables"].keys():
-                table = task.parameters["source_tables"][key]
+                table = copy.copy(task.parameters["source_tables"][key])
                 table.alias = ""
                 if (
                     re.search(
                         r"_tds_",
                         table.dataset_name
                         if table.dataset_name
-                        else config.get("properties", {}).get("dataset_source"),
+                        else job.properties.get("dataset_source"),
                         re.IGNORECASE,
                     )
                     and table not in tables
@@ -142,18 +128,16 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
                     for field in task.parameters["source_to_target"]
                 ]
 
-                with open(
+                write_artifact(
+                    logger,
                     os.path.join(
                         args.get("table_def_file"), f"{table_definition}.json"
                     ),
-                    "w",
-                ) as outfile:
-                    outfile.write(
-                        json.dumps(table_def_content, indent=4, sort_keys=True)
-                    )
+                    json.dumps(table_def_content, indent=4, sort_keys=True),
+                )
 
                 logger.info(
-                    format_message(
+                    lazy_format_message(
                         f'table definition created "{table_definition}.json"'
                     )
                 )
@@ -164,7 +148,7 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
                         "object_type": "table",
                         "dataset_name": ifnull(
                             task.parameters["destination_dataset"],
-                            config.get("properties", {}).get("dataset_publish"),
+                            job.properties.get("dataset_publish"),
                         ),
                         "def_file": f"{table_definition}.json",
                     }
@@ -187,9 +171,7 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
                                     "-ENV",
                                     table.source_project
                                     if table.source_project
-                                    else config.get("properties", {}).get(
-                                        "source_project"
-                                    ),
+                                    else job.properties.get("source_project"),
                                     re.IGNORECASE,
                                 )
                             },
@@ -201,18 +183,17 @@ def buildartifacts(logger: ILogger, args: dict, config: dict) -> int:
                 ]
             )
 
-            with open(
-                os.path.join(args.get("table_cfg"), f"cfg_{table_definition}.json"), "w"
-            ) as outfile:
-                outfile.write(json.dumps(table_build_config, indent=4, sort_keys=True))
+            write_artifact(
+                logger,
+                os.path.join(args.get("table_cfg"), f"cfg_{table_definition}.json"),
+                json.dumps(table_build_config, indent=4, sort_keys=True),
+            )
 
             logger.info(
-                format_message(
+                lazy_format_message(
                     f'table build config created "cfg_{table_definition}.json"'
                 )
             )
 
-    logger.info(
-        format_message(f"buildartifacts COMPLETED SUCCESSFULLY".center(100, "-"))
-    )
+    logger.completed()
     return 0
@@ -0,0 +1,315 @@
+import glob
+import hashlib
+import json
+import os
+
+from functools import lru_cache
+from lib.logger import format_message, ILogger
+
+__all__ = [
+    "GENERATOR_VERSION",
+    "config_hash",
+    "config_inputs",
+    "generator_files",
+    "is_unchanged",
+    "filter_manifest",
+    "load_manifest",
+    "merge_manifests",
+    "save_manifest",
+    "update_manifest",
+]
+
+# bump the version whenever a change to the generator should force every
+# config to be rebuilt
+GENERATOR_VERSION = "1.0.0"
+MANIFEST_VERSION = 2
+
+# args which do not change the content of the generated files and so are
+# excluded from the config hash
+NON_OUTPUT_ARGS = [
+    "changed_since",
+    "config",
+    "debug_level",
+    "exclude",
+    "force",
+    "include",
+    "lint",
+    "lint_cache",
+    "lint_config",
+    "log",
+    "log_format",
+    "log_queue",
+    "manifest",
+    "profile",
+    "shard",
+    "timings",
+    "watch_interval",
+    "workers",
+]
+
+
+def hash_file(path: str) -> str:
+    """
+    It returns the sha256 hex digest of the content of a file
+
+    Args:
+      path (str): the path of the file to hash.
+
+    Returns:
+      The hex digest, or None where the file does not exist.
+    """
+    if not os.path.isfile(path):
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as sourcefile:
+        for block in iter(lambda: sourcefile.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def generator_files() -> list[str]:
+    """
+    It returns the source files of the generator, the lib modules and the buildjobs entry point which
+    drives them, a change to any of them can change the output of every config
+
+    Returns:
+      A sorted list of file paths.
+    """
+    lib_path = os.path.dirname(os.path.abspath(__file__))
+    return sorted(
+        glob.glob(os.path.join(lib_path, "*.py"))
+        + [os.path.join(os.path.dirname(lib_path), "buildjobs.py")]
+    )
+
+
+@lru_cache(maxsize=None)
+def generator_hash() -> str:
+    """
+    It returns a hash of the generator version and the source of the generator so changes to the
+    generator code are picked up even when the version has not been bumped
+
+    Returns:
+      The hex digest.
+    """
+    digest = hashlib.sha256(GENERATOR_VERSION.encode())
+    for path in generator_files():
+        digest.update(f"{os.path.basename(path)}:{hash_file(path)}".encode())
+    return digest.hexdigest()
+
+
+def config_inputs(config: dict, template_path: str = "./templates") -> list[str]:
+    """
+    It creates a list of the input files, other than the config itself, which are used to build a
+    config; the templates and any schema objects referenced by the config tasks
+
+    Args:
+      config (dict): the content of the config file.
+      template_path (str): the directory containing the templates. Defaults to ./templates
+
+    Returns:
+      A sorted list of file paths.
+    """
+    inputs = [
+        os.path.normpath(p)
+        for p in glob.glob(os.path.join(template_path, "*"))
+        if os.path.isfile(p)
+    ]
+
+    for t in config.get("tasks", []):
+        schema_object = t.get("parameters", {}).get("schema_object")
+        if schema_object:
+            inputs.append(os.path.normpath(schema_object))
+
+    return sorted(set(inputs))
+
+
+def config_hash(logger: ILogger, args: dict, path: str, config: dict) -> str:
+    """
+    It creates a hash of everything used to build a config; the config file, the templates, the
+    referenced schema objects, the output args and the generator version.  If the hash is unchanged
+    from the previous build the output will also be unchanged
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      args (dict): a dictionary of the command line arguments
+      path (str): the path of the config file.
+      config (dict): the content of the config file.
+
+    Returns:
+      The hex digest.
+    """
+    digest = hashlib.sha256(generator_hash().encode())
+
+    output_args = {
+        key: value for key, value in args.items() if key not in NON_OUTPUT_ARGS
+    }
+    digest.update(json.dumps(output_args, sort_keys=True, default=str).encode())
+    digest.update(f"{os.path.normpath(path)}:{hash_file(path)}".encode())
+
+    for input_path in config_inputs(config):
+        input_hash = hash_file(input_path)
+        logger.debug(format_message(f"input {input_path}: {input_hash}"))
+        digest.update(f"{input_path}:{input_hash}".encode())
+
+    return digest.hexdigest()
+
+
+def load_manifest(logger: ILogger, path: str) -> dict:
+    """
+    It reads the build manifest, a new empty manifest is returned where the file does not exist or was
+    written by a different version of the generator
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the manifest file.
+
+    Returns:
+      A dictionary containing the manifest.
+    """
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "generator_version": GENERATOR_VERSION,
+        "configs": {},
+    }
+
+    if not path or not os.path.isfile(path):
+        logger.info(
+            format_message(f"no build manifest found, all configs will be built")
+        )
+        return manifest
+
+    try:
+        with open(path, "r") as sourcefile:
+            content = json.loads(sourcefile.read())
+    except (OSError, ValueError):
+        logger.warning(format_message(f"build manifest {path} could not be read"))
+        return manifest
+
+    if (
+        content.get("manifest_version") != MANIFEST_VERSION
+        or content.get("generator_version") != GENERATOR_VERSION
+    ):
+        logger.info(format_message(f"build manifest {path} is out of date"))
+        return manifest
+
+    manifest["configs"] = content.get("configs", {})
+    return manifest
+
+
+def save_manifest(logger: ILogger, path: str, manifest: dict) -> None:
+    """
+    It writes the build manifest, the file is written to a temporary file first and then renamed so an
+    interrupted build cannot leave a partial manifest
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the manifest file.
+      manifest (dict): the manifest to write.
+    """
+    if not path:
+        return None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as outfile:
+        outfile.write(json.dumps(manifest, indent=4, sort_keys=True))
+    os.replace(temp_path, path)
+
+    logger.info(format_message(f"build manifest written {path}"))
+    return None
+
+
+def is_unchanged(manifest: dict, path: str, input_hash: str) -> bool:
+    """
+    It checks if the config was last built from the same inputs and every artifact recorded for the
+    config still exists
+
+    Args:
+      manifest (dict): the build manifest.
+      path (str): the path of the config file.
+      input_hash (str): the hash of the current inputs of the config.
+
+    Returns:
+      True where the config does not need to be rebuilt.
+    """
+    if not input_hash:
+        return False
+
+    entry = manifest["configs"].get(os.path.normpath(path), {})
+    if entry.get("hash") != input_hash:
+        return False
+
+    return all(os.path.isfile(p) for p in entry.get("outputs", []))
+
+
+def update_manifest(
+    manifest: dict, path: str, input_hash: str, outputs: list[str] = None
+) -> None:
+    """
+    It records the hash of the inputs used to build the config and the artifacts it was built to
+
+    Args:
+      manifest (dict): the build manifest.
+      path (str): the path of the config file.
+      input_hash (str): the hash of the inputs of the config.
+      outputs (list[str]): the paths of the artifacts built from the config.
+    """
+    manifest["configs"][os.path.normpath(path)] = {
+        "hash": input_hash,
+        "outputs": sorted(outputs or []),
+    }
+    return None
+
+
+def filter_manifest(manifest: dict, paths: list[str]) -> dict:
+    """
+    It returns a copy of the manifest holding only the configs supplied, a sharded build records only
+    the configs of its shard so the manifests of the shards can be merged
+
+    Args:
+      manifest (dict): the build manifest.
+      paths (list[str]): the paths of the config files to keep.
+
+    Returns:
+      A dictionary containing the manifest.
+    """
+    keep = [os.path.normpath(p) for p in paths]
+    return dict(
+        manifest,
+        configs={
+            path: entry for path, entry in manifest["configs"].items() if path in keep
+        },
+    )
+
+
+def merge_manifests(logger: ILogger, paths: list[str]) -> dict:
+    """
+    It combines the build manifests written by each shard of a build into a single manifest, where a
+    config appears in more than one manifest the entry of the last manifest is used
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      paths (list[str]): the paths of the manifest files.
+
+    Returns:
+      A dictionary containing the manifest.
+    """
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "generator_version": GENERATOR_VERSION,
+        "configs": {},
+    }
+    for path in paths:
+        shard_manifest = load_manifest(logger, path)
+        logger.info(
+            format_message(
+                f"merging {len(shard_manifest['configs'])} config(s) from {path}"
+            )
+        )
+        manifest["configs"].update(shard_manifest["configs"])
+
+    return manifest
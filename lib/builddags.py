@@ -1,4 +1,3 @@
-import black
 import json
 import os
 import pathlib
@@ -9,12 +8,17 @@ from lib.baseclasses import (
     Task,
     SQLDataCheckTask,
     SQLDataCheckParameter,
+    SQLTask,
     todict,
 )
 
-from jinja2 import Environment, FileSystemLoader
-from lib.logger import format_message, ILogger
+from lib.artifactwriter import write_artifact
+from lib.helper import get_template_environment
+from lib.jobmodel import create_job_task, Job
+from lib.logger import ILogger, lazy_format_message, set_log_context
+from logging import DEBUG
 from lib.sql_helper import create_sql_file
+from lib.timing import stage
 from shutil import copy
 
 __all__ = [
@@ -22,75 +26,77 @@ __all__ = [
 ]
 
 
-def builddags(logger: ILogger, args: dict, config: dict) -> int:
+def builddags(logger: ILogger, args: dict, job: Job) -> int:
     """
-    The function takes a JSON file as input, and creates a DAG file for each DAG in the JSON file
+    The function takes a job, parsed from a JSON file, as input, and creates a DAG file for it
 
     Args:
       logger (ILogger): ILogger - this is the logger object that is used to log messages to the console
     and to the log file.
       args (dict): the command line arguments
-      config (dict): The configuration file that is being used to build the DAG.
+      job (Job): the job created from the configuration file that is being used to build the DAG.
 
     Returns:
       0
     """
 
-    logger.info(format_message(f"dag files STARTED".center(100, "-")))
+    logger.started()
 
     # for config file provided use the content of the JSON to create
     # the python statements needed to be inserted into the template
-    logger.info(format_message(f"building dag - {config['name']}"))
+    logger.info(lazy_format_message(f"building dag - {job.name}"))
 
     dag_string = create_dag_string(
         logger,
-        config.get("name"),
+        job.name,
         {
-            "description": config.get("description"),
-            "tags": config.get("properties", {}).get("tags"),
+            "description": job.description,
+            "tags": job.properties.get("tags"),
         },
     )
-    default_args = create_dag_args(logger, config.get("properties", {}).get("args"))
-    imports = "\n".join(config.get("properties", {}).get("imports"))
+    default_args = create_dag_args(logger, job.properties.get("args") or {})
+    imports = job.properties.get("imports") or []
     tasks = []
     dependencies = []
 
+    # the data check tasks are added to a copy of the job tasks, the job is
+    # shared with the other builders and is never changed
+    job_tasks = list(job.tasks)
+
     # for each item in the task array, check the operator type and use this
     # to determine the task parameters to be used
-    for t in config["tasks"]:
-        task = Task(
-            t.get("task_id"),
-            t.get("operator"),
-            t.get("parameters"),
-            t.get("dependencies"),
-            t.get("description"),
-        )
-        logger.info(format_message(f'creating task "{task.task_id}"'))
+    for job_task in job_tasks:
+        task = job_task.to_task()
+        set_log_context(task_id=task.task_id)
+        logger.info(lazy_format_message(f'creating task "{task.task_id}"'))
         if task.operator == TaskOperator.CREATETABLE.name:
-            # for each task, add a new one to config["tasks"] with data check tasks.
+            # for each task, add a new one to the job tasks with data check tasks.
             if (
                 "block_data_check" not in task.parameters.keys()
                 or not task.parameters["block_data_check"]
             ):
-                data_check_tasks = create_data_check_tasks(
-                    logger, task, config["properties"]
-                )
+                data_check_tasks = create_data_check_tasks(logger, task, job.properties)
+                task_ids = [t.task_id for t in job_tasks]
                 for d in data_check_tasks:
-                    if not d in config["tasks"]:
-                        config["tasks"].append(d)
+                    if not d["task_id"] in task_ids:
+                        job_tasks.append(create_job_task(d, job.properties))
 
-            task.parameters = create_table_task(logger, task, config["properties"])
+            task.parameters = create_table_task(
+                logger, task, job.properties, args, job_task.sql_task
+            )
             task.operator = TaskOperator.BQOPERATOR.value
 
         elif task.operator == TaskOperator.TRUNCATETABLE.name:
-            task.parameters = create_table_task(logger, task, config["properties"])
+            task.parameters = create_table_task(
+                logger, task, job.properties, args, job_task.sql_task
+            )
             task.operator = TaskOperator.BQOPERATOR.value
 
         elif task.operator == TaskOperator.DATACHECK.name:
             task.operator = TaskOperator.BQCHEK.value
 
         elif task.operator == TaskOperator.LOADFROMGCS.name:
-            task.parameters = create_gcs_load_task(logger, task, config["properties"])
+            task.parameters = create_gcs_load_task(logger, task, job.properties)
             task.operator = TaskOperator.GCSTOBQ.value
 
         tasks.append(create_task(logger, task))
@@ -116,6 +122,7 @@ def builddags(logger: ILogger, args: dict, config: dict) -> int:
                                 "failed_states": ["failed", "skipped"],
                                 "mode": "reschedule",
                             },
+                            None,
                         )
                         tasks.append(create_task(logger, ext_task))
                         dependencies.append(f"start_pipeline >> {dep_task}")
@@ -125,46 +132,47 @@ def builddags(logger: ILogger, args: dict, config: dict) -> int:
         else:
             dependencies.append(f"start_pipeline >> {task.task_id}")
 
+    set_log_context(task_id=None)
+
     dep_tasks = [d[0].strip() for d in [dep.split(">") for dep in dependencies]]
-    final_tasks = [
-        task.get("task_id")
-        for task in config["tasks"]
-        if not task.get("task_id") in dep_tasks
-    ]
+    final_tasks = [task.task_id for task in job_tasks if not task.task_id in dep_tasks]
 
     for task in final_tasks:
         dependencies.append(f"{task} >> finish_pipeline")
 
     properties = [
-        f"{key} = '{config['properties'][key]}'"
-        for key in config["properties"].keys()
+        f"{key} = '{job.properties[key]}'"
+        for key in job.properties.keys()
         if key not in ["tags", "args", "imports"]
     ]
 
-    logger.info(format_message(f"populating template"))
-    file_loader = FileSystemLoader("./templates")
-    env = Environment(loader=file_loader)
+    logger.info(lazy_format_message(f"populating template"))
+    env = get_template_environment()
 
     template = env.get_template("template_dag.txt")
-    output = template.render(
-        imports=imports,
-        tasks=tasks,
-        default_args=default_args,
-        dag_string=dag_string,
-        dependencies=dependencies,
-        properties=properties,
-    )
+    with stage("render"):
+        output = template.render(
+            imports=imports,
+            tasks=tasks,
+            default_args=default_args,
+            dag_string=dag_string,
+            dependencies=dependencies,
+            properties=properties,
+        )
 
-    # reformat dag files to pass linting
-    reformatted = black.format_file_contents(
-        output.replace("'", '"'), fast=False, mode=black.FileMode()
-    )
+    # reformat dag files to pass linting, black is slow to import so it is only
+    # imported once a dag file is built
+    import black
+
+    with stage("black"):
+        reformatted = black.format_file_contents(
+            output.replace("'", '"'), fast=False, mode=black.FileMode()
+        )
 
-    dag_file = os.path.join(args.get("dag"), f"{config['name']}.py")
-    with open(dag_file, "w") as outfile:
-        outfile.write(reformatted)
+    dag_file = os.path.join(args.get("dag"), f"{job.name}.py")
+    write_artifact(logger, dag_file, reformatted)
 
-    logger.info(format_message(f"dag files COMPLETED SUCCESSFULLY".center(100, "-")))
+    logger.completed()
     return 0
 
 
@@ -180,7 +188,7 @@ def create_data_check_tasks(logger: ILogger, task: Task, properties: dict) -> li
     Returns:
       A list of data check tasks.
     """
-    logger.info(format_message(f"STARTED".center(100, "-")))
+    logger.started()
     data_check_tasks = []
 
     table_keys = [
@@ -252,7 +260,7 @@ def create_data_check_tasks(logger: ILogger, task: Task, properties: dict) -> li
         )
         data_check_tasks.append(todict(dupe_check_task))
 
-    logger.info(f"dag files COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return data_check_tasks
 
 
@@ -278,7 +286,7 @@ def create_gcs_load_task(logger: ILogger, task: Task, properties: dict) -> dict:
         skip_leading_rows
         schema_object
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     gs_source_bucket = (
         "{gs_source_bucket}"
         if not "bucket" in task.parameters.keys()
@@ -324,7 +332,7 @@ def create_gcs_load_task(logger: ILogger, task: Task, properties: dict) -> dict:
         raise FileNotFoundError(f"'{schema_source}' not found.")
     # if schema file doesn't exist in dags/schema/ dir then copy it
     if not os.path.isfile(schema_target) and os.path.isfile(schema_source):
-        logger.debug(format_message(f"Copying {schema_source} to {schema_target}"))
+        logger.debug(lazy_format_message(f"Copying {schema_source} to {schema_target}"))
         copy(
             schema_source,
             schema_target,
@@ -354,12 +362,12 @@ def create_gcs_load_task(logger: ILogger, task: Task, properties: dict) -> dict:
         "schema_object": schema_object,
     }
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
 def create_table_task(
-    logger: ILogger, task: Task, properties: dict, args: dict
+    logger: ILogger, task: Task, properties: dict, args: dict, sqltask: SQLTask = None
 ) -> dict:
     """
     This function creates a table in the publish dataset using the sql file created in the previous step
@@ -369,6 +377,7 @@ def create_table_task(
       task (Task): the task object from the DAG
       properties (dict): a dictionary of properties from the target file
       args (dict): The arguments passed to the DAG.
+      sqltask (SQLTask): the task already converted to create the sql file.
 
     Returns:
       A dictionary with the following keys:
@@ -381,7 +390,7 @@ def create_table_task(
         - params
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     dataset_staging = properties["dataset_staging"]
     dataset_publish = (
         "{dataset_publish}"
@@ -396,13 +405,13 @@ def create_table_task(
     if "sql" in task.parameters.keys():
         sql = task.parameters["sql"]
     else:
-        task.parameters["source_to_target"] = [
-            field
-            for field in task.parameters["source_to_target"]
-            if not field["name"] in ["dw_created_dt", "dw_last_modified_dt"]
-        ]
         file_path = create_sql_file(
-            logger, task, file_path=args.get("dag_sql"), dataset_staging=dataset_staging
+            logger,
+            task,
+            file_path=args.get("dag_sql"),
+            dataset_staging=dataset_staging,
+            created_date=args.get("created_date"),
+            sqltask=sqltask,
         )
         sql = f"{file_path.replace('./','')}"
 
@@ -422,7 +431,7 @@ def create_table_task(
         "params": {"dataset_publish": dataset_publish},
     }
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -437,11 +446,12 @@ def create_task(logger: ILogger, task: Task) -> str:
     Returns:
       A string that can be used to create a task in Airflow
     """
-    logger.info(f"STARTED".center(100, "-"))
-    logger.debug(
-        f"""creating task {task.task_id} from:
+    logger.started()
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(
+            f"""creating task {task.task_id} from:
                                parameters - {json.dumps(task.parameters, indent=4)}"""
-    )
+        )
 
     outp = [f"{task.task_id} = {task.operator} (task_id='{task.task_id}'"]
 
@@ -469,7 +479,7 @@ def create_task(logger: ILogger, task: Task) -> str:
         outp.append(f"{key} = {value}")
     outp.append("dag=dag)")
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return ",\n          ".join(outp)
 
 
@@ -486,7 +496,7 @@ def create_dag_string(logger: ILogger, name: str, dag: dict) -> str:
     Returns:
       A string that is the DAG definition
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     # we first set DAG defaults - these can also be excluded completely and
     # use Environment settings
     odag = {
@@ -518,7 +528,7 @@ def create_dag_string(logger: ILogger, name: str, dag: dict) -> str:
 
     outp = f"'{name}',{', '.join([f'{key} = {odag[key]}' for key in odag.keys()])}"
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -534,7 +544,7 @@ def create_dag_args(logger: ILogger, args: dict) -> str:
     Returns:
       A string that is a dictionary of the arguments for the DAG.
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     oargs = {
         "depends_on_past": False,
         "email_on_failure": False,
@@ -581,5 +591,5 @@ def create_dag_args(logger: ILogger, args: dict) -> str:
     )
     outp = f"{{{outstr}}}"
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
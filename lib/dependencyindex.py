@@ -0,0 +1,206 @@
+from lib.logger import format_message, ILogger
+
+__all__ = [
+    "create_dependency_index",
+    "join_table",
+    "get_dependents",
+]
+
+
+def create_dependency_index(logger: ILogger, configs: dict) -> dict:
+    """
+    It creates an index across all configs of the inter-DAG task dependencies, the source tables and
+    the destination tables of each config.  The index records, for each config, the configs which
+    depend on it; either through an external task dependency (dag.task) on one of its tasks or by
+    reading a table the config writes
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      configs (dict): a dictionary of config path to config content.
+
+    Returns:
+      A dictionary with the keys:
+        configs - config path to the dag name, tasks, external dependencies, source and destination
+                  tables of the config
+        dags - dag name to config path
+        source_tables - table to the paths of the configs reading the table
+        destination_tables - table to the paths of the configs writing the table
+        dependents - config path to the paths of the configs which depend on it
+        errors - config path to the reason the config could not be indexed, a config which can't is
+                 left out of the index
+    """
+    logger.started()
+
+    index = {
+        "configs": {},
+        "dags": {},
+        "source_tables": {},
+        "destination_tables": {},
+        "dependents": {},
+        "errors": {},
+    }
+
+    for path, config in configs.items():
+        if not config:
+            continue
+
+        try:
+            entry = create_config_entry(config)
+        except Exception as e:
+            index["errors"][path] = f"{type(e).__name__}: {e}"
+            logger.error(format_message(f"{path} could not be indexed: {e}"))
+            continue
+
+        index["configs"][path] = entry
+        index["dags"][entry["name"]] = path
+        index["dependents"][path] = set()
+
+        for table in entry["source_tables"]:
+            index["source_tables"].setdefault(table, set()).add(path)
+
+        for table in entry["destination_tables"]:
+            index["destination_tables"].setdefault(table, set()).add(path)
+
+    for path, entry in index["configs"].items():
+        for dag, _ in entry["external_dependencies"]:
+            upstream = index["dags"].get(dag)
+            if upstream and upstream != path:
+                index["dependents"][upstream].add(path)
+
+        for table in entry["source_tables"]:
+            for upstream in index["destination_tables"].get(table, []):
+                if upstream != path:
+                    index["dependents"][upstream].add(path)
+
+    logger.debug(
+        format_message(
+            f"indexed {len(index['configs'])} config(s), {len(index['source_tables'])} source table(s) and {len(index['destination_tables'])} destination table(s)"
+        )
+    )
+    logger.completed()
+    return index
+
+
+def create_config_entry(config: dict) -> dict:
+    """
+    It identifies the tasks, external task dependencies, source tables and destination tables of a
+    config.  Table names are lower case dataset.table strings, where no dataset is supplied on the task
+    the dataset from the config properties is used
+
+    Args:
+      config (dict): the content of the config file.
+
+    Returns:
+      A dictionary of the name, tasks, external_dependencies, source_tables and destination_tables.
+    """
+    properties = config.get("properties", {})
+    entry = {
+        "name": config.get("name"),
+        "tasks": [],
+        "external_dependencies": [],
+        "source_tables": set(),
+        "destination_tables": set(),
+    }
+
+    for t in config.get("tasks", []):
+        entry["tasks"].append(t.get("task_id"))
+        parameters = t.get("parameters", {})
+
+        for dep in t.get("dependencies") or []:
+            dep_list = dep.split(".")
+            if len(dep_list) > 1:
+                entry["external_dependencies"].append((dep_list[0], dep_list[1]))
+
+        if parameters.get("driving_table"):
+            entry["source_tables"].add(parameters["driving_table"].lower())
+
+        for table in (parameters.get("source_tables") or {}).values():
+            entry["source_tables"].add(
+                table_name(
+                    table.get("dataset_name"),
+                    table.get("table_name"),
+                    properties.get("dataset_source"),
+                )
+            )
+
+        for join in parameters.get("joins") or []:
+            dataset_name, table = join_table(join.get("right"))
+            entry["source_tables"].add(
+                table_name(dataset_name, table, properties.get("dataset_source"))
+            )
+
+        if parameters.get("destination_table"):
+            entry["destination_tables"].add(
+                table_name(
+                    parameters.get("destination_dataset"),
+                    parameters.get("destination_table"),
+                    properties.get("dataset_publish"),
+                )
+            )
+
+    entry["source_tables"].discard(None)
+    return entry
+
+
+def join_table(right) -> tuple:
+    """
+    It returns the dataset and table of the right hand table of a join.  The job schema declares it as
+    a dataset.table string, a source table object with a dataset_name and table_name is also accepted
+
+    Args:
+      right: the right hand table of the join.
+
+    Returns:
+      A tuple of the dataset name and table name, each None where it is not supplied.
+    """
+    if isinstance(right, str):
+        parts = right.split(".")
+        return (parts[-2] if len(parts) > 1 else None, parts[-1])
+
+    if isinstance(right, dict):
+        return (right.get("dataset_name"), right.get("table_name"))
+
+    return (None, None)
+
+
+def table_name(dataset_name: str, table: str, default_dataset: str = None) -> str:
+    """
+    It creates the lower case dataset.table name used as the key of a table in the index
+
+    Args:
+      dataset_name (str): the name of the dataset.
+      table (str): the name of the table.
+      default_dataset (str): the dataset used where dataset_name is not supplied.
+
+    Returns:
+      The table name, or None where no table is supplied.
+    """
+    if not table:
+        return None
+
+    dataset = dataset_name if dataset_name else default_dataset
+    return f"{dataset}.{table}".lower() if dataset else table.lower()
+
+
+def get_dependents(index: dict, paths: list[str]) -> set:
+    """
+    It returns the reverse-dependency closure of the configs; the configs themselves plus every config
+    which depends on them, directly or through other configs
+
+    Args:
+      index (dict): the dependency index.
+      paths (list[str]): the paths of the changed configs.
+
+    Returns:
+      A set of config paths.
+    """
+    closure = set(paths)
+    pending = list(paths)
+    while pending:
+        path = pending.pop()
+        for dependent in index["dependents"].get(path, []):
+            if dependent not in closure:
+                closure.add(dependent)
+                pending.append(dependent)
+
+    return closure
@@ -0,0 +1,149 @@
+import fnmatch
+import hashlib
+import os
+
+from lib.logger import format_message, ILogger
+
+__all__ = [
+    "DEFAULT_INCLUDE",
+    "discover_configs",
+    "parse_patterns",
+    "parse_shard",
+    "in_shard",
+]
+
+DEFAULT_INCLUDE = ["cfg_*.json"]
+
+
+def parse_patterns(value) -> list[str]:
+    """
+    It converts a comma separated string, or a list, of glob patterns to a list
+
+    Args:
+      value: a comma separated string or a list of patterns.
+
+    Returns:
+      A list of patterns, empty where no patterns are supplied.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [p.strip() for p in value if p.strip()]
+
+
+def match_patterns(path: str, patterns: list[str]) -> bool:
+    """
+    It checks if a path matches any of the glob patterns, ignoring case.  A pattern containing a / is
+    matched against the path relative to the config directory, any other pattern against the file name
+
+    Args:
+      path (str): the path relative to the config directory, using / as the separator.
+      patterns (list[str]): the glob patterns.
+
+    Returns:
+      True where the path matches a pattern.
+    """
+    name = path.rsplit("/", 1)[-1].lower()
+    for pattern in patterns:
+        pattern = pattern.lower()
+        if fnmatch.fnmatchcase(path.lower() if "/" in pattern else name, pattern):
+            return True
+    return False
+
+
+def discover_configs(
+    logger: ILogger,
+    dpath: str,
+    include: list[str] = None,
+    exclude: list[str] = None,
+    recursive: bool = True,
+) -> list[str]:
+    """
+    It creates a list of config files, if the path provided is a file it is returned otherwise the
+    directory, and where recursive its sub-directories, are searched for files matching an include
+    pattern and no exclude pattern
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function
+      dpath (str): the path of a config file or a directory of config files
+      include (list[str]): glob patterns of the files to include. Defaults to cfg_*.json
+      exclude (list[str]): glob patterns of the files to exclude.
+      recursive (bool): where True sub-directories are searched. Defaults to True
+
+    Returns:
+      A sorted list of config file paths.
+    """
+    include = parse_patterns(include) or DEFAULT_INCLUDE
+    exclude = parse_patterns(exclude)
+
+    if not os.path.isdir(dpath):
+        return [dpath] if os.path.exists(dpath) else []
+
+    config_list = []
+    for root, dirs, files in os.walk(dpath):
+        # sort the directories so they are walked in the same order everywhere
+        dirs.sort()
+        if not recursive:
+            dirs.clear()
+
+        for filename in files:
+            path = os.path.join(root, filename)
+            relative_path = os.path.relpath(path, dpath).replace(os.sep, "/")
+            if match_patterns(relative_path, include) and not match_patterns(
+                relative_path, exclude
+            ):
+                logger.debug(format_message(f"filename: {relative_path}"))
+                config_list.append(path)
+
+    # sort the list so configs are always built, and reported, in the same order
+    # regardless of directory listing order or number of workers
+    config_list.sort()
+    return config_list
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    It converts a shard string i/N, where i is from 1 to N, to a tuple
+
+    Args:
+      value (str): the shard string, i.e. 2/4
+
+    Returns:
+      A tuple of the shard number and the number of shards, or None where no shard is supplied.
+    """
+    if not value:
+        return None
+
+    try:
+        index, count = [int(v) for v in value.split("/")]
+    except ValueError:
+        raise ValueError(f"Shard {value} must be in the format i/N, i.e. 1/4.")
+
+    if count < 1 or index < 1 or index > count:
+        raise ValueError(f"Shard {value} must be between 1/N and N/N.")
+
+    return (index, count)
+
+
+def in_shard(path: str, dpath: str, shard: tuple[int, int]) -> bool:
+    """
+    It checks if a config belongs to the shard.  Configs are assigned to a shard by a hash of their
+    path relative to the config directory, so the assignment is the same on every runner and does
+    not move when other configs are added or removed
+
+    Args:
+      path (str): the path of the config file.
+      dpath (str): the config directory.
+      shard (tuple[int, int]): the shard number and the number of shards, None for all configs.
+
+    Returns:
+      True where the config belongs to the shard.
+    """
+    if not shard:
+        return True
+
+    root = dpath if os.path.isdir(dpath) else os.path.dirname(dpath)
+    relative_path = os.path.relpath(path, root).replace(os.sep, "/")
+    digest = hashlib.sha256(relative_path.encode()).hexdigest()
+    return int(digest, 16) % shard[1] == shard[0] - 1
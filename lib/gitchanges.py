@@ -0,0 +1,123 @@
+import os
+
+from lib.logger import format_message, ILogger
+
+__all__ = [
+    "get_changed_files",
+    "get_changed_configs",
+]
+
+
+def run_git(arguments: list[str], cwd: str = None) -> str:
+    """
+    It runs a git command and returns its output
+
+    Args:
+      arguments (list[str]): the arguments of the git command.
+      cwd (str): the directory to run the command in. Defaults to the current directory
+
+    Returns:
+      The stdout of the command.
+    """
+    # subprocess is only needed when changes are read from git so it is
+    # imported on first use
+    import subprocess
+
+    result = subprocess.run(
+        ["git"] + arguments, cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise ValueError(f"git {' '.join(arguments)} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def file_key(path: str) -> str:
+    """
+    It creates the key used to compare paths from git with paths from the config directory
+
+    Args:
+      path (str): the path of the file.
+
+    Returns:
+      The absolute, normalised path.
+    """
+    return os.path.normcase(os.path.realpath(path))
+
+
+def get_changed_files(logger: ILogger, ref: str, path: str = ".") -> set:
+    """
+    It returns the files of the local git repository changed since ref; files committed since ref,
+    staged or changed in the working tree, deleted and untracked files not ignored by git
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      ref (str): the git reference to compare with, i.e. origin/main, HEAD~1, a commit sha
+      path (str): a file or directory in the repository. Defaults to the current directory
+
+    Returns:
+      A set of the keys of the changed files.
+    """
+    cwd = path if os.path.isdir(path) else os.path.dirname(path) or "."
+    root = run_git(["rev-parse", "--show-toplevel"], cwd=cwd).strip()
+    names = run_git(["diff", "--name-only", "-z", ref, "--"], cwd=root).split("\0")
+    names.extend(
+        run_git(["ls-files", "--others", "--exclude-standard", "-z"], cwd=root).split(
+            "\0"
+        )
+    )
+
+    changed = {file_key(os.path.join(root, name)) for name in names if name}
+    logger.info(format_message(f"{len(changed)} file(s) changed since {ref}"))
+    return changed
+
+
+def get_changed_configs(
+    logger: ILogger,
+    ref: str,
+    configs: dict,
+    shared_inputs: list[str] = None,
+    config_inputs=None,
+    path: str = ".",
+) -> list[str]:
+    """
+    It returns the configs changed since ref, or whose inputs have changed since ref.  Where a shared
+    input, such as a schema or the generator, has changed every config is returned
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      ref (str): the git reference to compare with.
+      configs (dict): a dictionary of config path to config content.
+      shared_inputs (list[str]): the files used by every config.
+      config_inputs: a function returning the input files of a config, other than the config itself.
+      path (str): a file or directory in the repository of the configs. Defaults to the current
+    directory
+
+    Returns:
+      A sorted list of the changed config paths.
+    """
+    changed = get_changed_files(logger, ref, path)
+
+    for input_path in shared_inputs or []:
+        if file_key(input_path) in changed:
+            logger.info(format_message(f"{input_path} changed, all configs selected"))
+            return sorted(configs.keys())
+
+    selected = []
+    for config_path, config in configs.items():
+        inputs = [config_path]
+        if config and config_inputs:
+            inputs.extend(config_inputs(config))
+
+        changed_inputs = [i for i in inputs if file_key(i) in changed]
+        if changed_inputs:
+            logger.debug(
+                format_message(f"{config_path} changed: {', '.join(changed_inputs)}")
+            )
+            selected.append(config_path)
+
+    logger.info(
+        format_message(
+            f"{len(selected)} of {len(configs)} config(s) changed since {ref}"
+        )
+    )
+    return sorted(selected)
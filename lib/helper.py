@@ -1,16 +1,24 @@
-import re
+import os
 
+from datetime import datetime, timezone
 from enum import Enum
+from functools import lru_cache
+from lib.textlayout import wrap_text
 
 __all__ = [
+    "DEFAULT_SOURCE_ALIAS",
     "isnullorwhitespace",
     "isnullorempty",
     "ifnull",
     "FileType",
     "format_description",
+    "get_created_date",
+    "get_template_environment",
 ]
 
-WORD_REGEX_PATTERN = r"([^\s]+)"
+# the alias of the driving table of a task, defined here rather than in
+# baseclasses so validation can use it without importing the model classes
+DEFAULT_SOURCE_ALIAS = "src"
 
 
 def isnullorwhitespace(string: str) -> bool:
@@ -98,30 +106,7 @@ def format_comment(comment: str, target_type: FileType) -> str:
         prefix = "--"
 
     if comment:
-
-        m = re.findall(WORD_REGEX_PATTERN, comment, re.IGNORECASE)
-
-        lines = []
-        line = [prefix]
-        line_length = 80
-        line_length_cnt = len(prefix)
-        for word in m:
-            if (line_length_cnt + len(word) + len(line)) < line_length:
-                line.append(word)
-                line_length_cnt += len(word)
-            else:
-                lines.append(line)
-                line = [prefix, word.strip()]
-                line_length_cnt = len(word) + 3
-
-        if not line in lines:
-            lines.append(line)
-
-        joined_lines = []
-        for line in lines:
-            joined_lines.append(" ".join(line))
-
-        return "\n".join(joined_lines)
+        return wrap_text(comment, 80, prefix, prefix, 3)
 
     return prefix
 
@@ -154,28 +139,63 @@ def format_description(description: str, section: str, target_type: FileType) ->
         line_prefix = f"{prefix}"
         line_prefix = f"{line_prefix} {':'.rjust(justify - len(line_prefix))}"
 
-        m = re.findall(WORD_REGEX_PATTERN, description, re.IGNORECASE)
+        return wrap_text(description, 80, line_prefix, first_line_prefix, 20)
 
-        lines = []
-        line = [first_line_prefix]
-        line_length = 80
-        line_length_cnt = len(first_line_prefix)
-        for word in m:
-            if (line_length_cnt + len(word) + len(line)) < line_length:
-                line.append(word)
-                line_length_cnt += len(word)
-            else:
-                lines.append(line)
-                line = [line_prefix, word.strip()]
-                line_length_cnt = len(word) + 20
+    return prefix
 
-        if not line in lines:
-            lines.append(line)
 
-        joined_lines = []
-        for line in lines:
-            joined_lines.append(" ".join(line))
+def get_created_date(config: dict, path: str = None) -> datetime:
+    """
+    It returns a fixed created date for a config so that rebuilding the same inputs produces
+    byte-identical output.  The date is taken from the first of; the config created_date, the
+    SOURCE_DATE_EPOCH environment variable or the time of the last git commit of the config file
 
-        return "\n".join(joined_lines)
+    Args:
+      config (dict): the content of the config file.
+      path (str): the path of the config file.
 
-    return prefix
+    Returns:
+      The created date, or None where no date could be identified.
+    """
+    if config and config.get("created_date"):
+        return datetime.fromisoformat(config.get("created_date"))
+
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not isnullorwhitespace(source_date_epoch):
+        return datetime.fromtimestamp(int(source_date_epoch), tz=timezone.utc)
+
+    if path and os.path.isfile(path):
+        import subprocess
+
+        try:
+            result = subprocess.run(
+                ["git", "log", "-1", "--format=%ct", "--", os.path.basename(path)],
+                cwd=os.path.dirname(os.path.abspath(path)),
+                capture_output=True,
+                text=True,
+            )
+        except OSError:
+            return None
+
+        if result.returncode == 0 and result.stdout.strip():
+            return datetime.fromtimestamp(int(result.stdout.strip()), tz=timezone.utc)
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_template_environment(path: str = "./templates"):
+    """
+    It returns the Jinja environment used to render the templates in path.  The environment is created
+    once per process so templates are compiled once and then reused, the loader checks the template
+    modified time so changes to a template are still picked up
+
+    Args:
+      path (str): the directory containing the templates. Defaults to ./templates
+
+    Returns:
+      A jinja2.Environment.
+    """
+    from jinja2 import Environment, FileSystemLoader
+
+    return Environment(loader=FileSystemLoader(path))
@@ -0,0 +1,324 @@
+import copy
+
+from lib.baseclasses import (
+    converttoobj,
+    ConversionType,
+    Field,
+    SQLTask,
+    Task,
+    TaskOperator,
+)
+from lib.sql_helper import create_sql_task
+from types import MappingProxyType
+from typing import Union
+
+__all__ = [
+    "Job",
+    "JobTask",
+    "create_job",
+    "create_job_task",
+]
+
+# fields added to the target table by the generator, they are removed from the
+# source to target of a task before sql is created
+DW_FIELDS = ["dw_created_dt", "dw_last_modified_dt"]
+
+# operators whose sql is created from the source to target of the task
+SQL_OPERATORS = [TaskOperator.CREATETABLE.name, TaskOperator.TRUNCATETABLE.name]
+
+NOT_SET = object()
+
+
+class JobTask(object):
+    def __init__(
+        self,
+        task_id: str,
+        operator: str,
+        parameters: dict,
+        author: str = None,
+        dependencies: list[str] = None,
+        description: str = None,
+        dataset_staging: str = None,
+    ) -> None:
+        self._task_id = task_id
+        self._operator = operator
+        self._parameters = freeze_value(parameters)
+        self._author = author
+        self._dependencies = tuple(dependencies or [])
+        self._description = description
+        self._dataset_staging = dataset_staging
+        self._sql_task = NOT_SET
+        self._source_to_target = NOT_SET
+        self._source_tables = NOT_SET
+
+    def __str__(self) -> str:
+        return str(self.to_task())
+
+    def __repr__(self):
+        return str(self)
+
+    @property
+    def task_id(self) -> str:
+        """
+        Returns the task_id
+        """
+        return self._task_id
+
+    @property
+    def operator(self) -> str:
+        """
+        Returns the operator
+        """
+        return self._operator
+
+    @property
+    def parameters(self) -> MappingProxyType:
+        """
+        Returns a read only view of the parameters, the nested dictionaries and lists are read only too
+        """
+        return self._parameters
+
+    @property
+    def author(self) -> str:
+        """
+        Returns the author
+        """
+        return self._author
+
+    @property
+    def dependencies(self) -> tuple[str]:
+        """
+        Returns the dependencies
+        """
+        return self._dependencies
+
+    @property
+    def description(self) -> str:
+        """
+        Returns the description
+        """
+        return self._description
+
+    @property
+    def sql_task(self) -> SQLTask:
+        """
+        Returns the SQLTask used to create the sql of the task, the parameters are converted on first use
+        and each builder is given its own copy of the result.  None where the task has no sql to create
+        """
+        return copy.deepcopy(self.get_sql_task())
+
+    def get_sql_task(self) -> SQLTask:
+        """
+        It converts the parameters to the SQLTask used to create the sql of the task on first use.  The
+        SQLTask is held by the job task and must not be changed, builders use the sql_task copy
+
+        Returns:
+          A SQLTask object, or None where the task has no sql to create.
+        """
+        if self._sql_task is NOT_SET:
+            if self._operator in SQL_OPERATORS and not self._parameters.get("sql"):
+                self._sql_task = create_sql_task(self.to_task(), self._dataset_staging)
+            else:
+                self._sql_task = None
+        return self._sql_task
+
+    @property
+    def source_to_target(self) -> tuple[Field]:
+        """
+        Returns the source to target fields
+        """
+        if self._source_to_target is NOT_SET:
+            sql_task = self.get_sql_task()
+            if sql_task:
+                fields = sql_task.parameters.source_to_target
+            else:
+                fields = converttoobj(
+                    thaw_value(self._parameters.get("source_to_target", [])),
+                    ConversionType.SOURCE,
+                )
+            self._source_to_target = tuple(fields or [])
+        return self._source_to_target
+
+    @property
+    def source_tables(self) -> MappingProxyType:
+        """
+        Returns a read only view of the source tables
+        """
+        if self._source_tables is NOT_SET:
+            sql_task = self.get_sql_task()
+            if sql_task:
+                tables = sql_task.parameters.source_tables
+            else:
+                tables = converttoobj(
+                    thaw_value(self._parameters.get("source_tables", {})),
+                    ConversionType.SOURCETABLES,
+                )
+            self._source_tables = MappingProxyType(tables or {})
+        return self._source_tables
+
+    def to_task(self) -> Task:
+        """
+        It creates a Task from the job task, the parameters are copied, nested values included, so the
+        Task can be changed by a builder without changing the job task
+
+        Returns:
+          A Task object.
+        """
+        return Task(
+            self._task_id,
+            self._operator,
+            thaw_value(self._parameters),
+            self._author,
+            list(self._dependencies),
+            self._description,
+        )
+
+
+class Job(object):
+    def __init__(
+        self,
+        name: str,
+        job_type: str,
+        properties: dict,
+        tasks: list[JobTask],
+        description: str = None,
+        author: str = None,
+    ) -> None:
+        self._name = name
+        self._type = job_type
+        self._properties = MappingProxyType(properties)
+        self._tasks = tuple(tasks)
+        self._description = description
+        self._author = author
+
+    @property
+    def name(self) -> str:
+        """
+        Returns the name
+        """
+        return self._name
+
+    @property
+    def type(self) -> str:
+        """
+        Returns the job type, DAG or BATCH
+        """
+        return self._type
+
+    @property
+    def properties(self) -> MappingProxyType:
+        """
+        Returns a read only view of the properties
+        """
+        return self._properties
+
+    @property
+    def tasks(self) -> tuple[JobTask]:
+        """
+        Returns the tasks
+        """
+        return self._tasks
+
+    @property
+    def description(self) -> str:
+        """
+        Returns the description
+        """
+        return self._description
+
+    @property
+    def author(self) -> str:
+        """
+        Returns the author
+        """
+        return self._author
+
+
+def freeze_value(value):
+    """
+    It returns a read only copy of a value from a config, dictionaries are copied to read only views and
+    lists to tuples, at every level
+
+    Args:
+      value: a value from a config.
+
+    Returns:
+      The read only value.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze_value(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_value(v) for v in value)
+    return value
+
+
+def thaw_value(value):
+    """
+    It returns a changeable copy of a value made read only by freeze_value, read only views are copied
+    to dictionaries and tuples to lists, at every level
+
+    Args:
+      value: a value returned by freeze_value.
+
+    Returns:
+      The changeable value.
+    """
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: thaw_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw_value(v) for v in value]
+    return value
+
+
+def create_job_task(task: dict, properties: Union[dict, MappingProxyType]) -> JobTask:
+    """
+    It creates a JobTask from the task of a config.  The parameters are copied, read only, so the config
+    is never changed and, where sql is created from the source to target, the fields added by the
+    generator are removed
+
+    Args:
+      task (dict): the task from the config.
+      properties (dict): the properties of the config.
+
+    Returns:
+      A JobTask object.
+    """
+    parameters = dict(task.get("parameters") or {})
+    if parameters.get("source_to_target") and not parameters.get("sql"):
+        parameters["source_to_target"] = [
+            field
+            for field in parameters["source_to_target"]
+            if not field.get("name") in DW_FIELDS
+        ]
+
+    return JobTask(
+        task.get("task_id"),
+        task.get("operator"),
+        parameters,
+        task.get("author"),
+        task.get("dependencies"),
+        task.get("description"),
+        properties.get("dataset_staging"),
+    )
+
+
+def create_job(config: dict) -> Job:
+    """
+    It normalises a config into a Job, which is shared by the builders without any of them changing
+    the config or each other's view of it
+
+    Args:
+      config (dict): the content of the config file.
+
+    Returns:
+      A Job object.
+    """
+    properties = copy.deepcopy(config.get("properties") or {})
+    return Job(
+        config.get("name"),
+        config.get("type"),
+        properties,
+        [create_job_task(t, properties) for t in config.get("tasks") or []],
+        config.get("description"),
+        config.get("author"),
+    )
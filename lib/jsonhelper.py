@@ -1,14 +1,162 @@
-import fastjsonschema
+import hashlib
 import json
 import os
 import sys
 
-from lib.logger import format_message, ILogger
+from lib.logger import format_message, ILogger, lazy_format_message
 
-__all__ = ["IJSONValidate", "get_config"]
+__all__ = [
+    "IJSONValidate",
+    "get_config",
+    "get_validator",
+    "set_validator_cache",
+    "clear_validators",
+]
 
+# compiled validators of this process.  schemas holds the validator of each
+# schema by its hash, ids the hash of each schema object already seen so a
+# schema loaded once is only hashed once.  where a cache directory is set the
+# validators are compiled to python modules in it and imported by later runs
+VALIDATORS = {"cache": None, "schemas": {}, "ids": {}}
 
-def IJSONValidate(logger: ILogger, schema: dict, object: dict) -> bool:
+
+def set_validator_cache(path: str = None) -> None:
+    """
+    It sets the directory the validators are compiled to, where None the validators are only kept in
+    memory
+
+    Args:
+      path (str): the directory to write the compiled validators to.
+    """
+    VALIDATORS["cache"] = path
+    return None
+
+
+def clear_validators() -> None:
+    """
+    It removes the validators compiled by this process
+    """
+    VALIDATORS["schemas"] = {}
+    VALIDATORS["ids"] = {}
+    return None
+
+
+def get_schema_hash(schema: dict) -> str:
+    """
+    It creates a hash of the schema and the version of fastjsonschema, so a validator compiled by
+    another version is never used
+
+    Args:
+      schema (dict): the schema.
+
+    Returns:
+      The sha256 of the schema.
+    """
+    import fastjsonschema
+
+    content = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(
+        f"{fastjsonschema.VERSION}:{content}".encode("utf-8")
+    ).hexdigest()
+
+
+def load_validator(path: str, schema_hash: str):
+    """
+    It imports the validate function of a validator compiled to the cache directory
+
+    Args:
+      path (str): the cache directory.
+      schema_hash (str): the hash of the schema.
+
+    Returns:
+      The validate function, or None where it has not been compiled or can't be imported.
+    """
+    module_file = os.path.join(path, f"validator_{schema_hash}.py")
+    if not os.path.isfile(module_file):
+        return None
+
+    import importlib.util
+
+    try:
+        spec = importlib.util.spec_from_file_location(
+            f"validator_{schema_hash}", module_file
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.validate
+    except Exception:
+        return None
+
+
+def compile_validator(path: str, schema: dict, schema_hash: str):
+    """
+    It compiles the schema to a python module in the cache directory and imports it.  The module is
+    written to a temporary file and renamed so a parallel run never imports a partial module
+
+    Args:
+      path (str): the cache directory.
+      schema (dict): the schema.
+      schema_hash (str): the hash of the schema.
+
+    Returns:
+      The validate function.
+    """
+    import fastjsonschema
+    import tempfile
+
+    os.makedirs(path, exist_ok=True)
+    code = fastjsonschema.compile_to_code(schema)
+
+    fd, temp_file = tempfile.mkstemp(dir=path, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as outfile:
+            outfile.write(code)
+        os.replace(temp_file, os.path.join(path, f"validator_{schema_hash}.py"))
+    except:
+        os.remove(temp_file)
+        raise
+
+    return load_validator(path, schema_hash) or fastjsonschema.compile(schema)
+
+
+def get_validator(schema: dict):
+    """
+    It returns the validate function of a schema, a schema is only compiled once by a process and,
+    where a cache directory is set, once across runs.  A schema must not be changed once it has been
+    validated against
+
+    Args:
+      schema (dict): the schema.
+
+    Returns:
+      The validate function.
+    """
+    seen = VALIDATORS["ids"].get(id(schema))
+    if seen and seen[0] is schema:
+        return VALIDATORS["schemas"][seen[1]]
+
+    schema_hash = get_schema_hash(schema)
+    validate = VALIDATORS["schemas"].get(schema_hash)
+    if not validate:
+        path = VALIDATORS["cache"]
+        if path:
+            validate = load_validator(path, schema_hash) or compile_validator(
+                path, schema, schema_hash
+            )
+        else:
+            import fastjsonschema
+
+            validate = fastjsonschema.compile(schema)
+        VALIDATORS["schemas"][schema_hash] = validate
+
+    # the schema is kept with its hash so its id can't be reused by another schema
+    VALIDATORS["ids"][id(schema)] = (schema, schema_hash)
+    return validate
+
+
+def IJSONValidate(
+    logger: ILogger, schema: dict, object: dict, errors: list = None
+) -> bool:
     """
     > This function validates a JSON object against a JSON schema
 
@@ -16,19 +164,26 @@ def IJSONValidate(logger: ILogger, schema: dict, object: dict) -> bool:
       logger (ILogger): ILogger - this is the logger object that you can use to log messages.
       schema (dict): The schema to validate against.
       object (dict): The object to be validated
+      errors (list): where supplied the error found is appended as a dictionary of the message, the
+    location in the object and the rule which failed.
     """
-    logger.info(f"STARTED".center(100, "-"))
-    validate = fastjsonschema.compile(schema)
+    # fastjsonschema is slow to import so it is only imported once a file is validated
+    import fastjsonschema
+
+    logger.started()
+    validate = get_validator(schema)
     try:
         logger.info(f"validating schema...")
         validate(object)
     except fastjsonschema.JsonSchemaValueException as e:
         logger.debug(f"{sys.exc_info()[1]:}")
         logger.error(f"Schema not matching")
-        logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+        if errors is not None:
+            errors.append({"message": e.message, "location": e.name, "rule": e.rule})
+        logger.completed()
         return False
     logger.info(f"Schema matching")
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return True
 
 
@@ -44,12 +199,13 @@ def get_json(logger: ILogger, path: str) -> dict:
       A dictionary object
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     if not path:
         logger.warning(format_message(f"File {path:} does not exist."))
+        logger.failed()
         return {}
 
-    logger.debug(format_message(f"File input {path:}."))
+    logger.debug(lazy_format_message(f"File input {path:}."))
 
     try:
         # identify what path is; dir, file
@@ -59,11 +215,11 @@ def get_json(logger: ILogger, path: str) -> dict:
             raise FileExistsError
     except (FileNotFoundError, FileExistsError) as e:
         logger.error(format_message(f"File {path:} does not exist."))
-        logger.info(f"FAILED".center(100, "-"))
+        logger.failed()
         return None
     except:
         logger.error(f"{sys.exc_info()[0]:}")
-        logger.info(f"FAILED".center(100, "-"))
+        logger.failed()
         return None
 
     # read file
@@ -72,9 +228,9 @@ def get_json(logger: ILogger, path: str) -> dict:
             filecontent = sourcefile.read()
 
         # return file
-        logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+        logger.completed()
         return json.loads(filecontent)
     except:
         logger.error(f"{sys.exc_info()[0]:}")
-        logger.info(f"FAILED".center(100, "-"))
+        logger.failed()
         return None
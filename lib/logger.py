@@ -1,69 +1,513 @@
+import atexit
+import json
+import os
 import re
+import sys
+import threading
+import time
 
 __all__ = [
     "ILogger",
+    "LazyMessage",
+    "JSONFormatter",
     "format_message",
+    "lazy_format_message",
+    "log_context",
+    "set_log_context",
+    "stop_log_listeners",
 ]
 
-from logging import Logger, NOTSET, Formatter, FileHandler, StreamHandler
+from contextlib import contextmanager
+from datetime import datetime
+from lib.textlayout import wrap_text
+from logging import (
+    Handler,
+    Logger,
+    INFO,
+    NOTSET,
+    Formatter,
+    FileHandler,
+    StreamHandler,
+)
+
+LOG_FORMAT = "%(asctime)s - %(name)s - [%(levelname)8s] - %(funcName)20s:%(lineno)5d - %(message)s"
+
+# the maximum number of records a listener writes before flushing its handlers
+LOG_BATCH_SIZE = 100
+
+# put on the queue of a listener to stop its thread
+LOG_SENTINEL = None
+
+# the handlers of this process, shared by every ILogger so constructing an
+# ILogger again with the same file reuses the handlers rather than opening the
+# file again.  listeners holds the queue and listener of each set of handlers
+# used by a queued ILogger.  a forked worker starts with its own handlers
+LOG_HANDLERS = {"pid": None, "streams": {}, "files": {}, "listeners": {}}
+
+# the config and task being built, added to each record so JSON log lines can
+# be grouped by them.  stages is the stack of the name and start time of each
+# function which has logged its started banner, pushed by started and popped
+# by completed or failed
+LOG_CONTEXT = {"config": None, "task_id": None, "stages": []}
+
+# the start of each line after the first of a message wrapped by format_message
+MESSAGE_INDENT = "".ljust(79)
+
+# the continuation of a line wrapped by format_message
+WRAPPED_LINE_PATTERN = re.compile(r"\n {79,}")
+
+# the banners logged at the start and end of each function, built once rather
+# than on every call
+STARTED_BANNER = "STARTED".center(100, "-")
+COMPLETED_BANNER = "COMPLETED SUCCESSFULLY".center(100, "-")
+FAILED_BANNER = "FAILED".center(100, "-")
+
+
+class LazyMessage:
+    """
+    A log message which is only built when a handler formats the record, so a message filtered out by
+    the level costs no more than creating this object
+    """
+
+    __slots__ = ("function", "args")
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.function(*self.args))
+
+
+class BatchQueueListener:
+    """
+    A listener which owns a thread that takes every record waiting on the queue, up to LOG_BATCH_SIZE,
+    and writes them to each handler before flushing it once, rather than flushing after each record
+    """
+
+    def __init__(self, queue, *handlers, respect_handler_level: bool = False):
+        """
+        It sets the queue the listener takes records from and the handlers it writes them to
+
+        Args:
+          queue: the queue the records are put on, by a QueueHandler.
+          handlers: the handlers the records are written to.
+          respect_handler_level (bool): where True a record is only written to the handlers whose level
+          it meets. Defaults to False
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.respect_handler_level = respect_handler_level
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        It starts the thread which writes the records put on the queue
+        """
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        It puts the sentinel on the queue and waits for the thread to write the records before it
+        """
+        if self._thread is not None:
+            self.queue.put(LOG_SENTINEL)
+            self._thread.join()
+            self._thread = None
+
+    def run(self) -> None:
+        """
+        It writes the records put on the queue in batches until the sentinel is taken
+        """
+        stop = False
+        while not stop:
+            batch = [self.queue.get(True)]
+            while batch[-1] is not LOG_SENTINEL and len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get(False))
+                except Exception:
+                    break
+
+            if batch[-1] is LOG_SENTINEL:
+                stop = True
+                batch.pop()
+
+            if batch:
+                self.handle_batch(batch)
+
+    def handle_batch(self, records: list) -> None:
+        """
+        It writes the records to each handler, a handler with a stream is written to under a single
+        lock and flushed once
+
+        Args:
+          records (list): the records taken from the queue.
+        """
+        for handler in self.handlers:
+            records_to_write = [
+                r
+                for r in records
+                if not self.respect_handler_level or r.levelno >= handler.level
+            ]
+            if not records_to_write:
+                continue
+
+            if not isinstance(handler, StreamHandler):
+                for r in records_to_write:
+                    handler.handle(r)
+                continue
+
+            handler.acquire()
+            try:
+                for r in records_to_write:
+                    if handler.filter(r):
+                        try:
+                            handler.stream.write(handler.format(r) + handler.terminator)
+                        except Exception:
+                            handler.handleError(r)
+                handler.flush()
+            finally:
+                handler.release()
+
+
+class JSONFormatter(Formatter):
+    """
+    A Formatter which writes each record as a single line of JSON, with the config, task and stage the
+    record was logged in and, for the completed banner of a stage, the seconds since it started
+    """
+
+    def format(self, record) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "function": record.funcName,
+            "line": record.lineno,
+            "process": record.process,
+            "config": getattr(record, "config", None),
+            "task_id": getattr(record, "task_id", None),
+            "stage": getattr(record, "stage", None),
+            "elapsed": getattr(record, "elapsed", None),
+            "message": WRAPPED_LINE_PATTERN.sub(" ", record.getMessage()),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def create_formatter(log_format: str = "text") -> Formatter:
+    """
+    It creates the formatter of a handler
+
+    Args:
+      log_format (str): text, for lines of LOG_FORMAT, or json, for JSON lines. Defaults to text
+
+    Returns:
+      A Formatter.
+    """
+    if log_format == "json":
+        return JSONFormatter()
+    if log_format != "text":
+        raise ValueError(f"Unknown log format {log_format}, use text or json.")
+    return Formatter(LOG_FORMAT)
+
+
+@contextmanager
+def log_context(**fields):
+    """
+    It adds the fields, config and/or task_id, to the records logged inside the with block, the
+    previous values are restored when it exits.  A stage started inside the block which did not log its
+    completed or failed banner, i.e. one which raised, is removed when it exits
+
+    Args:
+      fields: the config and/or task_id.
+    """
+    previous = {key: LOG_CONTEXT[key] for key in fields}
+    depth = len(LOG_CONTEXT["stages"])
+    LOG_CONTEXT.update(fields)
+    try:
+        yield
+    finally:
+        LOG_CONTEXT.update(previous)
+        del LOG_CONTEXT["stages"][depth:]
+
+
+def set_log_context(**fields) -> None:
+    """
+    It sets the fields, config and/or task_id, added to the records logged from now on
+
+    Args:
+      fields: the config and/or task_id.
+    """
+    LOG_CONTEXT.update(fields)
+    return None
+
+
+class ForwardHandler(Handler):
+    """
+    A handler which passes records, i.e. those sent by worker processes, to the handlers of a logger
+    """
+
+    def __init__(self, logger: Logger):
+        Handler.__init__(self)
+        self.logger = logger
+
+    def emit(self, record):
+        self.logger.callHandlers(record)
+
+
+def get_handlers(file: str = None, log_format: str = "text") -> list[Handler]:
+    """
+    It returns the handlers of this process which write to the terminal and, where supplied, the file.
+    A handler is created once for each file and format so every ILogger writing to a file shares one
+    handler
+
+    Args:
+      file (str): the path of the log file.
+      log_format (str): text or json. Defaults to text
+
+    Returns:
+      A list of the file handler, where there is a file, and the stream handler.
+    """
+    if LOG_HANDLERS["pid"] != os.getpid():
+        LOG_HANDLERS["pid"] = os.getpid()
+        LOG_HANDLERS["streams"] = {}
+        LOG_HANDLERS["files"] = {}
+        LOG_HANDLERS["listeners"] = {}
+
+    if log_format not in LOG_HANDLERS["streams"]:
+        streamHandler = StreamHandler()
+        streamHandler.setFormatter(create_formatter(log_format))
+        LOG_HANDLERS["streams"][log_format] = streamHandler
+
+    handlers = [LOG_HANDLERS["streams"][log_format]]
+    if file:
+        key = (os.path.normcase(os.path.abspath(file)), log_format)
+        if key not in LOG_HANDLERS["files"]:
+            fileHandler = FileHandler(file, mode="a")
+            fileHandler.setFormatter(create_formatter(log_format))
+            LOG_HANDLERS["files"][key] = fileHandler
+        handlers.insert(0, LOG_HANDLERS["files"][key])
+
+    return handlers
+
+
+def get_queue_handler(file: str = None, log_format: str = "text") -> Handler:
+    """
+    It returns the queue handler of the handlers for the file, the first call for a file starts the
+    listener thread which writes the records to them
+
+    Args:
+      file (str): the path of the log file.
+      log_format (str): text or json. Defaults to text
+
+    Returns:
+      A QueueHandler.
+    """
+    # queue and logging.handlers, which imports socket and pickle, are only
+    # needed by a queued logger
+    import queue
+
+    from logging.handlers import QueueHandler
+
+    handlers = get_handlers(file, log_format)
+    key = tuple(id(h) for h in handlers)
+    if key not in LOG_HANDLERS["listeners"]:
+        log_queue = queue.SimpleQueue()
+        listener = BatchQueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        LOG_HANDLERS["listeners"][key] = (QueueHandler(log_queue), listener)
+    return LOG_HANDLERS["listeners"][key][0]
+
+
+def stop_log_listeners() -> None:
+    """
+    It stops the listener threads of this process once every queued record has been written
+    """
+    if LOG_HANDLERS["pid"] != os.getpid():
+        return None
+
+    for _, listener in LOG_HANDLERS["listeners"].values():
+        listener.stop()
+    LOG_HANDLERS["listeners"] = {}
+    return None
+
+
+# records still queued are written before the process exits
+atexit.register(stop_log_listeners)
+
 
-# It creates a logger object with the given name and level
 class ILogger(Logger):
-    def __init__(self, name: str, file: str = None, level=NOTSET):
+    def __init__(
+        self,
+        name: str,
+        file: str = None,
+        level=NOTSET,
+        queued: bool = False,
+        log_queue=None,
+        log_format: str = "text",
+    ):
         """
-        This function sets the logger object.  It takes in a logger name and a logger level and returns an integer
+        This function sets the logger object.  Records are written to the terminal and, where a file is
+        supplied, appended to the file.  The handlers are shared by every ILogger of the process so an
+        ILogger created again with the same file does not add handlers
 
         Args:
-          logger_name (str): The name of the logger.
-          logger_level (str): The level of logging you want to see. This can be one of the following:'CRITICAL',
+          name (str): The name of the logger.
+          file (str): The path of the log file. Defaults to None, no log file
+          level (str): The level of logging you want to see. This can be one of the following:'CRITICAL',
           'DEBUG', 'ERROR', 'FATAL','INFO','NOTSET', 'WARNING'
-        Defaults to INFO
+          queued (bool): where True records are put on a queue and written by a background thread, in
+          batches, so the caller does not wait for the terminal or disk. Defaults to False
+          log_queue: the queue of a parent process, from ILogger.worker_queue, where supplied records are
+          only put on the queue and written by the parent
+          log_format (str): text, for lines wrapped by format_message, or json, for one JSON object a
+          line with the config, task_id, stage and elapsed time of the record. Defaults to text
+        """
+        Logger.__init__(self, name, level)
+
+        if log_queue is not None:
+            from logging.handlers import QueueHandler
+
+            handlers = [QueueHandler(log_queue)]
+        elif queued:
+            handlers = [get_queue_handler(file, log_format)]
+        else:
+            handlers = get_handlers(file, log_format)
+
+        for handler in handlers:
+            if handler not in self.handlers:
+                self.addHandler(handler)
+
+    @contextmanager
+    def worker_queue(self):
+        """
+        It creates a queue for worker processes to log to, the records put on the queue by each worker
+        are written by this logger's handlers in the parent process, so workers never write to the log
+        file at the same time.  The records waiting are written when the with block exits
 
         Returns:
-          The return value is the exit code of the function.
+          The queue to pass to ILogger in each worker.
         """
-        Logger.__init__(self, name, level)
-        formatter = Formatter(
-            "%(asctime)s - %(name)s - [%(levelname)8s] - %(funcName)20s:%(lineno)5d - %(message)s"
-        )
+        # multiprocessing is only needed when workers are used
+        import multiprocessing
 
-        streamHandler = StreamHandler()
-        streamHandler.setFormatter(formatter)
+        log_queue = multiprocessing.Queue()
+        listener = BatchQueueListener(log_queue, ForwardHandler(self))
+        listener.start()
+        try:
+            yield log_queue
+        finally:
+            listener.stop()
+            log_queue.close()
+            log_queue.join_thread()
 
-        if file:
-            fileHandler = FileHandler(file, mode="a")
-            fileHandler.setFormatter(formatter)
-            self.addHandler(fileHandler)
+    def setLevel(self, level) -> None:
+        """
+        It sets the level of the logger.  An ILogger is not registered with the logging manager so the
+        levels cached by isEnabledFor are cleared here
 
-        self.addHandler(streamHandler)
+        Args:
+          level: the log level, i.e. INFO
+        """
+        Logger.setLevel(self, level)
+        self._cache.clear()
 
+    def makeRecord(self, *args, **kwargs):
+        """
+        It creates a record with the config and task_id of the log context and, where not supplied, the
+        stage on top of the stage stack
+        """
+        record = Logger.makeRecord(self, *args, **kwargs)
+        record.config = LOG_CONTEXT["config"]
+        record.task_id = LOG_CONTEXT["task_id"]
+        if not hasattr(record, "stage"):
+            stages = LOG_CONTEXT["stages"]
+            record.stage = stages[-1][0] if stages else None
+        return record
 
-def format_message(message: str) -> str:
-    if message:
+    def started(self) -> None:
+        """
+        It logs the started banner of a stage at INFO and pushes the calling function on the stage stack,
+        it is the stage of the records logged until it logs its completed or failed banner
+        """
+        if self.isEnabledFor(INFO):
+            LOG_CONTEXT["stages"].append(
+                (sys._getframe(1).f_code.co_name, time.perf_counter())
+            )
+            self._log(INFO, STARTED_BANNER, (), stacklevel=2)
 
-        m = re.findall(r"([^\s]+)", message, re.IGNORECASE)
+    def completed(self) -> None:
+        """
+        It logs the completed banner of a stage at INFO, with the seconds since its started banner, the
+        record is attributed to the calling function
+        """
+        if self.isEnabledFor(INFO):
+            extra = end_stage(sys._getframe(1).f_code.co_name)
+            self._log(INFO, COMPLETED_BANNER, (), extra=extra, stacklevel=2)
 
-        prefix = "".ljust(79)
-        lines = []
-        line = []
-        line_length = 180
-        line_length_cnt = len(prefix)
-        for word in m:
-            if (line_length_cnt + len(word) + len(line)) < line_length:
-                line.append(word)
-                line_length_cnt += len(word)
-            else:
-                lines.append(line)
-                line = [prefix, word.strip()]
-                line_length_cnt = len(word) + 20
+    def failed(self) -> None:
+        """
+        It logs the failed banner of a stage at INFO, with the seconds since its started banner, the
+        record is attributed to the calling function
+        """
+        if self.isEnabledFor(INFO):
+            extra = end_stage(sys._getframe(1).f_code.co_name)
+            self._log(INFO, FAILED_BANNER, (), extra=extra, stacklevel=2)
+
+
+def end_stage(name: str) -> dict:
+    """
+    It pops the stage of the function from the stage stack, with any stage started after it which did
+    not log its completed or failed banner
 
-        if not line in lines:
-            lines.append(line)
+    Args:
+      name (str): the name of the function logging its completed or failed banner.
 
-        joined_lines = []
-        for line in lines:
-            joined_lines.append(" ".join(line))
+    Returns:
+      A dictionary of the stage and elapsed seconds, the elapsed seconds are None where the function
+      has not logged its started banner.
+    """
+    stages = LOG_CONTEXT["stages"]
+    for i in range(len(stages) - 1, -1, -1):
+        if stages[i][0] == name:
+            elapsed = time.perf_counter() - stages[i][1]
+            del stages[i:]
+            return {"stage": name, "elapsed": round(elapsed, 6)}
+    return {"stage": name, "elapsed": None}
+
+
+def format_message(message: str) -> str:
+    """
+    It wraps the message so each line after the first is indented to the start of the message in the
+    log
 
-        return "\n".join(joined_lines)
+    Args:
+      message (str): the message to format.
+
+    Returns:
+      The message wrapped to lines of less than 180 characters.
+    """
+    if message:
+        return wrap_text(message, 180, MESSAGE_INDENT, None, 20)
 
     return ""
+
+
+def lazy_format_message(message: str) -> LazyMessage:
+    """
+    It defers format_message until the record is formatted, for messages logged at a level which is
+    often filtered out
+
+    Args:
+      message (str): the message to format.
+
+    Returns:
+      A LazyMessage which formats the message when converted to a string.
+    """
+    return LazyMessage(format_message, message)
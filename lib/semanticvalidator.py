@@ -0,0 +1,231 @@
+import os
+import re
+
+from lib.dependencyindex import join_table
+from lib.helper import DEFAULT_SOURCE_ALIAS
+from lib.logger import format_message, ILogger
+from lib.validationreport import create_validation_error
+
+__all__ = [
+    "validate_semantics",
+]
+
+# a join or where field of the form alias.column, anything else, i.e. a
+# literal or an expression, is not checked
+ALIAS_COLUMN_PATTERN = re.compile(r"^\s*([A-Za-z_]\w*)\.[A-Za-z_]\w*\s*$")
+
+# the name of TaskOperator.LOADFROMGCS, the operator of a task with a
+# schema_object, kept here so validation does not import the model classes
+LOAD_FROM_GCS_OPERATOR = "LOADFROMGCS"
+
+
+def validate_semantics(logger: ILogger, config: dict, index: dict) -> list[dict]:
+    """
+    It checks the references within a config, and to other configs, which the schemas can't; that task
+    dependencies name existing tasks, join and where fields use known aliases, schema objects exist and
+    history driving columns are in the source to target.  Each task is visited once, the task ids,
+    aliases and fields are looked up in sets built as it goes
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      config (dict): the content of the config file.
+      index (dict): the dependency index of all configs, from create_dependency_index, used to check
+    dependencies on the tasks of other configs.
+
+    Returns:
+      A list of the errors found, empty where the config is valid.
+    """
+    errors = []
+    tasks = config.get("tasks") or []
+
+    task_ids = set()
+    for i, t in enumerate(tasks):
+        task_id = t.get("task_id")
+        if task_id in task_ids:
+            errors.append(
+                create_validation_error(
+                    f"task_id {task_id} is used by more than one task",
+                    f"data.tasks[{i}].task_id",
+                    task_id=task_id,
+                    rule="duplicate_task_id",
+                )
+            )
+        task_ids.add(task_id)
+
+    for i, t in enumerate(tasks):
+        location = f"data.tasks[{i}]"
+        task_id = t.get("task_id")
+        parameters = t.get("parameters") or {}
+
+        errors.extend(
+            check_dependencies(
+                logger, t.get("dependencies"), task_ids, index, location, task_id
+            )
+        )
+        errors.extend(check_aliases(parameters, f"{location}.parameters", task_id))
+        errors.extend(
+            check_driving_columns(parameters, f"{location}.parameters", task_id)
+        )
+
+        if t.get("operator") == LOAD_FROM_GCS_OPERATOR:
+            schema_object = parameters.get("schema_object")
+            if schema_object and not os.path.isfile(os.path.normpath(schema_object)):
+                errors.append(
+                    create_validation_error(
+                        f"schema_object {schema_object} not found",
+                        f"{location}.parameters.schema_object",
+                        task_id=task_id,
+                        rule="missing_schema_object",
+                    )
+                )
+
+    return errors
+
+
+def check_dependencies(
+    logger: ILogger,
+    dependencies: list[str],
+    task_ids: set,
+    index: dict,
+    location: str,
+    task_id: str = None,
+) -> list[dict]:
+    """
+    It checks each dependency names a task of the config or, as dag.task, a task of another config.  A
+    dependency on a dag which is not one of the configs can't be checked and is logged as a warning
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      dependencies (list[str]): the dependencies of the task.
+      task_ids (set): the task ids of the config.
+      index (dict): the dependency index of all configs.
+      location (str): the location of the task in the config.
+      task_id (str): the task_id of the task.
+
+    Returns:
+      A list of the errors found.
+    """
+    errors = []
+    for j, dep in enumerate(dependencies or []):
+        dep_list = dep.split(".")
+        if len(dep_list) == 1:
+            if dep not in task_ids:
+                errors.append(
+                    create_validation_error(
+                        f"dependency {dep} is not a task of the config",
+                        f"{location}.dependencies[{j}]",
+                        task_id=task_id,
+                        rule="unknown_dependency",
+                    )
+                )
+            continue
+
+        upstream = index.get("dags", {}).get(dep_list[0])
+        if not upstream:
+            logger.warning(
+                format_message(f"dependency {dep} is on a dag which is not a config")
+            )
+        elif dep_list[1] not in index["configs"][upstream]["tasks"]:
+            errors.append(
+                create_validation_error(
+                    f"dependency {dep} is not a task of dag {dep_list[0]} ({upstream})",
+                    f"{location}.dependencies[{j}]",
+                    task_id=task_id,
+                    rule="unknown_dependency",
+                )
+            )
+
+    return errors
+
+
+def check_aliases(parameters: dict, location: str, task_id: str = None) -> list[dict]:
+    """
+    It checks the aliases used by the join and where fields, and by the source table of each field, are
+    the driving table alias or an alias of a source table or a join
+
+    Args:
+      parameters (dict): the parameters of the task.
+      location (str): the location of the parameters in the config.
+      task_id (str): the task_id of the task.
+
+    Returns:
+      A list of the errors found.
+    """
+    errors = []
+    joins = parameters.get("joins") or []
+
+    aliases = {DEFAULT_SOURCE_ALIAS}
+    for table in (parameters.get("source_tables") or {}).values():
+        if isinstance(table, dict) and table.get("alias"):
+            aliases.add(table["alias"])
+    for join in joins:
+        # a join of a dataset.table string is aliased by its table name
+        right = join.get("right")
+        if isinstance(right, dict) and right.get("alias"):
+            aliases.add(right["alias"])
+        elif isinstance(right, str):
+            aliases.add(join_table(right)[1])
+
+    def check_fields(conditions: list, condition_location: str) -> None:
+        for k, condition in enumerate(conditions):
+            for m, field in enumerate(condition.get("fields") or []):
+                match = ALIAS_COLUMN_PATTERN.match(str(field))
+                if match and match.group(1) not in aliases:
+                    errors.append(
+                        create_validation_error(
+                            f"alias {match.group(1)} of {field} is not a source table or join alias",
+                            f"{condition_location}[{k}].fields[{m}]",
+                            task_id=task_id,
+                            rule="unknown_alias",
+                        )
+                    )
+
+    for j, join in enumerate(joins):
+        check_fields(join.get("on") or [], f"{location}.joins[{j}].on")
+    check_fields(parameters.get("where") or [], f"{location}.where")
+
+    for j, field in enumerate(parameters.get("source_to_target") or []):
+        alias = (field.get("source_table") or {}).get("alias")
+        if alias and alias not in aliases:
+            errors.append(
+                create_validation_error(
+                    f"alias {alias} of field {field.get('name')} is not a source table or join alias",
+                    f"{location}.source_to_target[{j}].source_table.alias",
+                    task_id=task_id,
+                    rule="unknown_alias",
+                )
+            )
+
+    return errors
+
+
+def check_driving_columns(
+    parameters: dict, location: str, task_id: str = None
+) -> list[dict]:
+    """
+    It checks each history driving column is a field of the source to target, the history sql compares
+    the driving columns of the target by name
+
+    Args:
+      parameters (dict): the parameters of the task.
+      location (str): the location of the parameters in the config.
+      task_id (str): the task_id of the task.
+
+    Returns:
+      A list of the errors found.
+    """
+    history = parameters.get("history")
+    if not history:
+        return []
+
+    names = {field.get("name") for field in parameters.get("source_to_target") or []}
+    return [
+        create_validation_error(
+            f"driving_column {column.get('name')} is not in source_to_target",
+            f"{location}.history.driving_column[{j}]",
+            task_id=task_id,
+            rule="missing_driving_column",
+        )
+        for j, column in enumerate(history.get("driving_column") or [])
+        if column.get("name") not in names
+    ]
@@ -1,10 +1,9 @@
 import copy
-import json
 import os
 import re
 
 from datetime import datetime
-from jinja2 import Environment, FileSystemLoader
+from lib.artifactwriter import write_artifact
 from lib.baseclasses import (
     DEFAULT_SOURCE_ALIAS,
     WRITE_DISPOSITION_MAP,
@@ -24,17 +23,25 @@ from lib.baseclasses import (
     Task,
     TaskOperator,
     TableType,
-    todict,
+    tojson,
     UpdateTask,
     WriteDisposition,
 )
-from lib.helper import FileType, format_comment, format_description
-from lib.logger import format_message, ILogger
+from lib.helper import (
+    FileType,
+    format_comment,
+    format_description,
+    get_template_environment,
+)
+from lib.logger import ILogger, lazy_format_message
+from logging import DEBUG
+from lib.timing import stage
 from operator import itemgetter
 
 __all__ = [
     "create_sql_file",
     "create_sql",
+    "create_sql_task",
 ]
 
 pattern = r"^((?P<table>[a-zA-Z0-9_\{\}]+\.[a-zA-Z0-9_\{\}]+)(?:\.))?(?P<column>[a-zA-Z0-9_%'(), ]+)$"
@@ -48,6 +55,8 @@ def create_sql_file(
     file_path: str = "./dags/sql/",
     dataset_staging: str = None,
     job_id: str = None,
+    created_date: datetime = None,
+    sqltask: SQLTask = None,
 ) -> str:
     """
     > This function takes a task and creates a SQL file for it
@@ -58,35 +67,40 @@ def create_sql_file(
       file_path (str): The path to the directory where the SQL file will be created. Defaults to
     ./dags/sql/
       dataset_staging (str): This is the name of the staging table that will be created.
+      created_date (datetime): The date written to the file header. Defaults to the current date.
+      sqltask (SQLTask): the task already converted by create_sql_task, where None the task is converted.
 
     Returns:
       The file path of the sql file that was created.
     """
 
-    logger.info(f"STARTED".center(100, "-"))
-    sql = create_sql(logger, task, dataset_staging)
-    file_loader = FileSystemLoader("./templates")
-    env = Environment(loader=file_loader)
+    logger.started()
+    sql = create_sql(logger, task, dataset_staging, sqltask)
+    env = get_template_environment()
 
     template = env.get_template("template_sql.txt")
-    output = template.render(
-        sql=sql,
-        task_id=task.task_id,
-        job_id=job_id if job_id else task.task_id,
-        description=format_description(task.description, "Description", FileType.SQL),
-        created_date=datetime.now().strftime("%d %b %Y"),
-        author=task.author,
-    )
+    with stage("render", task=task.task_id):
+        output = template.render(
+            sql=sql,
+            task_id=task.task_id,
+            job_id=job_id if job_id else task.task_id,
+            description=format_description(
+                task.description, "Description", FileType.SQL
+            ),
+            created_date=(created_date or datetime.now()).strftime("%d %b %Y"),
+            author=task.author,
+        )
 
     sql_file = os.path.join(file_path, f"{task.task_id}.sql")
-    with open(sql_file, "w") as outfile:
-        outfile.write(output)
+    write_artifact(logger, sql_file, output)
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql_file
 
 
-def create_sql(logger: ILogger, task: Task, dataset_staging: str = None) -> str:
+def create_sql(
+    logger: ILogger, task: Task, dataset_staging: str = None, sqltask: SQLTask = None
+) -> str:
     """
     It takes a task object and returns a string of SQL
 
@@ -94,32 +108,78 @@ def create_sql(logger: ILogger, task: Task, dataset_staging: str = None) -> str:
       logger (ILogger): ILogger - this is the logger object that is passed to the function.
       task (Task): the task object
       dataset_staging (str): The name of the staging dataset.
+      sqltask (SQLTask): the task already converted by create_sql_task, where None the task is converted.
 
     Returns:
       A string of SQL code
     """
 
-    logger.info(f"STARTED".center(100, "-"))
-
-    params = SQLParameter(
-        task.parameters.get("destination_table"),
-        TableType[task.parameters.get("target_type")],
-        task.parameters.get("driving_table"),
-        converttoobj(task.parameters.get("source_to_target"), ConversionType.SOURCE),
-        converttoobj(task.parameters.get("source_tables"), ConversionType.SOURCETABLES),
-        WriteDisposition[
-            task.parameters.get("write_disposition", "WRITETRUNCATE").upper()
-        ],
-        task.parameters.get("sql"),
-        converttoobj(task.parameters.get("joins"), ConversionType.JOIN),
-        converttoobj(task.parameters.get("where"), ConversionType.WHERE),
-        converttoobj(task.parameters.get("delta"), ConversionType.DELTA),
-        task.parameters.get("destination_dataset", "{{dataset_publish}}"),
-        dataset_staging,
-        converttoobj(task.parameters.get("history"), ConversionType.ANALYTIC),
-        task.parameters.get("block_data_check"),
-        task.parameters.get("build_artifacts"),
-    )
+    logger.started()
+
+    if not sqltask:
+        sqltask = create_sql_task(task, dataset_staging)
+
+    logger.info(f"creating sql for table type {sqltask.parameters.target_type.name}")
+    with stage("sql", task=task.task_id):
+        if sqltask.parameters.write_disposition == WriteDisposition.DELETE:
+            sql = create_truncate_table_sql(
+                logger,
+                sqltask,
+            )
+        elif sqltask.parameters.target_type == TableType.TYPE1:
+            sql = create_type_1_sql(
+                logger,
+                sqltask,
+            )
+        elif sqltask.parameters.target_type == TableType.HISTORY:
+            sql = create_type_2_sql(
+                logger,
+                sqltask,
+            )
+
+    sql.append("\n")
+
+    outp = "\n".join(sql)
+    logger.completed()
+    return outp
+
+
+def create_sql_task(task: Task, dataset_staging: str = None) -> SQLTask:
+    """
+    It converts the parameters of a task into the objects used to create the sql for the task
+
+    Args:
+      task (Task): the task object
+      dataset_staging (str): The name of the staging dataset.
+
+    Returns:
+      A SQLTask object
+    """
+
+    with stage("converttoobj", task=task.task_id):
+        params = SQLParameter(
+            task.parameters.get("destination_table"),
+            TableType[task.parameters.get("target_type")],
+            task.parameters.get("driving_table"),
+            converttoobj(
+                task.parameters.get("source_to_target"), ConversionType.SOURCE
+            ),
+            converttoobj(
+                task.parameters.get("source_tables"), ConversionType.SOURCETABLES
+            ),
+            WriteDisposition[
+                task.parameters.get("write_disposition", "WRITETRUNCATE").upper()
+            ],
+            task.parameters.get("sql"),
+            converttoobj(task.parameters.get("joins"), ConversionType.JOIN),
+            converttoobj(task.parameters.get("where"), ConversionType.WHERE),
+            converttoobj(task.parameters.get("delta"), ConversionType.DELTA),
+            task.parameters.get("destination_dataset", "{{dataset_publish}}"),
+            dataset_staging,
+            converttoobj(task.parameters.get("history"), ConversionType.ANALYTIC),
+            task.parameters.get("block_data_check"),
+            task.parameters.get("build_artifacts"),
+        )
 
     sqltask = SQLTask(
         copy.copy(task.task_id),
@@ -130,28 +190,7 @@ def create_sql(logger: ILogger, task: Task, dataset_staging: str = None) -> str:
         copy.copy(task.description),
     )
 
-    logger.info(f"creating sql for table type {sqltask.parameters.target_type.name}")
-    if sqltask.parameters.write_disposition == WriteDisposition.DELETE:
-        sql = create_truncate_table_sql(
-            logger,
-            sqltask,
-        )
-    elif sqltask.parameters.target_type == TableType.TYPE1:
-        sql = create_type_1_sql(
-            logger,
-            sqltask,
-        )
-    elif sqltask.parameters.target_type == TableType.HISTORY:
-        sql = create_type_2_sql(
-            logger,
-            sqltask,
-        )
-
-    sql.append("\n")
-
-    outp = "\n".join(sql)
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
-    return outp
+    return sqltask
 
 
 def create_delta_conditions(logger: ILogger, task: SQLTask) -> list[Condition]:
@@ -166,13 +205,14 @@ def create_delta_conditions(logger: ILogger, task: SQLTask) -> list[Condition]:
       A list of Condition objects
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     outp = []
 
     if task.parameters.delta:
         delta = task.parameters.delta
-        logger.debug(f"delta object: {json.dumps(todict(delta), indent=4)}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"delta object: {tojson(delta, indent=4)}")
         if delta.field.transformation:
             field = delta.field.transformation
         else:
@@ -205,7 +245,7 @@ def create_delta_conditions(logger: ILogger, task: SQLTask) -> list[Condition]:
                 )
             )
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -221,7 +261,7 @@ def convert_lower_bound(logger: ILogger, lower_bound: str) -> str:
       A string that is the lower bound of the date range.
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     if lower_bound.upper() == "$TODAY":
         outp = "timestamp(current_date)"
     elif lower_bound.upper() == "$YESTERDAY":
@@ -235,7 +275,7 @@ def convert_lower_bound(logger: ILogger, lower_bound: str) -> str:
     else:
         outp = lower_bound
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -254,29 +294,28 @@ def create_type_1_sql(
       A list of SQL statements
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     delta = create_delta_conditions(logger, task)
-    wtask = copy.deepcopy(task)
+    # the task is shared with the other builders, the working task is a copy
+    # which shares the attributes that are not changed
+    parameters = task.parameters
     sql = []
 
     if len(delta):
-        if wtask.parameters.where is None:
-            wtask.parameters.where = []
-
-        for d in delta:
-            wtask.parameters.where.append(d)
-
-        wtask.parameters.write_disposition = WriteDisposition.WRITETRANSIENT
-        wtask.parameters.destination_dataset = wtask.parameters.staging_dataset
-        wtask.parameters.destination_table = re.sub(
-            destination_prefix,
-            td_prefix,
-            f"{wtask.parameters.destination_table}_p1"
-            if task.parameters.write_disposition != WriteDisposition.WRITETRANSIENT
-            else wtask.parameters.destination_table,
-            0,
-            re.MULTILINE,
+        parameters = parameters.with_(
+            where=[*(parameters.where or []), *delta],
+            write_disposition=WriteDisposition.WRITETRANSIENT,
+            destination_dataset=parameters.staging_dataset,
+            destination_table=re.sub(
+                destination_prefix,
+                td_prefix,
+                f"{parameters.destination_table}_p1"
+                if task.parameters.write_disposition != WriteDisposition.WRITETRANSIENT
+                else parameters.destination_table,
+                0,
+                re.MULTILINE,
+            ),
         )
 
         sql.append(
@@ -286,12 +325,13 @@ def create_type_1_sql(
         )
     else:
         dw_index = 1
-        for i, field in enumerate(wtask.parameters.source_to_target):
+        for i, field in enumerate(parameters.source_to_target):
             if not field.pk:
                 dw_index = i + 1
                 break
-        if wtask.parameters.write_disposition != WriteDisposition.WRITETRANSIENT:
-            wtask.parameters.source_to_target.insert(
+        if parameters.write_disposition != WriteDisposition.WRITETRANSIENT:
+            source_to_target = list(parameters.source_to_target)
+            source_to_target.insert(
                 dw_index,
                 Field(
                     transformation=f"current_timestamp()",
@@ -299,9 +339,11 @@ def create_type_1_sql(
                     name="dw_last_modified_dt",
                 ),
             )
+            parameters = parameters.with_(source_to_target=source_to_target)
 
         sql.append(create_sql_comment(logger, "Create target table."))
 
+    wtask = task.with_(parameters=parameters)
     sql.append(
         create_table_query(
             logger,
@@ -313,13 +355,17 @@ def create_type_1_sql(
         len(delta)
         and task.parameters.write_disposition != WriteDisposition.WRITETRANSIENT
     ):
-        wtask.parameters.driving_table = f"{wtask.parameters.destination_dataset}.{wtask.parameters.destination_table}"
-        wtask.parameters.destination_dataset = task.parameters.destination_dataset
-        wtask.parameters.destination_table = task.parameters.destination_table
+        wtask = wtask.with_(
+            parameters=parameters.with_(
+                driving_table=f"{parameters.destination_dataset}.{parameters.destination_table}",
+                destination_dataset=task.parameters.destination_dataset,
+                destination_table=task.parameters.destination_table,
+            )
+        )
 
         sql.extend(create_delta_comparisons(logger, wtask))
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql
 
 
@@ -337,7 +383,7 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
     Returns:
       A tuple of strings
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     sql = [
         create_sql_comment(
             logger,
@@ -347,15 +393,13 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
     # first we need to identify which records exist already and need updated
     # and which records need inserted. Update the task object to source from p1
     # and join to target to compare records
-    dtask = copy.deepcopy(task)
-
-    keys = dtask.primary_keys
+    keys = task.primary_keys
 
-    dtask.parameters.joins = [
+    joins = [
         Join(
             SourceTable(
-                dataset_name=dtask.parameters.destination_dataset,
-                table_name=dtask.parameters.destination_table,
+                dataset_name=task.parameters.destination_dataset,
+                table_name=task.parameters.destination_table,
                 alias="trg",
             ),
             [
@@ -372,10 +416,10 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
     ]
     m = re.search(
         r"^(?P<dataset_name>[a-z_\-0-9]+).(?P<table_name>[a-z_\-0-9]+)",
-        dtask.parameters.driving_table,
+        task.parameters.driving_table,
         re.IGNORECASE,
     )
-    dtask.parameters.source_to_target = [
+    source_to_target = [
         Field(
             name=field.name,
             source_column=field.name,
@@ -385,10 +429,10 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
                 alias="src",
             ),
         )
-        for field in dtask.parameters.source_to_target
+        for field in task.parameters.source_to_target
     ]
 
-    dtask.parameters.source_to_target.append(
+    source_to_target.append(
         Field(
             transformation=f"if(trg.{keys[0]} is null, 1, 2)",
             name="row_action",
@@ -400,10 +444,16 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
     table_index = int(m.group("table_index") if m else 0)
     table_name = m.group("table_name")
 
-    dtask.parameters.destination_table = f"{table_name}{str(table_index + 1)}"
-    dtask.parameters.destination_dataset = dtask.parameters.staging_dataset
-    dtask.parameters.where = []
-    dtask.parameters.write_disposition = WriteDisposition.WRITETRANSIENT
+    dtask = task.with_(
+        parameters=task.parameters.with_(
+            joins=joins,
+            source_to_target=source_to_target,
+            destination_table=f"{table_name}{str(table_index + 1)}",
+            destination_dataset=task.parameters.staging_dataset,
+            where=[],
+            write_disposition=WriteDisposition.WRITETRANSIENT,
+        )
+    )
 
     sql.append(
         create_table_query(
@@ -419,28 +469,13 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
             "For all new inserts (row_acount = 1), insert into target table.",
         )
     )
-    iitask = copy.deepcopy(task)
-    iitask.parameters.joins = []
-    iitask.parameters.where = [
-        Condition(
-            [
-                f"src.row_action",
-                "1",
-            ],
-            operator=Operator.EQ,
-        )
-    ]
     driving_table = SourceTable(
-        dataset_name=iitask.parameters.staging_dataset,
+        dataset_name=task.parameters.staging_dataset,
         table_name=dtask.parameters.destination_table,
         alias="src",
     )
 
-    iitask.parameters.driving_table = (
-        f"{driving_table.dataset_name}.{driving_table.table_name}"
-    )
-
-    iitask.parameters.source_to_target = [
+    source_to_target = [
         Field(
             name=field.name,
             source_column=field.name,
@@ -452,7 +487,7 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
 
     dw_index = 1
 
-    iitask.parameters.source_to_target.insert(
+    source_to_target.insert(
         dw_index,
         Field(
             transformation=f"current_timestamp()",
@@ -461,7 +496,7 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
         ),
     )
 
-    iitask.parameters.source_to_target.insert(
+    source_to_target.insert(
         dw_index,
         Field(
             transformation=f"current_timestamp()",
@@ -470,7 +505,23 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
         ),
     )
 
-    iitask.parameters.write_disposition = WriteDisposition.WRITEAPPEND
+    iitask = task.with_(
+        parameters=task.parameters.with_(
+            joins=[],
+            where=[
+                Condition(
+                    [
+                        f"src.row_action",
+                        "1",
+                    ],
+                    operator=Operator.EQ,
+                )
+            ],
+            driving_table=f"{driving_table.dataset_name}.{driving_table.table_name}",
+            source_to_target=source_to_target,
+            write_disposition=WriteDisposition.WRITEAPPEND,
+        )
+    )
 
     sql.append(
         create_table_query(
@@ -560,7 +611,7 @@ def create_delta_comparisons(logger: ILogger, task: SQLTask) -> list[str]:
         )
     )
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql
 
 
@@ -596,7 +647,7 @@ def create_type_2_sql(
     Returns:
       A list of SQL statements
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     sql = [
         create_sql_comment(
             logger,
@@ -605,7 +656,7 @@ def create_type_2_sql(
     ]
     td_table = re.sub(r"^[a-zA-Z]+_", "td_", task.parameters.destination_table)
     logger.info(
-        format_message(
+        lazy_format_message(
             f'create sql for transient table, pull source data and previous columns - "{task.parameters.staging_dataset}.{td_table}_p1"'
         )
     )
@@ -613,21 +664,23 @@ def create_type_2_sql(
     # first we create p1, this table contains required columns plus previous
     # value for driving tables.  Previous values are used later to complete CDC
     analytics = create_type_2_analytic_list(logger, task)
-    wtask = copy.deepcopy(task)
-
-    wtask.parameters.destination_table = f"{td_table}_p1"
-    wtask.parameters.destination_dataset = wtask.parameters.staging_dataset
-    wtask.parameters.write_disposition = WriteDisposition.WRITETRANSIENT
+    # the task is shared with the other builders, each working task is a copy
+    # which shares the attributes that are not changed.  add_analytic changes
+    # the source_to_target so it is copied before analytics are added
+    wtask = task.with_(
+        parameters=task.parameters.with_(
+            destination_table=f"{td_table}_p1",
+            destination_dataset=task.parameters.staging_dataset,
+            write_disposition=WriteDisposition.WRITETRANSIENT,
+            source_to_target=list(task.parameters.source_to_target),
+        )
+    )
 
     for analytic in analytics:
         wtask.add_analytic(analytic)
     delta = create_delta_conditions(logger, task)
     if len(delta):
-        if wtask.parameters.where is None:
-            wtask.parameters.where = []
-
-        for d in delta:
-            wtask.parameters.where.append(d)
+        wtask.parameters.where = [*(wtask.parameters.where or []), *delta]
 
     sql.append(
         create_table_query(
@@ -639,7 +692,7 @@ def create_type_2_sql(
     # if delta, take all primary keys identified and add full history to p1
     if len(delta):
         logger.info(
-            format_message(
+            lazy_format_message(
                 f'create sql to insert delta history into transient table - "{task.parameters.staging_dataset}.{td_table}_p1"'
             )
         )
@@ -673,30 +726,22 @@ def create_type_2_sql(
             on=join_on,
         )
 
+        delta_where = create_type_2_delta_condition(logger, task)
+
         delta_task = SQLTask(
             "delta_task",
             TaskOperator.CREATETABLE,
-            copy.deepcopy(task.parameters),
-            copy.copy(task.author),
-        )
-        delta_task.parameters.write_disposition = WriteDisposition.WRITEAPPEND
-        delta_task.parameters.destination_table = f"{td_table}_p1"
-        delta_task.parameters.destination_dataset = (
-            delta_task.parameters.staging_dataset
+            task.parameters.with_(
+                write_disposition=WriteDisposition.WRITEAPPEND,
+                destination_table=f"{td_table}_p1",
+                destination_dataset=task.parameters.staging_dataset,
+                joins=[*(task.parameters.joins or []), delta_join],
+                where=[*(task.parameters.where or []), delta_where],
+                source_to_target=list(task.parameters.source_to_target),
+            ),
+            task.author,
         )
 
-        if delta_task.parameters.joins:
-            delta_task.parameters.joins.append(delta_join)
-        else:
-            delta_task.parameters.joins = [delta_join]
-
-        delta_where = create_type_2_delta_condition(logger, task)
-
-        if delta_task.parameters.where:
-            delta_task.parameters.where.append(delta_where)
-        else:
-            delta_task.parameters.where = [delta_where]
-
         for analytic in analytics:
             delta_task.add_analytic(analytic)
 
@@ -708,7 +753,7 @@ def create_type_2_sql(
         )
 
     logger.info(
-        format_message(
+        lazy_format_message(
             f'create sql for transient table, complete CDC - "{task.parameters.staging_dataset}.{td_table}_p2"'
         )
     )
@@ -722,42 +767,41 @@ def create_type_2_sql(
 
     # second we complete CDC.  We create a new task object using our p1 table as
     # driving table
-    p2_task = SQLTask(
-        "p2_task",
-        TaskOperator.CREATETABLE,
-        copy.deepcopy(task.parameters),
-        copy.copy(task.author),
-    )
-    p2_task.parameters.write_disposition = WriteDisposition.WRITETRANSIENT
-    p2_task.parameters.destination_table = f"{td_table}_p2"
-    p2_task.parameters.destination_dataset = p2_task.parameters.staging_dataset
-    p2_task.parameters.driving_table = (
-        f"{task.parameters.staging_dataset}.{td_table}_p1"
-    )
     p1_source_table = SourceTable(
         dataset_name=task.parameters.staging_dataset,
         table_name=f"{td_table}_p1",
         alias="src",
     )
-    p2_task.parameters.source_to_target = [
-        Field(
-            name=field.name,
-            source_table=p1_source_table,
-        )
-        for field in task.parameters.source_to_target
-    ]
-    p2_task.parameters.where = [
-        Condition(
-            [
-                f"ifnull(cast(src.{c.name} as string),'NULL')",
-                f"ifnull(cast(src.prev_{c.name} as string),'NULL')",
+    p2_task = SQLTask(
+        "p2_task",
+        TaskOperator.CREATETABLE,
+        task.parameters.with_(
+            write_disposition=WriteDisposition.WRITETRANSIENT,
+            destination_table=f"{td_table}_p2",
+            destination_dataset=task.parameters.staging_dataset,
+            driving_table=f"{task.parameters.staging_dataset}.{td_table}_p1",
+            source_to_target=[
+                Field(
+                    name=field.name,
+                    source_table=p1_source_table,
+                )
+                for field in task.parameters.source_to_target
             ],
-            operator=Operator.NE,
-            condition=LogicOperator.OR,
-        )
-        for c in task.parameters.history.driving_column
-    ]
-    p2_task.parameters.joins = None
+            where=[
+                Condition(
+                    [
+                        f"ifnull(cast(src.{c.name} as string),'NULL')",
+                        f"ifnull(cast(src.prev_{c.name} as string),'NULL')",
+                    ],
+                    operator=Operator.NE,
+                    condition=LogicOperator.OR,
+                )
+                for c in task.parameters.history.driving_column
+            ],
+            joins=None,
+        ),
+        task.author,
+    )
 
     sql.append(
         create_table_query(
@@ -767,7 +811,7 @@ def create_type_2_sql(
     )
 
     logger.info(
-        format_message(
+        lazy_format_message(
             f'create sql for transient table, add/replace effective_to_dt with lead - "{task.parameters.staging_dataset}.{td_table}"'
         )
     )
@@ -780,30 +824,33 @@ def create_type_2_sql(
         )
     )
 
-    p3_task = SQLTask(
-        "p3_task",
-        TaskOperator.CREATETABLE,
-        copy.deepcopy(task.parameters),
-        copy.copy(task.author),
-    )
-    p3_task.parameters.driving_table = (
-        f"{task.parameters.staging_dataset}.{td_table}_p2"
-    )
-    p3_task.parameters.destination_table = f"{td_table}_p3"
-    p3_task.parameters.destination_dataset = task.parameters.staging_dataset
     p2_source_table = SourceTable(
         dataset_name=task.parameters.staging_dataset,
         table_name=f"{td_table}_p2",
         alias="src",
     )
-    p3_task.parameters.source_to_target = [
-        Field(name=c.name, source_column=c.name, source_table=p2_source_table, pk=c.pk)
-        for c in task.parameters.source_to_target
-    ]
-
-    p3_task.parameters.joins = None
-    p3_task.parameters.where = None
-    p3_task.parameters.write_disposition = WriteDisposition.WRITETRANSIENT
+    p3_task = SQLTask(
+        "p3_task",
+        TaskOperator.CREATETABLE,
+        task.parameters.with_(
+            driving_table=f"{task.parameters.staging_dataset}.{td_table}_p2",
+            destination_table=f"{td_table}_p3",
+            destination_dataset=task.parameters.staging_dataset,
+            source_to_target=[
+                Field(
+                    name=c.name,
+                    source_column=c.name,
+                    source_table=p2_source_table,
+                    pk=c.pk,
+                )
+                for c in task.parameters.source_to_target
+            ],
+            joins=None,
+            where=None,
+            write_disposition=WriteDisposition.WRITETRANSIENT,
+        ),
+        task.author,
+    )
 
     to_index = None
     for i, col in enumerate(task.parameters.source_to_target):
@@ -853,28 +900,30 @@ def create_type_2_sql(
         )
     )
 
-    td_task = SQLTask(
-        "td_task",
-        TaskOperator.CREATETABLE,
-        copy.deepcopy(p3_task.parameters),
-        copy.copy(p3_task.author),
-    )
-
-    td_task.parameters.driving_table = (
-        f"{task.parameters.staging_dataset}.{td_table}_p3"
-    )
-    td_task.parameters.destination_dataset = task.parameters.destination_dataset
-    td_task.parameters.destination_table = task.parameters.destination_table
-
     p3_source_table = SourceTable(
         dataset_name=task.parameters.staging_dataset,
         table_name=f"{td_table}_p3",
         alias="src",
     )
-    td_task.parameters.source_to_target = [
-        Field(name=c.name, source_column=c.name, source_table=p3_source_table, pk=c.pk)
-        for c in p3_task.parameters.source_to_target
-    ]
+    td_task = SQLTask(
+        "td_task",
+        TaskOperator.CREATETABLE,
+        p3_task.parameters.with_(
+            driving_table=f"{task.parameters.staging_dataset}.{td_table}_p3",
+            destination_dataset=task.parameters.destination_dataset,
+            destination_table=task.parameters.destination_table,
+            source_to_target=[
+                Field(
+                    name=c.name,
+                    source_column=c.name,
+                    source_table=p3_source_table,
+                    pk=c.pk,
+                )
+                for c in p3_task.parameters.source_to_target
+            ],
+        ),
+        p3_task.author,
+    )
 
     if len(delta):
         sql.extend(create_delta_comparisons(logger, td_task))
@@ -901,7 +950,7 @@ def create_type_2_sql(
             )
         )
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql
 
 
@@ -916,7 +965,7 @@ def create_type_2_analytic_list(logger: ILogger, task: SQLTask) -> list:
     Returns:
       A list of Analytic objects
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     outp = []
     history = task.parameters.history if task.parameters.history else []
     for c in history.driving_column:
@@ -934,7 +983,7 @@ def create_type_2_analytic_list(logger: ILogger, task: SQLTask) -> list:
         )
         outp.append(analytic)
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -951,13 +1000,14 @@ def create_type_2_delta_condition(logger: ILogger, task: SQLTask) -> dict:
       A dictionary with the operator and fields.
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     outp = None
 
     if task.parameters.delta:
         delta = task.parameters.delta
-        logger.debug(f"delta object: {delta}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"delta object: {delta}")
         if delta.field.transformation:
             field = delta.field.transformation
         else:
@@ -976,7 +1026,7 @@ def create_type_2_delta_condition(logger: ILogger, task: SQLTask) -> dict:
 
         outp = Condition([field, upper_bound], operator=Operator.LT)
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -995,12 +1045,12 @@ def create_truncate_table_sql(
       A string
     """
 
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     sql = [
         f"{task.parameters.destination_dataset}.{task.parameters.destination_table}:DELETE:",
         f"truncate table {task.parameters.destination_dataset}.{task.parameters.destination_table};",
     ]
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql
 
 
@@ -1018,29 +1068,26 @@ def create_table_query(
     Returns:
       A string of SQL code.
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
     sql = []
-    # create working task object so it can be edited without impacting
-    # original
-    wtask = copy.deepcopy(task)
 
     # write truncate disposition from config is translated to a truncate statement followed
     # by an append.
-    if wtask.parameters.write_disposition == WriteDisposition.WRITETRUNCATE:
+    if task.parameters.write_disposition == WriteDisposition.WRITETRUNCATE:
         sql.extend(
             [
-                f"{wtask.parameters.destination_dataset}.{wtask.parameters.destination_table}:DELETE:",
-                f"truncate table {wtask.parameters.destination_dataset}.{wtask.parameters.destination_table};",
+                f"{task.parameters.destination_dataset}.{task.parameters.destination_table}:DELETE:",
+                f"truncate table {task.parameters.destination_dataset}.{task.parameters.destination_table};",
             ]
         )
 
     sql.append(
-        f"{wtask.parameters.destination_dataset}.{wtask.parameters.destination_table}:{WRITE_DISPOSITION_MAP.get(wtask.parameters.write_disposition.value)}:"
+        f"{task.parameters.destination_dataset}.{task.parameters.destination_table}:{WRITE_DISPOSITION_MAP.get(task.parameters.write_disposition.value)}:"
     )
 
-    frm, where = itemgetter("from", "where")(create_sql_conditions(logger, wtask))
+    frm, where = itemgetter("from", "where")(create_sql_conditions(logger, task))
 
-    select = create_sql_select(logger, wtask)
+    select = create_sql_select(logger, task)
     query_list = [
         ",\n".join(select),
         "\n",
@@ -1052,7 +1099,7 @@ def create_table_query(
 
     sql.append("".join(query_list))
     outp = "\n".join(sql)
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -1067,7 +1114,7 @@ def create_update_query(logger: ILogger, task: UpdateTask) -> str:
     Returns:
       A string that is a SQL query.
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     outp = [
         f"{task.target_dataset}.{task.target_table}:UPDATE:",
@@ -1093,7 +1140,7 @@ def create_update_query(logger: ILogger, task: UpdateTask) -> str:
 
     outp.append("\n".join(create_sql_where(logger, task.where)))
     outp.append(";\n")
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return "\n".join(outp)
 
 
@@ -1109,11 +1156,14 @@ def create_sql_select(logger: ILogger, task: SQLTask) -> str:
       A string
     """
 
-    logger.info(f"STARTED".center(100, "-"))
-    logger.debug(
-        f"""creating select list from
+    logger.started()
+    # the task is converted to a string only when debug is logged, it is the
+    # largest message logged while creating sql
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(
+            f"""creating select list from
                                task - {task}"""
-    )
+        )
     select = []
     # for each column in the source_to_target we identify the source table and column,
     # or where there is transformation use that in place of the source table and column,
@@ -1139,7 +1189,7 @@ def create_sql_select(logger: ILogger, task: SQLTask) -> str:
 
         select.append(f"{prefix}{source}{alias}")
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return select
 
 
@@ -1154,7 +1204,7 @@ def create_sql_conditions(logger: ILogger, task: SQLTask) -> dict:
     Returns:
       A dictionary with two keys: from and where.
     """
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     frm = [f"  from {task.parameters.driving_table} {DEFAULT_SOURCE_ALIAS}"]
     logger.info(f"identifying join conditions")
@@ -1201,7 +1251,7 @@ def create_sql_conditions(logger: ILogger, task: SQLTask) -> dict:
 
     outp = {"from": frm, "where": where}
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return outp
 
 
@@ -1216,13 +1266,14 @@ def create_sql_where(logger: ILogger, conditions: list[Condition]) -> str:
     Returns:
       A list of strings
     """
-    logger.info(f"STARTED".center(100, "-"))
-    logger.debug(
-        format_message(
-            f"""creating where conditions:
+    logger.started()
+    if logger.isEnabledFor(DEBUG):
+        logger.debug(
+            lazy_format_message(
+                f"""creating where conditions:
                                conditions  - {conditions}"""
+            )
         )
-    )
 
     where = []
 
@@ -1244,14 +1295,14 @@ def create_sql_where(logger: ILogger, conditions: list[Condition]) -> str:
             f"{prefix}{left_table.ljust(pad)} {condition.operator.value} {open_bracket}{right_table}{close_bracket}"
         )
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return where
 
 
 def create_sql_comment(logger: ILogger, comment: str) -> str:
-    logger.info(f"STARTED".center(100, "-"))
+    logger.started()
 
     sql_comment = f"{''.ljust(81,'-')}\n{format_comment(comment, FileType.SQL)}\n{''.ljust(81,'-')}"
 
-    logger.info(f"COMPLETED SUCCESSFULLY".center(100, "-"))
+    logger.completed()
     return sql_comment
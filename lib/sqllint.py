@@ -0,0 +1,294 @@
+import glob
+import hashlib
+import json
+import os
+
+from lib.logger import format_message, ILogger
+from lib.timing import stage
+
+__all__ = [
+    "lint_sql_files",
+    "find_sql_files",
+    "load_lint_cache",
+    "save_lint_cache",
+]
+
+LINT_CACHE_VERSION = 1
+
+# the sqlfluff linter of this process, created once from the config as parsing
+# the config and loading the rules is slower than linting a generated file
+LINTER = {"config_path": None, "linter": None}
+
+
+def find_sql_files(paths: list[str]) -> list[str]:
+    """
+    It finds the sql files in each directory
+
+    Args:
+      paths (list[str]): the directories containing sql files, i.e. ./dags/sql/
+
+    Returns:
+      A sorted list of file paths.
+    """
+    files = set()
+    for path in paths:
+        if path and os.path.isdir(path):
+            files.update(
+                os.path.normpath(p) for p in glob.glob(os.path.join(path, "*.sql"))
+            )
+    return sorted(files)
+
+
+def get_lint_config_hash(config_path: str) -> str:
+    """
+    It creates a hash of the sqlfluff config and version, a change to either invalidates every cached
+    result
+
+    Args:
+      config_path (str): the path of the .sqlfluff config file.
+
+    Returns:
+      The sha256 of the config.
+    """
+    import sqlfluff
+
+    digest = hashlib.sha256(sqlfluff.__version__.encode("utf-8"))
+    if config_path and os.path.isfile(config_path):
+        with open(config_path, "rb") as sourcefile:
+            digest.update(sourcefile.read())
+    return digest.hexdigest()
+
+
+def get_lint_key(config_hash: str, content: str) -> str:
+    """
+    It creates the key of the cached result of a sql file, the hash of the config and the content of
+    the file; the path is not part of the key so a file which is renamed is not linted again
+
+    Args:
+      config_hash (str): the hash returned by get_lint_config_hash.
+      content (str): the content of the sql file.
+
+    Returns:
+      The sha256 of the config hash and content.
+    """
+    return hashlib.sha256(f"{config_hash}:{content}".encode("utf-8")).hexdigest()
+
+
+def load_lint_cache(logger: ILogger, path: str) -> dict:
+    """
+    It reads the results of previous lints, an empty cache is returned where the file does not exist or
+    can't be read
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the cache file.
+
+    Returns:
+      A dictionary of lint key to the violations found.
+    """
+    if not path or not os.path.isfile(path):
+        return {}
+
+    try:
+        with open(path, "r") as sourcefile:
+            content = json.loads(sourcefile.read())
+    except (OSError, ValueError):
+        logger.warning(format_message(f"lint cache {path} could not be read"))
+        return {}
+
+    if content.get("lint_cache_version") != LINT_CACHE_VERSION:
+        return {}
+    return content.get("results", {})
+
+
+def save_lint_cache(logger: ILogger, path: str, results: dict) -> None:
+    """
+    It writes the results of the lint, the file is written to a temporary file first and then renamed
+    so an interrupted lint cannot leave a partial cache
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the cache file.
+      results (dict): a dictionary of lint key to the violations found.
+    """
+    if not path:
+        return None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as outfile:
+        outfile.write(
+            json.dumps(
+                {"lint_cache_version": LINT_CACHE_VERSION, "results": results},
+                indent=4,
+                sort_keys=True,
+            )
+        )
+    os.replace(temp_path, path)
+
+    logger.debug(format_message(f"lint cache written {path}"))
+    return None
+
+
+def get_linter(config_path: str):
+    """
+    It returns the sqlfluff linter of this process, created on first use
+
+    Args:
+      config_path (str): the path of the .sqlfluff config file.
+
+    Returns:
+      A sqlfluff Linter.
+    """
+    if LINTER["linter"] is None or LINTER["config_path"] != config_path:
+        from sqlfluff.core import FluffConfig, Linter
+
+        config = FluffConfig.from_root(extra_config_path=config_path)
+        LINTER["linter"] = Linter(config=config)
+        LINTER["config_path"] = config_path
+    return LINTER["linter"]
+
+
+def lint_sql(config_path: str, path: str, content: str) -> list[dict]:
+    """
+    It lints the content of a sql file
+
+    Args:
+      config_path (str): the path of the .sqlfluff config file.
+      path (str): the path of the sql file, used by the templater and in messages.
+      content (str): the content of the sql file.
+
+    Returns:
+      A list of the violations found, each a dictionary of the line, position, rule code and
+      description.
+    """
+    linted = get_linter(config_path).lint_string(content, fname=path)
+    return [
+        {
+            "line_no": v.line_no,
+            "line_pos": v.line_pos,
+            "code": v.rule_code(),
+            "description": v.desc(),
+        }
+        for v in linted.get_violations()
+    ]
+
+
+def init_lint_worker(config_path: str) -> None:
+    """
+    It creates the linter used by a worker process when the pool starts
+
+    Args:
+      config_path (str): the path of the .sqlfluff config file.
+    """
+    get_linter(config_path)
+
+
+def lint_sql_worker(config_path: str, path: str, content: str) -> list[dict]:
+    """
+    It lints the content of a sql file inside a worker process
+
+    Args:
+      config_path (str): the path of the .sqlfluff config file.
+      path (str): the path of the sql file.
+      content (str): the content of the sql file.
+
+    Returns:
+      A list of the violations found.
+    """
+    return lint_sql(config_path, path, content)
+
+
+def lint_sql_files(
+    logger: ILogger,
+    paths: list[str],
+    config_path: str,
+    cache_path: str = None,
+    workers: int = 1,
+) -> dict:
+    """
+    It lints each sql file with sqlfluff.  Results are cached by the hash of the content of the file and
+    the sqlfluff config, so only a file whose content has changed since it was last linted is linted
+    again.  Where workers is greater than 1 the files are linted in a pool of worker processes.  Where
+    sqlfluff is not installed the lint is skipped
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      paths (list[str]): the paths of the sql files.
+      config_path (str): the path of the .sqlfluff config file.
+      cache_path (str): the path of the cache file, where None results are not cached.
+      workers (int): the maximum number of worker processes. Defaults to 1
+
+    Returns:
+      A dictionary of the path of each sql file to the violations found, None where the lint was
+      skipped.
+    """
+    try:
+        # sqlfluff is only needed to lint and is slow to import
+        import sqlfluff
+    except ImportError:
+        logger.warning(format_message(f"sqlfluff is not installed, lint skipped"))
+        return None
+
+    logger.started()
+    config_hash = get_lint_config_hash(config_path)
+    cache = load_lint_cache(logger, cache_path)
+
+    keys = {}
+    contents = {}
+    for path in paths:
+        with open(path, "r") as sourcefile:
+            contents[path] = sourcefile.read()
+        keys[path] = get_lint_key(config_hash, contents[path])
+
+    # a file whose content is the same as another is only linted once
+    pending = {}
+    for path in paths:
+        if keys[path] not in cache and keys[path] not in pending:
+            pending[keys[path]] = path
+    logger.info(
+        format_message(
+            f"{len(pending)} of {len(paths)} sql file(s) to lint, {len(paths) - len(pending)} cached"
+        )
+    )
+
+    with stage("lint", files=len(pending)):
+        if workers > 1 and len(pending) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=init_lint_worker,
+                initargs=(config_path,),
+            ) as executor:
+                futures = {
+                    key: executor.submit(
+                        lint_sql_worker, config_path, path, contents[path]
+                    )
+                    for key, path in pending.items()
+                }
+                for key, future in futures.items():
+                    cache[key] = future.result()
+        else:
+            for key, path in pending.items():
+                cache[key] = lint_sql(config_path, path, contents[path])
+
+    results = {path: cache[keys[path]] for path in paths}
+
+    # only the results of the current files are kept so the cache does not
+    # grow with every change to a file
+    save_lint_cache(logger, cache_path, {key: cache[key] for key in set(keys.values())})
+
+    for path, violations in results.items():
+        for v in violations:
+            logger.error(
+                format_message(
+                    f"{path}:{v['line_no']}:{v['line_pos']} {v['code']} {v['description']}"
+                )
+            )
+
+    logger.completed()
+    return results
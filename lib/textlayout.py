@@ -0,0 +1,78 @@
+import re
+
+from functools import lru_cache
+
+__all__ = [
+    "wrap_text",
+]
+
+WORD_PATTERN = re.compile(r"([^\s]+)")
+
+# the number of laid out blocks kept, a block is laid out again when it has been
+# evicted.  log messages are rarely repeated, comment and description blocks
+# are repeated for every task built from the same config
+WRAP_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=WRAP_CACHE_SIZE)
+def wrap_text(
+    text: str,
+    width: int,
+    prefix: str,
+    first_prefix: str = None,
+    continued_length: int = 0,
+) -> str:
+    """
+    It splits the text into words and lays them out greedily in lines of less than width characters.
+    Each line after the first starts with the prefix.  The layout is the one format_message,
+    format_comment and format_description have always written and is kept byte for byte:
+
+    - a line is full when the characters of its words plus one space for each word already on it reach
+      the width, the prefix is counted as a word of the line
+    - the first line starts with first_prefix, or where None no prefix but counted as the length of
+      prefix
+    - each line after the first is counted as continued_length plus its words, not the prefix
+    - the last line is dropped where it is the same as an earlier line
+
+    Laid out blocks are cached by their arguments.
+
+    Args:
+      text (str): the text to lay out.
+      width (int): the width a line must be less than.
+      prefix (str): the start of each line after the first.
+      first_prefix (str): the start of the first line. Defaults to None
+      continued_length (int): the length each line after the first is counted from. Defaults to 0
+
+    Returns:
+      The lines joined by new lines.
+    """
+    words = WORD_PATTERN.findall(text)
+
+    if first_prefix is None:
+        line = []
+        used = len(prefix)
+    else:
+        line = [first_prefix]
+        used = len(first_prefix) + 1
+
+    # used is the length a line is counted as, its words plus one for each word
+    # on it.  where every word fits on the first line, the usual case for a log
+    # message, it is the only line
+    if used + sum(map(len, words)) + len(words) - 1 < width:
+        return " ".join(line + words)
+
+    lines = []
+    for word in words:
+        length = len(word)
+        if used + length < width:
+            line.append(word)
+            used += length + 1
+        else:
+            lines.append(line)
+            line = [prefix, word]
+            used = length + continued_length + 2
+
+    if not line in lines:
+        lines.append(line)
+
+    return "\n".join(" ".join(line) for line in lines)
@@ -0,0 +1,281 @@
+import cProfile
+import json
+import os
+import time
+
+from contextlib import contextmanager
+from lib.logger import format_message, ILogger, log_context
+
+__all__ = [
+    "enable_timings",
+    "reset_timings",
+    "get_timings",
+    "add_timings",
+    "stage",
+    "profile",
+    "create_timing_report",
+    "write_timings",
+    "merge_timings",
+]
+
+# timing state of this process, when disabled stage() records nothing.  spans
+# are the completed stages, open holds the stages currently running so nested
+# stages inherit the config of the stage they run inside
+TIMINGS = {"enabled": False, "spans": [], "open": []}
+
+
+def enable_timings(enabled: bool = True) -> None:
+    """
+    It turns the recording of stage timings on or off for this process
+
+    Args:
+      enabled (bool): where True stage timings are recorded. Defaults to True
+    """
+    TIMINGS["enabled"] = enabled
+    return None
+
+
+def reset_timings() -> None:
+    """
+    It removes the stage timings recorded by this process
+    """
+    TIMINGS["spans"] = []
+    TIMINGS["open"] = []
+    return None
+
+
+def get_timings() -> list[dict]:
+    """
+    It returns the stage timings recorded by this process
+
+    Returns:
+      A list of spans.
+    """
+    return list(TIMINGS["spans"])
+
+
+def add_timings(spans: list[dict]) -> None:
+    """
+    It adds stage timings returned from another process to the timings of this process
+
+    Args:
+      spans (list[dict]): the spans recorded by the other process.
+    """
+    TIMINGS["spans"].extend(spans)
+    return None
+
+
+@contextmanager
+def stage(name: str, config: str = None, **kwargs):
+    """
+    It records the wall and cpu time of the code run inside the with block as a span.  Where no config
+    is supplied the config of the enclosing stage is used.  The config and task are added to the log
+    context of the block, so are written with each JSON log record
+
+    Args:
+      name (str): the name of the stage, i.e. json_load, sql, render
+      config (str): the path of the config being built.
+      kwargs: any other detail to record with the span, i.e. the task_id
+    """
+    fields = {"config": config, "task_id": kwargs.get("task")}
+    with log_context(**{key: value for key, value in fields.items() if value}):
+        if not TIMINGS["enabled"]:
+            yield
+            return
+
+        yield from record_stage(name, config, **kwargs)
+
+
+def record_stage(name: str, config: str = None, **kwargs):
+    """
+    It records the wall and cpu time of the stage, the generator of stage() while timings are enabled
+
+    Args:
+      name (str): the name of the stage, i.e. json_load, sql, render
+      config (str): the path of the config being built.
+      kwargs: any other detail to record with the span, i.e. the task_id
+    """
+    if not config and TIMINGS["open"]:
+        config = TIMINGS["open"][-1]["config"]
+
+    span = {
+        "name": name,
+        "config": config,
+        "args": kwargs,
+        "pid": os.getpid(),
+        "start": time.time(),
+    }
+    TIMINGS["open"].append(span)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        span["wall"] = time.perf_counter() - wall
+        span["cpu"] = time.process_time() - cpu
+        TIMINGS["open"].remove(span)
+        TIMINGS["spans"].append(span)
+
+
+@contextmanager
+def profile(path: str = None):
+    """
+    It runs the code inside the with block under cProfile and writes the stats to path, where no path
+    is supplied the code is run without profiling
+
+    Args:
+      path (str): the path of the file to write the stats to.
+    """
+    if not path:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        profiler.dump_stats(path)
+
+
+def create_timing_report(spans: list[dict]) -> dict:
+    """
+    It totals the spans by stage, and by stage within each config.  Times are inclusive; a stage
+    includes the time of any stages run inside it
+
+    Args:
+      spans (list[dict]): the spans to report on.
+
+    Returns:
+      A dictionary with the keys stages, total times of each stage, and configs, total times of each
+      stage of each config.  Times are in seconds.
+    """
+    report = {"stages": {}, "configs": {}}
+
+    for span in spans:
+        totals = [report["stages"].setdefault(span["name"], create_total())]
+        if span["config"]:
+            config = report["configs"].setdefault(span["config"], {})
+            totals.append(config.setdefault(span["name"], create_total()))
+
+        for total in totals:
+            total["count"] += 1
+            total["wall"] += span["wall"]
+            total["cpu"] += span["cpu"]
+
+    return report
+
+
+def create_total() -> dict:
+    """
+    It creates an empty total for a stage
+
+    Returns:
+      A dictionary of count, wall and cpu.
+    """
+    return {"count": 0, "wall": 0.0, "cpu": 0.0}
+
+
+def create_trace(spans: list[dict]) -> dict:
+    """
+    It converts the spans into complete events of the Chrome trace event format, which can be opened in
+    chrome://tracing or Perfetto.  Each process is shown as its own track
+
+    Args:
+      spans (list[dict]): the spans to convert.
+
+    Returns:
+      A dictionary of the trace events.
+    """
+    events = [
+        {
+            "name": span["name"],
+            "cat": "stage",
+            "ph": "X",
+            "ts": round(span["start"] * 1000000),
+            "dur": round(span["wall"] * 1000000),
+            "pid": span["pid"],
+            "tid": span["pid"],
+            "args": dict(span["args"], config=span["config"], cpu=span["cpu"]),
+        }
+        for span in spans
+    ]
+    events.sort(key=lambda e: (e["pid"], e["ts"], -e["dur"]))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_timings(logger: ILogger, path: str, spans: list[dict]) -> None:
+    """
+    It writes the timing report, timings.json, and the Chrome trace, trace.json, to the directory
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the directory to write the files to.
+      spans (list[dict]): the spans to write.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    report_file = os.path.join(path, "timings.json")
+    with open(report_file, "w") as outfile:
+        outfile.write(json.dumps(create_timing_report(spans), indent=4))
+
+    trace_file = os.path.join(path, "trace.json")
+    with open(trace_file, "w") as outfile:
+        outfile.write(json.dumps(create_trace(spans)))
+
+    logger.info(format_message(f"timings written {report_file}, {trace_file}"))
+    return None
+
+
+def merge_timings(logger: ILogger, paths: list[str], output: str) -> None:
+    """
+    It combines the timing reports and traces written by each shard of a build into a single report
+    and trace
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      paths (list[str]): the timings directories of the shards.
+      output (str): the directory to write the combined files to.
+    """
+    report = {"stages": {}, "configs": {}}
+    events = []
+
+    for path in paths:
+        report_file = os.path.join(path, "timings.json")
+        if not os.path.isfile(report_file):
+            logger.warning(format_message(f"no timings found in {path}"))
+            continue
+
+        logger.info(format_message(f"merging timings from {path}"))
+        with open(report_file, "r") as sourcefile:
+            shard_report = json.loads(sourcefile.read())
+
+        shard_totals = [(report["stages"], shard_report.get("stages", {}))] + [
+            (report["configs"].setdefault(config, {}), stages)
+            for config, stages in shard_report.get("configs", {}).items()
+        ]
+        for totals, stages in shard_totals:
+            for name, stage_total in stages.items():
+                total = totals.setdefault(name, create_total())
+                for key in total.keys():
+                    total[key] += stage_total.get(key, 0)
+
+        trace_file = os.path.join(path, "trace.json")
+        if os.path.isfile(trace_file):
+            with open(trace_file, "r") as sourcefile:
+                events.extend(json.loads(sourcefile.read()).get("traceEvents", []))
+
+    os.makedirs(output, exist_ok=True)
+
+    report_file = os.path.join(output, "timings.json")
+    with open(report_file, "w") as outfile:
+        outfile.write(json.dumps(report, indent=4))
+
+    trace_file = os.path.join(output, "trace.json")
+    with open(trace_file, "w") as outfile:
+        outfile.write(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+    logger.info(format_message(f"timings written {report_file}, {trace_file}"))
+    return None
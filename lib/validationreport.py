@@ -0,0 +1,143 @@
+import json
+import os
+
+from datetime import datetime
+from lib.logger import format_message, ILogger
+
+__all__ = [
+    "create_validation_error",
+    "create_validation_report",
+    "write_json_report",
+    "write_junit_report",
+]
+
+
+def create_validation_error(
+    message: str,
+    location: str = None,
+    schema: str = None,
+    task_id: str = None,
+    rule: str = None,
+) -> dict:
+    """
+    It creates an error found validating a config
+
+    Args:
+      message (str): the reason the config is not valid.
+      location (str): the location of the error in the config, i.e. data.tasks[0].task_id
+      schema (str): the name of the schema the config, or part of it, was validated against.
+      task_id (str): the task being validated, None where the error is not in a task.
+      rule (str): the schema rule which failed, i.e. required, type
+
+    Returns:
+      A dictionary of the error.
+    """
+    return {
+        "message": message,
+        "location": location,
+        "schema": schema,
+        "task_id": task_id,
+        "rule": rule,
+    }
+
+
+def create_validation_report(results: list[dict]) -> dict:
+    """
+    It totals the results of validating each config
+
+    Args:
+      results (list[dict]): the result of each config, the path, status (passed, failed or error), time
+    in seconds and errors.
+
+    Returns:
+      A dictionary of the totals and the results.
+    """
+    return {
+        "created": datetime.now().isoformat(),
+        "total": len(results),
+        "passed": len([r for r in results if r["status"] == "passed"]),
+        "failed": len([r for r in results if r["status"] == "failed"]),
+        "errors": len([r for r in results if r["status"] == "error"]),
+        "time": sum(r["time"] for r in results),
+        "results": results,
+    }
+
+
+def write_json_report(logger: ILogger, path: str, results: list[dict]) -> None:
+    """
+    It writes the results of validating each config as JSON
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the file to write.
+      results (list[dict]): the result of each config.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as outfile:
+        outfile.write(json.dumps(create_validation_report(results), indent=4))
+
+    logger.info(format_message(f"validation report written {path}"))
+    return None
+
+
+def write_junit_report(logger: ILogger, path: str, results: list[dict]) -> None:
+    """
+    It writes the results of validating each config as JUnit XML, each config is a test case so CI can
+    annotate the configs which failed with the location of each error
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      path (str): the path of the file to write.
+      results (list[dict]): the result of each config.
+    """
+    # ElementTree, and the expat parser it loads, are only needed for a JUnit report
+    from xml.etree import ElementTree
+
+    report = create_validation_report(results)
+
+    suites = ElementTree.Element("testsuites")
+    suite = ElementTree.SubElement(
+        suites,
+        "testsuite",
+        name="validatedagconfig",
+        tests=str(report["total"]),
+        failures=str(report["failed"]),
+        errors=str(report["errors"]),
+        time=f"{report['time']:.6f}",
+        timestamp=report["created"],
+    )
+
+    for result in results:
+        case = ElementTree.SubElement(
+            suite,
+            "testcase",
+            classname="validatedagconfig",
+            name=result["path"],
+            file=result["path"],
+            time=f"{result['time']:.6f}",
+        )
+        if result["status"] == "passed":
+            continue
+
+        details = [
+            f"{e['location'] or result['path']}: {e['message']}"
+            + (f" (task {e['task_id']})" if e["task_id"] else "")
+            + (f" [{e['schema']}]" if e["schema"] else "")
+            for e in result["errors"]
+        ]
+        rule = result["errors"][0]["rule"] if result["errors"] else None
+        element = ElementTree.SubElement(
+            case,
+            "failure" if result["status"] == "failed" else "error",
+            message=details[0] if details else result["status"],
+            type=rule or result["status"],
+        )
+        element.text = "\n".join(details)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tree = ElementTree.ElementTree(suites)
+    ElementTree.indent(tree)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+    logger.info(format_message(f"junit report written {path}"))
+    return None
@@ -0,0 +1,88 @@
+import argparse
+import sys
+import traceback
+
+from lib.buildcache import merge_manifests, save_manifest
+from lib.discovery import parse_patterns
+from lib.logger import ILogger
+from lib.timing import merge_timings
+
+
+def main(logger: ILogger, args: argparse.Namespace) -> int:
+    """
+    This function combines the build manifests and timing reports written by each shard of a sharded
+    build, so the next build, sharded or not, can use a single manifest
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      args (argparse.Namespace): argparse.Namespace
+
+    Returns:
+      The exit code of the program.
+    """
+    logger.info(f"Merge Shards STARTED".center(100, "-"))
+
+    manifests = parse_patterns(args.manifests)
+    if manifests:
+        manifest = merge_manifests(logger, manifests)
+        save_manifest(logger, args.manifest_output, manifest)
+
+    timings = parse_patterns(args.timings)
+    if timings:
+        merge_timings(logger, timings, args.timings_output)
+
+    if not manifests and not timings:
+        logger.warning(f"no manifests or timings supplied to merge")
+
+    logger.info(f"Merge Shards COMPLETED SUCCESSFULLY".center(100, "-"))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--manifests",
+        required=False,
+        dest="manifests",
+        help="A comma separated list of the build manifests written by each shard.",
+    )
+    parser.add_argument(
+        "--manifest_output",
+        required=False,
+        dest="manifest_output",
+        default="./.buildmanifest.json",
+        help="Specify the path of the merged build manifest (default: ./.buildmanifest.json).",
+    )
+    parser.add_argument(
+        "--timings",
+        required=False,
+        dest="timings",
+        help="A comma separated list of the timings directories written by each shard.",
+    )
+    parser.add_argument(
+        "--timings_output",
+        required=False,
+        dest="timings_output",
+        default="./timings/",
+        help="Specify the directory of the merged timings (default: ./timings/).",
+    )
+    parser.add_argument(
+        "--log_level",
+        required=False,
+        dest="level",
+        default="INFO",
+        help="Specify the desired log level (default: INFO).  This can be one of the following: 'CRITICAL', 'DEBUG', 'ERROR', 'FATAL','INFO','NOTSET', 'WARNING'",
+    )
+
+    known_args, args = parser.parse_known_args()
+    logger = ILogger("Merge Shards", None, level=known_args.level)
+
+    try:
+        result = main(logger, known_args)
+    except:
+        logger.error(f"{traceback.format_exc():}")
+        logger.debug(f"{sys.exc_info()[1]:}")
+        logger.info(f"Merge Shards FAILED".center(100, "-"))
+        result = 1
+
+    sys.exit(result)
@@ -0,0 +1,17 @@
+import os
+import pytest
+import sys
+
+# the tests import the lib modules and entry points from the root of the repo,
+# as the entry points themselves do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib.logger import ILogger
+
+
+@pytest.fixture
+def logger() -> ILogger:
+    """
+    It returns a logger which only writes critical records, for the functions which take a logger
+    """
+    return ILogger("test", None, "CRITICAL")
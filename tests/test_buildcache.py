@@ -0,0 +1,67 @@
+import os
+
+from lib.buildcache import (
+    config_hash,
+    generator_files,
+    is_unchanged,
+    load_manifest,
+    save_manifest,
+    update_manifest,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_generator_files_include_entry_point():
+    files = generator_files()
+
+    assert os.path.join(ROOT, "buildjobs.py") in files
+    assert os.path.join(ROOT, "lib", "helper.py") in files
+    assert os.path.join(ROOT, "lib", "buildcache.py") in files
+
+
+def test_unchanged_until_output_deleted(logger, tmp_path):
+    output = tmp_path / "dag_a.py"
+    output.write_text("dag")
+    manifest = load_manifest(logger, None)
+    update_manifest(manifest, "cfg_a.json", "hash", [str(output)])
+
+    assert is_unchanged(manifest, "cfg_a.json", "hash")
+    assert not is_unchanged(manifest, "cfg_a.json", "other")
+    assert not is_unchanged(manifest, "cfg_b.json", "hash")
+    assert not is_unchanged(manifest, "cfg_a.json", None)
+
+    output.unlink()
+
+    assert not is_unchanged(manifest, "cfg_a.json", "hash")
+
+
+def test_manifest_round_trip(logger, tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = load_manifest(logger, path)
+    update_manifest(manifest, "./cfg_a.json", "hash", ["b.sql", "a.py"])
+    save_manifest(logger, path, manifest)
+
+    loaded = load_manifest(logger, path)
+
+    assert loaded["configs"] == {
+        "cfg_a.json": {"hash": "hash", "outputs": ["a.py", "b.sql"]}
+    }
+
+
+def test_config_hash_changes_with_inputs(logger, tmp_path):
+    path = tmp_path / "cfg_a.json"
+    path.write_text('{"tasks": []}')
+    config = {"tasks": []}
+
+    first = config_hash(logger, {"dag": "./dags/"}, str(path), config)
+
+    assert (
+        config_hash(logger, {"dag": "./dags/", "workers": 4}, str(path), config)
+        == first
+    )
+    assert config_hash(logger, {"dag": "./other/"}, str(path), config) != first
+
+    path.write_text('{"tasks": [] }')
+
+    assert config_hash(logger, {"dag": "./dags/"}, str(path), config) != first
@@ -0,0 +1,88 @@
+import json
+import os
+import pytest
+import subprocess
+import sys
+
+from benchmarks.synthetic import create_config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OUTPUT_DIRECTORIES = [
+    "dag",
+    "dag_sql",
+    "batch_scr",
+    "batch_sql",
+    "table_def_file",
+    "table_cfg",
+]
+
+
+@pytest.fixture(scope="module")
+def config_directory(tmp_path_factory):
+    """
+    It writes DAG and BATCH configs of TYPE1 and HISTORY tasks, with joins, deltas and dependency
+    chains, for the builds to share
+    """
+    path = tmp_path_factory.mktemp("cfg")
+    configs = [
+        create_config("batch_type1", "BATCH", tasks=3, fields=12, joins=2),
+        create_config("batch_mixed", "BATCH", tasks=4, target_type="MIXED", delta=True),
+        create_config("dag_type1", "DAG", tasks=3, fields=8, joins=1, depth=2),
+        create_config("dag_history", "DAG", tasks=2, target_type="HISTORY"),
+        create_config("dag_mixed", "DAG", tasks=4, target_type="MIXED", delta=True),
+    ]
+    for config in configs:
+        (path / f"cfg_{config['name']}.json").write_text(json.dumps(config, indent=4))
+    return path
+
+
+def build(config_directory, output, *arguments) -> dict:
+    """
+    It runs buildjobs, reproducibly, for the configs into the output directory and returns the content
+    of each file generated, keyed by its path relative to the output directory
+    """
+    parameters = {key: str(output / key) for key in OUTPUT_DIRECTORIES + ["log"]}
+    parameters.update(
+        config=str(config_directory),
+        manifest=str(output / "manifest.json"),
+        debug_level="ERROR",
+        reproducible=True,
+    )
+    for key in OUTPUT_DIRECTORIES + ["log"]:
+        os.makedirs(parameters[key])
+    (output / "parameters.json").write_text(json.dumps(parameters))
+
+    result = subprocess.run(
+        [sys.executable, "buildjobs.py", "--config", str(output / "parameters.json")]
+        + list(arguments),
+        cwd=ROOT,
+        env=dict(os.environ, SOURCE_DATE_EPOCH="1700000000"),
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    files = {}
+    for directory in OUTPUT_DIRECTORIES:
+        for root, _, names in os.walk(output / directory):
+            for name in names:
+                path = os.path.join(root, name)
+                with open(path, "r") as sourcefile:
+                    files[os.path.relpath(path, output)] = sourcefile.read()
+    return files
+
+
+def test_workers_output_same_as_serial(config_directory, tmp_path):
+    serial = build(config_directory, tmp_path / "serial", "--force")
+    parallel = build(
+        config_directory, tmp_path / "parallel", "--force", "--workers", "3"
+    )
+
+    assert len(serial) > 0
+    assert sorted(parallel) == sorted(serial)
+    for path, content in serial.items():
+        # the files name the directories they were generated into
+        assert parallel[path].replace(
+            str(tmp_path / "parallel"), ""
+        ) == content.replace(str(tmp_path / "serial"), ""), path
@@ -0,0 +1,60 @@
+import json
+import os
+import pytest
+
+from lib.baseclasses import ConversionType, converttoobj, todict
+from warnings import catch_warnings, simplefilter
+
+# each case is the config of a conversion type and the todict of the object it
+# was decoded to, or the error raised, by the conversion before the decoders
+# were declared.  the source table of an order field, and of the column of an
+# analytic, is now read from the field so the expected output of those cases is
+# that of the previous conversion of the config with a source table added to
+# the enclosing dictionary
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "decode.json")
+
+with open(FIXTURE_PATH, "r") as sourcefile:
+    CASES = json.loads(sourcefile.read())
+
+
+def convert(config, conversiontype: ConversionType):
+    """
+    It converts the config and returns todict of the object, as JSON would read it, or the type and
+    message of the error raised
+
+    Args:
+      config: the config to convert.
+      conversiontype (ConversionType): The type of object to convert to.
+
+    Returns:
+      todict of the object or a description of the error.
+    """
+    try:
+        with catch_warnings():
+            simplefilter("ignore")
+            return json.loads(
+                json.dumps(todict(converttoobj(config, conversiontype), "class"))
+            )
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+@pytest.mark.parametrize("case", CASES, ids=[c["description"] for c in CASES])
+def test_converttoobj_matches_expected_output(case):
+    assert (
+        convert(case["config"], ConversionType[case["conversion"]]) == case["expected"]
+    )
+
+
+def test_converttoobj_warns_where_list_expected():
+    with pytest.warns(UserWarning):
+        fields = converttoobj({"name": "a"}, ConversionType.SOURCE)
+    assert [f.name for f in fields] == ["a"]
+
+
+def test_converttoobj_does_not_change_config():
+    config = [case["config"] for case in CASES if case["conversion"] == "ANALYTIC"]
+    before = json.dumps(config, sort_keys=True)
+    for c in config:
+        convert(c, ConversionType.ANALYTIC)
+    assert json.dumps(config, sort_keys=True) == before
@@ -0,0 +1,181 @@
+import os
+import pytest
+
+from lib.buildcache import (
+    filter_manifest,
+    load_manifest,
+    merge_manifests,
+    save_manifest,
+    update_manifest,
+)
+from lib.discovery import (
+    discover_configs,
+    in_shard,
+    match_patterns,
+    parse_patterns,
+    parse_shard,
+)
+
+CONFIG_FILES = [
+    "cfg_a.json",
+    "cfg_b.json",
+    "CFG_Upper.JSON",
+    "readme.json",
+    "sales/cfg_sales.json",
+    "sales/draft/cfg_draft.json",
+    "staging/cfg_stage.json",
+    "staging/notes.txt",
+]
+
+
+@pytest.fixture
+def config_directory(tmp_path):
+    """
+    It creates a directory of config files, and other files, in sub-directories
+    """
+    for name in CONFIG_FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+    return tmp_path
+
+
+def relative(paths: list[str], root) -> list[str]:
+    """
+    It returns the paths relative to the root, using / as the separator
+    """
+    return [os.path.relpath(p, root).replace(os.sep, "/") for p in paths]
+
+
+def test_parse_patterns():
+    assert parse_patterns(None) == []
+    assert parse_patterns("") == []
+    assert parse_patterns("cfg_*.json, sales/*,") == ["cfg_*.json", "sales/*"]
+    assert parse_patterns(["a", " b ", ""]) == ["a", "b"]
+
+
+def test_match_patterns_name_and_path():
+    assert match_patterns("sales/cfg_sales.json", ["cfg_*.json"])
+    assert match_patterns("sales/cfg_sales.json", ["sales/*"])
+    assert not match_patterns("staging/cfg_stage.json", ["sales/*"])
+    assert match_patterns("CFG_Upper.JSON", ["cfg_*.json"])
+    assert not match_patterns("readme.json", ["cfg_*.json"])
+
+
+def test_discover_default_include(logger, config_directory):
+    configs = discover_configs(logger, str(config_directory))
+
+    assert relative(configs, config_directory) == [
+        "CFG_Upper.JSON",
+        "cfg_a.json",
+        "cfg_b.json",
+        "sales/cfg_sales.json",
+        "sales/draft/cfg_draft.json",
+        "staging/cfg_stage.json",
+    ]
+
+
+def test_discover_include_and_exclude(logger, config_directory):
+    configs = discover_configs(
+        logger, str(config_directory), "sales/*,*.txt", "sales/draft/*"
+    )
+
+    assert relative(configs, config_directory) == [
+        "sales/cfg_sales.json",
+        "staging/notes.txt",
+    ]
+
+
+def test_discover_not_recursive(logger, config_directory):
+    configs = discover_configs(logger, str(config_directory), recursive=False)
+
+    assert relative(configs, config_directory) == [
+        "CFG_Upper.JSON",
+        "cfg_a.json",
+        "cfg_b.json",
+    ]
+
+
+def test_discover_file_and_missing_path(logger, config_directory):
+    path = str(config_directory / "readme.json")
+
+    assert discover_configs(logger, path) == [path]
+    assert discover_configs(logger, str(config_directory / "missing.json")) == []
+
+
+@pytest.mark.parametrize("value", ["1", "0/2", "3/2", "a/b", "1/0"])
+def test_parse_shard_invalid(value):
+    with pytest.raises(ValueError):
+        parse_shard(value)
+
+
+def test_parse_shard():
+    assert parse_shard(None) is None
+    assert parse_shard("2/4") == (2, 4)
+
+
+def test_shards_partition_configs(logger, config_directory):
+    configs = discover_configs(logger, str(config_directory))
+    shards = [
+        [p for p in configs if in_shard(p, str(config_directory), (i, 3))]
+        for i in range(1, 4)
+    ]
+
+    # every config is in exactly one shard
+    assert sorted(p for shard in shards for p in shard) == configs
+    assert all(in_shard(p, str(config_directory), None) for p in configs)
+
+
+def test_shard_independent_of_location_and_other_configs(
+    logger, config_directory, tmp_path_factory
+):
+    configs = discover_configs(logger, str(config_directory))
+    expected = [in_shard(p, str(config_directory), (1, 2)) for p in configs]
+
+    # the same configs in another directory, with another config added, are
+    # assigned to the same shards
+    other = tmp_path_factory.mktemp("other")
+    for name in CONFIG_FILES + ["cfg_new.json"]:
+        path = other / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+    moved = [
+        in_shard(str(other / os.path.relpath(p, config_directory)), str(other), (1, 2))
+        for p in configs
+    ]
+
+    assert moved == expected
+
+
+def test_filter_manifest(logger):
+    manifest = load_manifest(logger, None)
+    for name in ["a", "b", "c"]:
+        update_manifest(manifest, f"./cfg/cfg_{name}.json", name, [f"./dag/{name}.py"])
+
+    filtered = filter_manifest(manifest, ["cfg/cfg_a.json", "./cfg/cfg_c.json"])
+
+    assert sorted(filtered["configs"]) == [
+        os.path.normpath("cfg/cfg_a.json"),
+        os.path.normpath("cfg/cfg_c.json"),
+    ]
+    assert filtered["manifest_version"] == manifest["manifest_version"]
+    assert len(manifest["configs"]) == 3
+
+
+def test_merge_manifests(logger, tmp_path):
+    paths = []
+    for i, names in enumerate([["a", "b"], ["b", "c"]]):
+        manifest = load_manifest(logger, None)
+        for name in names:
+            update_manifest(manifest, f"cfg_{name}.json", f"{name}{i}")
+        paths.append(str(tmp_path / f"manifest_{i}.json"))
+        save_manifest(logger, paths[-1], manifest)
+
+    merged = merge_manifests(logger, paths + [str(tmp_path / "missing.json")])
+
+    # where a config is in more than one manifest the last is used
+    assert {path: entry["hash"] for path, entry in merged["configs"].items()} == {
+        "cfg_a.json": "a0",
+        "cfg_b.json": "b1",
+        "cfg_c.json": "c1",
+    }
@@ -0,0 +1,129 @@
+import json
+import os
+import pytest
+import subprocess
+
+from lib.gitchanges import get_changed_configs, get_changed_files
+
+
+def git(repo, *arguments) -> str:
+    """
+    It runs a git command in the repository and returns its output
+    """
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        + list(arguments),
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """
+    It creates a git repository of three configs, the schema object of one and a shared input, with
+    one commit
+    """
+    (tmp_path / "job").mkdir()
+    (tmp_path / "schema").mkdir()
+    (tmp_path / "schema" / "b.json").write_text("[]")
+    (tmp_path / "shared.txt").write_text("shared")
+    for name, schema in [("a", None), ("b", "schema/b.json"), ("c", None)]:
+        parameters = {"schema_object": str(tmp_path / schema)} if schema else {}
+        (tmp_path / "job" / f"cfg_{name}.json").write_text(
+            json.dumps({"tasks": [{"parameters": parameters}]})
+        )
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+    return tmp_path
+
+
+def schema_inputs(config: dict) -> list[str]:
+    """
+    It returns the schema objects of the tasks of a config
+    """
+    return [
+        t["parameters"]["schema_object"]
+        for t in config.get("tasks", [])
+        if t.get("parameters", {}).get("schema_object")
+    ]
+
+
+def read_configs(repo) -> dict:
+    """
+    It reads the configs of the repository, keyed by path
+    """
+    configs = {}
+    for name in sorted(os.listdir(repo / "job")):
+        path = str(repo / "job" / name)
+        with open(path, "r") as sourcefile:
+            configs[path] = json.loads(sourcefile.read())
+    return configs
+
+
+def select(logger, repo, ref="HEAD") -> list[str]:
+    """
+    It returns the names of the configs selected as changed since ref
+    """
+    configs = read_configs(repo)
+    selected = get_changed_configs(
+        logger,
+        ref,
+        configs,
+        [str(repo / "shared.txt")],
+        schema_inputs,
+        str(repo / "job"),
+    )
+    return [os.path.basename(p) for p in selected]
+
+
+def test_nothing_changed(logger, repo):
+    assert select(logger, repo) == []
+
+
+def test_changed_and_untracked_configs(logger, repo):
+    (repo / "job" / "cfg_a.json").write_text('{"tasks": []}')
+    (repo / "job" / "cfg_d.json").write_text('{"tasks": []}')
+
+    assert select(logger, repo) == ["cfg_a.json", "cfg_d.json"]
+
+
+def test_committed_change_since_ref(logger, repo):
+    (repo / "job" / "cfg_c.json").write_text('{"tasks": []}')
+    git(repo, "commit", "-q", "-am", "change c")
+
+    assert select(logger, repo) == []
+    assert select(logger, repo, "HEAD~1") == ["cfg_c.json"]
+
+
+def test_changed_schema_object(logger, repo):
+    (repo / "schema" / "b.json").write_text('[{"name": "id"}]')
+
+    assert select(logger, repo) == ["cfg_b.json"]
+
+
+def test_changed_shared_input_selects_all(logger, repo):
+    (repo / "shared.txt").write_text("changed")
+
+    assert select(logger, repo) == ["cfg_a.json", "cfg_b.json", "cfg_c.json"]
+
+
+def test_deleted_and_ignored_files(logger, repo):
+    (repo / ".gitignore").write_text("*.tmp\n")
+    git(repo, "add", ".gitignore")
+    git(repo, "commit", "-q", "-m", "ignore")
+    (repo / "job" / "cfg_c.json").unlink()
+    (repo / "job" / "cfg_e.json.tmp").write_text("{}")
+
+    changed = get_changed_files(logger, "HEAD", str(repo))
+
+    assert os.path.normcase(os.path.realpath(repo / "job" / "cfg_c.json")) in changed
+    assert not any(p.endswith(".tmp") for p in changed)
+
+
+def test_unknown_ref(logger, repo):
+    with pytest.raises(ValueError):
+        select(logger, repo, "missing")
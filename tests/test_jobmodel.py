@@ -0,0 +1,55 @@
+import copy
+import pytest
+
+from benchmarks.synthetic import create_config
+from lib.jobmodel import create_job
+
+CONFIG = create_config("job", "DAG", tasks=2, fields=4, joins=1, target_type="MIXED")
+
+
+def test_job_does_not_change_config():
+    config = copy.deepcopy(CONFIG)
+    job = create_job(config)
+
+    task = job.tasks[0].to_task()
+    task.parameters["source_to_target"].append({"name": "added"})
+    task.parameters["joins"][0]["on"].clear()
+
+    assert config == CONFIG
+
+
+def test_nested_parameters_read_only():
+    job = create_job(copy.deepcopy(CONFIG))
+    parameters = job.tasks[0].parameters
+
+    with pytest.raises(TypeError):
+        parameters["source_to_target"][0]["name"] = "changed"
+    with pytest.raises(AttributeError):
+        parameters["joins"].append({})
+
+
+def test_to_task_copies_nested_parameters():
+    job_task = create_job(copy.deepcopy(CONFIG)).tasks[0]
+
+    first = job_task.to_task()
+    first.parameters["source_to_target"].pop()
+    first.parameters["joins"][0]["on"].clear()
+    second = job_task.to_task()
+
+    assert (
+        len(second.parameters["source_to_target"])
+        == len(first.parameters["source_to_target"]) + 1
+    )
+    assert second.parameters["joins"][0]["on"]
+
+
+def test_sql_task_copy_for_each_builder():
+    job_task = create_job(copy.deepcopy(CONFIG)).tasks[0]
+
+    first = job_task.sql_task
+    first.parameters.source_to_target.clear()
+    second = job_task.sql_task
+
+    assert first is not second
+    assert len(second.parameters.source_to_target) == len(job_task.source_to_target)
+    assert len(job_task.source_to_target) > 0
@@ -0,0 +1,191 @@
+import json
+import pytest
+
+from lib import logger as log
+from lib.logger import ILogger, LazyMessage
+
+
+@pytest.fixture(autouse=True)
+def log_handlers():
+    """
+    It gives each test its own handlers and log context, the handlers created by the test are closed
+    when it ends
+    """
+    handlers = dict(log.LOG_HANDLERS)
+    context = dict(log.LOG_CONTEXT, stages=list(log.LOG_CONTEXT["stages"]))
+    log.LOG_HANDLERS.update(pid=None, streams={}, files={}, listeners={})
+    yield
+    log.stop_log_listeners()
+    for handler in log.LOG_HANDLERS["files"].values():
+        handler.close()
+    log.LOG_HANDLERS.update(handlers)
+    log.LOG_CONTEXT.update(context)
+
+
+def read_log(path) -> list[str]:
+    """
+    It returns the lines of a log file, the handlers are flushed first
+    """
+    for handler in log.LOG_HANDLERS["files"].values():
+        handler.flush()
+    return path.read_text().splitlines()
+
+
+def test_lazy_message_not_built_below_level(tmp_path):
+    calls = []
+
+    def build(message):
+        calls.append(message)
+        return message.upper()
+
+    logger = ILogger("test", str(tmp_path / "test.log"), "WARNING")
+    logger.info(LazyMessage(build, "skipped"))
+    logger.debug(log.lazy_format_message("skipped"))
+
+    assert calls == []
+    assert read_log(tmp_path / "test.log") == []
+
+    logger.warning(LazyMessage(build, "written"))
+
+    # the message is built by each handler which formats the record
+    assert set(calls) == {"written"}
+    lines = read_log(tmp_path / "test.log")
+    assert len(lines) == 1
+    assert lines[0].endswith(" - WRITTEN")
+
+
+def test_banners_skipped_below_level(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "WARNING")
+
+    def build():
+        logger.started()
+        logger.completed()
+
+    build()
+
+    assert read_log(tmp_path / "test.log") == []
+    assert log.LOG_CONTEXT["stages"] == []
+
+
+def test_banners_attributed_to_caller(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "INFO")
+
+    def build():
+        logger.started()
+        logger.completed()
+
+    build()
+
+    lines = read_log(tmp_path / "test.log")
+    assert len(lines) == 2
+    assert "build:" in lines[0] and lines[0].endswith(log.STARTED_BANNER)
+    assert "build:" in lines[1] and lines[1].endswith(log.COMPLETED_BANNER)
+
+
+def test_loggers_of_a_file_share_handlers(tmp_path):
+    first = ILogger("first", str(tmp_path / "test.log"), "INFO")
+    second = ILogger("second", str(tmp_path / "test.log"), "INFO")
+    again = ILogger("first", str(tmp_path / "test.log"), "INFO")
+    other = ILogger("other", str(tmp_path / "other.log"), "INFO")
+
+    assert first.handlers == second.handlers == again.handlers
+    assert other.handlers[0] is not first.handlers[0]
+    assert other.handlers[1] is first.handlers[1]
+
+    first.info("one")
+    second.info("two")
+
+    # each record is written once, however many loggers share the file
+    lines = read_log(tmp_path / "test.log")
+    assert [line.rsplit(" - ", 1)[1] for line in lines] == ["one", "two"]
+
+
+def test_handlers_created_again_in_new_process(tmp_path, monkeypatch):
+    first = ILogger("test", str(tmp_path / "test.log"), "INFO")
+    handlers = list(first.handlers)
+
+    # a worker process forked from this one has a new pid and must not use the
+    # handlers, or the file objects, of its parent
+    monkeypatch.setattr(log.os, "getpid", lambda: -1)
+    child = ILogger("test", str(tmp_path / "test.log"), "INFO")
+
+    assert log.LOG_HANDLERS["pid"] == -1
+    assert all(h not in handlers for h in child.handlers)
+
+
+def test_queued_logger_writes_records_in_order(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "INFO", queued=True)
+    queued = ILogger("other", str(tmp_path / "test.log"), "INFO", queued=True)
+
+    assert logger.handlers == queued.handlers
+
+    for i in range(250):
+        logger.info(f"record {i}")
+
+    log.stop_log_listeners()
+
+    lines = read_log(tmp_path / "test.log")
+    assert [line.rsplit(" - ", 1)[1] for line in lines] == [
+        f"record {i}" for i in range(250)
+    ]
+
+
+def test_json_lines_fields(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "INFO", log_format="json")
+
+    def build():
+        logger.started()
+        logger.info("building")
+        logger.completed()
+
+    with log.log_context(config="cfg_test.json", task_id="load"):
+        build()
+    logger.info("done")
+
+    entries = [json.loads(line) for line in read_log(tmp_path / "test.log")]
+    assert [e["message"] for e in entries] == [
+        log.STARTED_BANNER,
+        "building",
+        log.COMPLETED_BANNER,
+        "done",
+    ]
+    for entry in entries[:3]:
+        assert entry["config"] == "cfg_test.json"
+        assert entry["task_id"] == "load"
+        assert entry["stage"] == "build"
+        assert entry["function"] == "build"
+        assert entry["level"] == "INFO"
+        assert entry["logger"] == "test"
+    assert entries[0]["elapsed"] is None
+    assert entries[1]["elapsed"] is None
+    assert isinstance(entries[2]["elapsed"], float) and entries[2]["elapsed"] >= 0
+    assert entries[3]["config"] is None
+    assert entries[3]["task_id"] is None
+    assert entries[3]["stage"] is None
+
+
+def test_json_lines_wrapped_message_on_one_line(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "INFO", log_format="json")
+
+    logger.info(log.format_message("word " * 100))
+
+    lines = read_log(tmp_path / "test.log")
+    assert len(lines) == 1
+    assert json.loads(lines[0])["message"] == ("word " * 100).strip()
+
+
+def test_stage_of_raising_function_removed_by_log_context(tmp_path):
+    logger = ILogger("test", str(tmp_path / "test.log"), "INFO", log_format="json")
+
+    def build():
+        logger.started()
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        with log.log_context(config="cfg_test.json"):
+            build()
+    logger.info("after")
+
+    entries = [json.loads(line) for line in read_log(tmp_path / "test.log")]
+    assert entries[-1]["stage"] is None
+    assert log.LOG_CONTEXT["stages"] == []
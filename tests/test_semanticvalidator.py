@@ -0,0 +1,149 @@
+import copy
+import json
+import os
+import pytest
+
+from lib.dependencyindex import create_dependency_index
+from lib.semanticvalidator import validate_semantics
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "configs")
+
+# a config which passes every rule, each test breaks one of them
+CONFIG = {
+    "name": "sales",
+    "type": "DAG",
+    "properties": {"dataset_source": "src", "dataset_publish": "pub"},
+    "tasks": [
+        {
+            "task_id": "load",
+            "operator": "LOADFROMGCS",
+            "dependencies": ["upstream.publish"],
+            "parameters": {"destination_table": "ld_sales"},
+        },
+        {
+            "task_id": "transform",
+            "operator": "CREATETABLE",
+            "dependencies": ["load", "external.task"],
+            "parameters": {
+                "destination_table": "sales",
+                "driving_table": "src.sales",
+                "source_tables": {
+                    "c": {"dataset_name": "src", "table_name": "customer", "alias": "c"}
+                },
+                "source_to_target": [
+                    {"name": "id", "source_column": "id"},
+                    {
+                        "name": "customer",
+                        "source_column": "name",
+                        "source_table": {"alias": "c"},
+                    },
+                    {"name": "region", "source_column": "region"},
+                ],
+                "joins": [
+                    {
+                        "right": {"table_name": "customer", "alias": "c"},
+                        "on": [{"fields": ["src.customer_id", "c.id"]}],
+                    },
+                    {
+                        "right": "src.region",
+                        "on": [{"fields": ["src.region_id", "region.id"]}],
+                    },
+                ],
+                "where": [{"fields": ["c.active", "true"]}, {"fields": ["1", "1"]}],
+                "history": {"driving_column": [{"name": "customer"}]},
+            },
+        },
+    ],
+}
+
+UPSTREAM = {
+    "name": "upstream",
+    "type": "DAG",
+    "tasks": [{"task_id": "publish", "operator": "CREATETABLE", "parameters": {}}],
+}
+
+
+def validate(logger, config: dict) -> list[tuple]:
+    """
+    It validates the config against an index of the config and the upstream config, returning the rule
+    and location of each error
+    """
+    index = create_dependency_index(
+        logger, {"cfg_sales.json": config, "cfg_upstream.json": UPSTREAM}
+    )
+    return [
+        (e["rule"], e["location"]) for e in validate_semantics(logger, config, index)
+    ]
+
+
+@pytest.fixture
+def config() -> dict:
+    return copy.deepcopy(CONFIG)
+
+
+def test_valid_config(logger, config):
+    assert validate(logger, config) == []
+
+
+def test_regression_configs_valid(logger):
+    for name in sorted(os.listdir(FIXTURE_PATH)):
+        with open(os.path.join(FIXTURE_PATH, name), "r") as sourcefile:
+            config = json.loads(sourcefile.read())
+        assert validate(logger, config) == [], name
+
+
+def test_duplicate_task_id(logger, config):
+    config["tasks"][1]["task_id"] = "load"
+    config["tasks"][1]["dependencies"] = []
+
+    assert validate(logger, config) == [("duplicate_task_id", "data.tasks[1].task_id")]
+
+
+def test_unknown_dependency(logger, config):
+    config["tasks"][1]["dependencies"] = ["missing", "upstream.missing"]
+
+    assert validate(logger, config) == [
+        ("unknown_dependency", "data.tasks[1].dependencies[0]"),
+        ("unknown_dependency", "data.tasks[1].dependencies[1]"),
+    ]
+
+
+def test_unknown_alias(logger, config):
+    parameters = config["tasks"][1]["parameters"]
+    parameters["joins"][0]["on"][0]["fields"][1] = "x.id"
+    parameters["where"][0]["fields"][0] = "y.active"
+    parameters["source_to_target"][1]["source_table"]["alias"] = "z"
+
+    assert validate(logger, config) == [
+        ("unknown_alias", "data.tasks[1].parameters.joins[0].on[0].fields[1]"),
+        ("unknown_alias", "data.tasks[1].parameters.where[0].fields[0]"),
+        (
+            "unknown_alias",
+            "data.tasks[1].parameters.source_to_target[1].source_table.alias",
+        ),
+    ]
+
+
+def test_missing_schema_object(logger, config, tmp_path):
+    schema_object = tmp_path / "ld_sales.json"
+    config["tasks"][0]["parameters"]["schema_object"] = str(schema_object)
+
+    assert validate(logger, config) == [
+        ("missing_schema_object", "data.tasks[0].parameters.schema_object")
+    ]
+
+    schema_object.write_text("[]")
+
+    assert validate(logger, config) == []
+
+
+def test_missing_driving_column(logger, config):
+    history = config["tasks"][1]["parameters"]["history"]
+    history["driving_column"].append({"name": "missing"})
+
+    assert validate(logger, config) == [
+        (
+            "missing_driving_column",
+            "data.tasks[1].parameters.history.driving_column[1]",
+        )
+    ]
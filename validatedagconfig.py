@@ -2,11 +2,47 @@ import argparse
 import os
 import re
 import sys
+import time
 import traceback
 
 from datetime import datetime
-from lib.jsonhelper import IJSONValidate, get_json
+from lib.dependencyindex import create_dependency_index, get_dependents
+from lib.discovery import discover_configs, in_shard, parse_shard
+from lib.gitchanges import get_changed_configs
+from lib.jsonhelper import (
+    IJSONValidate,
+    get_json,
+    get_validator,
+    set_validator_cache,
+)
 from lib.logger import format_message, ILogger
+from lib.semanticvalidator import validate_semantics
+from lib.timing import (
+    add_timings,
+    enable_timings,
+    get_timings,
+    profile,
+    reset_timings,
+    stage,
+    write_timings,
+)
+from lib.validationreport import (
+    create_validation_error,
+    write_json_report,
+    write_junit_report,
+)
+
+SCHEMA_FILES = {
+    "schema_cfg_job": "./bq_application/job/schema_cfg_job.json",
+    "schema_cfg_batch_properties": "./bq_application/job/schema_cfg_batch_properties.json",
+    "schema_cfg_createtable_task": "./bq_application/job/schema_cfg_createtable_task.json",
+}
+
+# the schema each task is validated against by operator, tasks of any other
+# operator are not validated
+TASK_SCHEMAS = {
+    "CREATETABLE": "schema_cfg_createtable_task",
+}
 
 
 def main(logger: ILogger, args: argparse.Namespace):
@@ -25,91 +61,72 @@ def main(logger: ILogger, args: argparse.Namespace):
     if args.config_directory:
         # create a list of config files using the source directory (args.config_directory)
         dpath = os.path.normpath(args.config_directory)
-        config_list = []
         try:
             logger.info(f"creating config list")
-            for filename in os.listdir(dpath):
-                logger.debug(format_message(f"filename: {filename}"))
-                m = re.search(r"^cfg_.*\.json$", filename, re.IGNORECASE)
-                if m:
-                    p = os.path.normpath(f"{dpath}/{filename}")
-                    config_list.append(p)
+            config_list = discover_configs(logger, dpath, args.include, args.exclude)
         except:
             logger.error(f"{sys.exc_info()[0]:}")
             logger.info(f"Config Validate FAILED")
             return 1
 
     elif args.config_list:
-        config_list = args.config_list.split(",")
+        dpath = "."
+        config_list = [os.path.normpath(c.strip()) for c in args.config_list.split(",")]
     else:
         raise Exception("No file provided to validate.")
 
-    exit_code = 0
+    # every config is read once to index the tasks and dags of all configs,
+    # the configs validated may only be those changed or in the shard
+    configs = {}
+    for path in config_list:
+        with stage("json_load", config=path):
+            configs[path] = get_json(logger, path)
+    with stage("dependency_index"):
+        index = create_dependency_index(logger, configs)
 
-    for c in config_list:
-        cpath = c.strip()
-        logger.info(format_message(f"validating file: {cpath}"))
-        config = get_json(logger, cpath)
-        if not config:
-            return 1
+    if args.changed_since:
+        config_list = select_changed_configs(
+            logger, args.changed_since, config_list, configs, index, dpath
+        )
 
-        schema = get_json(logger, "./bq_application/job/schema_cfg_job.json")
-        if not schema:
-            return 1
+    shard = parse_shard(args.shard)
+    if shard:
+        shard_list = [c for c in config_list if in_shard(c, dpath, shard)]
+        logger.info(
+            f"shard {shard[0]}/{shard[1]}: {len(shard_list)} of {len(config_list)} config(s)"
+        )
+        config_list = shard_list
 
-        logger.info(f"validate schema object")
-        result = IJSONValidate(logger, schema, config)
-        if not result:
-            exit_code = 1
+    set_validator_cache(args.validator_cache)
+    schemas = load_schemas(logger)
+    if not schemas.get("schema_cfg_job"):
+        return 1
 
-        if result and "properties" in config.keys():
-            logger.info(f"validate properties object")
-            if config.get("type") == "BATCH":
-                properties_schema = get_json(
-                    logger, "./bq_application/job/schema_cfg_batch_properties.json"
-                )
+    workers = args.workers or 1
+    if workers > 1 and len(config_list) > 1:
+        logger.info(f"validating {len(config_list)} config(s) with {workers} workers")
+        results = validate_parallel(logger, args, config_list, workers, index, configs)
+    else:
+        results = [
+            validate_file(logger, args, c, schemas, index, configs.get(c))
+            for c in config_list
+        ]
 
-                if properties_schema:
-                    logger.debug(f"validating properties: {config.get('type')}")
-                    properties_check_result = IJSONValidate(
-                        logger, properties_schema, config.get("properties", {})
-                    )
-                    if not properties_check_result:
-                        exit_code = 1
+    if args.timings:
+        write_timings(logger, args.timings, get_timings())
 
-                else:
-                    logger.debug(
-                        f"skipped properties validation ({config.get('type', '<missing job type>')})"
-                    )
+    if args.json_report:
+        write_json_report(logger, args.json_report, results)
 
-        if result and "tasks" in config.keys():
-            logger.info(f"validate task object(s)")
-            for t in config["tasks"]:
-                task_schema = None
-                if t["operator"] == "CREATETABLE":
-                    task_schema = get_json(
-                        logger, "./bq_application/job/schema_cfg_createtable_task.json"
-                    )
+    if args.junit_report:
+        write_junit_report(logger, args.junit_report, results)
 
-                if task_schema:
-                    logger.debug(f"validating task: {t['task_id']}")
-                    task_check_result = IJSONValidate(logger, task_schema, t)
-                    if not task_check_result:
-                        exit_code = 1
-                else:
-                    logger.debug(
-                        format_message(
-                            f"skipped task: {t['task_id'] if 'task_id' in t.keys() else '<missing task id>'} ({t['operator'] if 'operator' in t.keys() else '<missing task operator>'})"
-                        )
-                    )
-        else:
-            logger.info(f"task validation skipped")
-            skip_reason = (
-                "No tasks to validate."
-                if result
-                else f"Object schema validation failed"
-            )
-            logger.debug(f"task validation skipped: {skip_reason}")
+    exit_code = 0
+    for result in results:
+        if result["status"] == "error":
+            logger.error(format_message(f"{result['path']} could not be read"))
+        if result["status"] != "passed":
+            exit_code = 1
 
     if exit_code != 0:
         logger.error(
@@ -120,6 +137,377 @@ def main(logger: ILogger, args: argparse.Namespace):
     return exit_code
 
 
+def select_changed_configs(
+    logger: ILogger,
+    ref: str,
+    config_list: list[str],
+    configs: dict,
+    index: dict,
+    dpath: str = ".",
+) -> list[str]:
+    """
+    This function selects the configs changed in git since ref and the configs which depend on them,
+    where a schema or the validator has changed every config is selected
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      ref (str): the git reference to compare with, i.e. origin/main
+      config_list (list[str]): the paths of the config files.
+      configs (dict): a dictionary of config path to config content.
+      index (dict): the dependency index of the configs.
+      dpath (str): the config directory, the changes are read from its git repository.
+
+    Returns:
+      The paths of the selected config files, in the order of config_list.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    shared_inputs = list(SCHEMA_FILES.values()) + [
+        os.path.join(root, "validatedagconfig.py"),
+        os.path.join(root, "lib", "jsonhelper.py"),
+    ]
+    changed = get_changed_configs(logger, ref, configs, shared_inputs, path=dpath)
+
+    selected = get_dependents(index, changed)
+    logger.info(
+        f"{len(selected)} of {len(config_list)} config(s) changed since {ref} or depend on a changed config"
+    )
+    return [path for path in config_list if path in selected]
+
+
+def load_schemas(logger: ILogger) -> dict:
+    """
+    This function reads each of the schemas once, so they are not read again for every config and task
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+
+    Returns:
+      A dictionary of schema name to schema, None where the schema could not be read.
+    """
+    schemas = {}
+    for name, path in SCHEMA_FILES.items():
+        with stage("json_load", schema=name):
+            schemas[name] = get_json(logger, path)
+    return schemas
+
+
+def validate_file(
+    logger: ILogger,
+    args: argparse.Namespace,
+    cpath: str,
+    schemas: dict,
+    index: dict = None,
+    config: dict = None,
+) -> dict:
+    """
+    This function validates a single config file and times it, where requested the validation is
+    profiled
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      args (argparse.Namespace): argparse.Namespace
+      cpath (str): the path of the config file.
+      schemas (dict): the schemas returned by load_schemas.
+      index (dict): the dependency index of all configs, where supplied the references of the config
+    are validated.
+      config (dict): the content of the config file, where not supplied it is read from cpath.
+
+    Returns:
+      A dictionary of the path, status (passed, failed or error), time in seconds and errors.
+    """
+    profile_file = (
+        os.path.join(
+            args.timings,
+            "profile",
+            f"{os.path.splitext(os.path.basename(cpath))[0]}.prof",
+        )
+        if args.profile and args.timings
+        else None
+    )
+
+    errors = []
+    start = time.perf_counter()
+    with profile(profile_file), stage("config", config=cpath):
+        result = validate_config(logger, cpath, schemas, errors, index, config)
+
+    return {
+        "path": cpath,
+        "status": "error" if result is None else "passed" if result else "failed",
+        "time": time.perf_counter() - start,
+        "errors": errors,
+    }
+
+
+def validate_config(
+    logger: ILogger,
+    cpath: str,
+    schemas: dict,
+    errors: list = None,
+    index: dict = None,
+    config: dict = None,
+) -> bool:
+    """
+    This function validates a single config file, its properties and its tasks against their schemas.
+    Where the config matches the job schema and an index is supplied the references between its tasks,
+    to the tasks of other configs, to schema files and to its fields are then validated
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      cpath (str): the path of the config file.
+      schemas (dict): the schemas returned by load_schemas.
+      errors (list): where supplied the errors found are appended to it.
+      index (dict): the dependency index of all configs.
+      config (dict): the content of the config file, where not supplied it is read from cpath.
+
+    Returns:
+      True where the config is valid, False where it is not and None where the config or schema could
+      not be read.
+    """
+    errors = errors if errors is not None else []
+
+    logger.info(format_message(f"validating file: {cpath}"))
+    if config is None:
+        with stage("json_load"):
+            config = get_json(logger, cpath)
+    if not config:
+        errors.append(create_validation_error("file could not be read as JSON"))
+        return None
+
+    schema = schemas.get("schema_cfg_job")
+    if not schema:
+        errors.append(create_validation_error("schema could not be read"))
+        return None
+
+    valid = True
+
+    logger.info(f"validate schema object")
+    result = validate_object(logger, "schema_cfg_job", schema, config, errors)
+    if not result:
+        valid = False
+
+    if result and "properties" in config.keys():
+        logger.info(f"validate properties object")
+        if config.get("type") == "BATCH":
+            properties_schema = schemas.get("schema_cfg_batch_properties")
+
+            if properties_schema:
+                logger.debug(f"validating properties: {config.get('type')}")
+                properties_check_result = validate_object(
+                    logger,
+                    "schema_cfg_batch_properties",
+                    properties_schema,
+                    config.get("properties", {}),
+                    errors,
+                    "data.properties",
+                )
+                if not properties_check_result:
+                    valid = False
+
+            else:
+                logger.debug(
+                    f"skipped properties validation ({config.get('type', '<missing job type>')})"
+                )
+
+    if result and "tasks" in config.keys():
+        logger.info(f"validate task object(s)")
+        for i, t in enumerate(config["tasks"]):
+            schema_name = TASK_SCHEMAS.get(t["operator"])
+            task_schema = schemas.get(schema_name) if schema_name else None
+
+            if task_schema:
+                logger.debug(f"validating task: {t['task_id']}")
+                task_check_result = validate_object(
+                    logger,
+                    schema_name,
+                    task_schema,
+                    t,
+                    errors,
+                    f"data.tasks[{i}]",
+                    t.get("task_id"),
+                )
+                if not task_check_result:
+                    valid = False
+            else:
+                logger.debug(
+                    format_message(
+                        f"skipped task: {t['task_id'] if 'task_id' in t.keys() else '<missing task id>'} ({t['operator'] if 'operator' in t.keys() else '<missing task operator>'})"
+                    )
+                )
+    else:
+        logger.info(f"task validation skipped")
+        skip_reason = (
+            "No tasks to validate." if result else f"Object schema validation failed"
+        )
+        logger.debug(f"task validation skipped: {skip_reason}")
+
+    if index is not None and cpath in index["errors"]:
+        errors.append(
+            create_validation_error(
+                f"config could not be indexed: {index['errors'][cpath]}",
+                rule="dependency_index",
+            )
+        )
+        valid = False
+
+    elif result and index is not None:
+        logger.info(f"validate references")
+        with stage("semantic_validation"):
+            semantic_errors = validate_semantics(logger, config, index)
+        for e in semantic_errors:
+            logger.error(format_message(f"{e['location']}: {e['message']}"))
+        errors.extend(semantic_errors)
+        if semantic_errors:
+            valid = False
+
+    return valid
+
+
+def validate_object(
+    logger: ILogger,
+    name: str,
+    schema: dict,
+    object: dict,
+    errors: list,
+    location: str = "data",
+    task_id: str = None,
+) -> bool:
+    """
+    This function validates an object of the config against a schema, any error found is appended to
+    errors with its location in the config
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      name (str): the name of the schema.
+      schema (dict): the schema.
+      object (dict): the object of the config to validate.
+      errors (list): the errors found in the config.
+      location (str): the location of the object in the config. Defaults to data, the whole config
+      task_id (str): the task_id where the object is a task.
+
+    Returns:
+      True where the object is valid.
+    """
+    schema_errors = []
+    with stage("schema_validation", schema=name, task=task_id):
+        result = IJSONValidate(logger, schema, object, schema_errors)
+
+    for e in schema_errors:
+        errors.append(
+            create_validation_error(
+                re.sub(r"^data", location, e["message"]),
+                re.sub(r"^data", location, e["location"] or "data"),
+                name,
+                task_id,
+                e["rule"],
+            )
+        )
+    return result
+
+
+def validate_parallel(
+    logger: ILogger,
+    args: argparse.Namespace,
+    config_list: list[str],
+    workers: int,
+    index: dict = None,
+    configs: dict = None,
+) -> list[dict]:
+    """
+    This function validates each config in its own task in a pool of worker processes, each worker
+    reads the schemas once.  Results are returned in the order of config_list
+
+    Args:
+      logger (ILogger): ILogger - this is the logger object that is passed to the function.
+      args (argparse.Namespace): argparse.Namespace
+      config_list (list[str]): the paths of the config files to validate.
+      workers (int): the maximum number of worker processes.
+      index (dict): the dependency index of all configs, passed to each worker once.
+      configs (dict): a dictionary of config path to config content, each config is passed with its
+    path so the worker does not read it again.
+
+    Returns:
+      A list of the result of each config.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # workers log to a queue which is written to the log by this process
+    with logger.worker_queue() as log_queue, ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(logger.name, logger.level, log_queue, args, index),
+    ) as executor:
+        results = list(
+            executor.map(
+                validate_file_worker,
+                config_list,
+                [(configs or {}).get(c) for c in config_list],
+                chunksize=4,
+            )
+        )
+
+    # add the stage timings from each worker to those of this process
+    for _, spans in results:
+        add_timings(spans)
+
+    return [result for result, _ in results]
+
+
+# each worker process creates its own logger and reads the schemas when the
+# pool starts
+WORKER = {"logger": None, "args": None, "schemas": None, "index": None}
+
+
+def init_worker(
+    name: str, level: int, log_queue, args: argparse.Namespace, index: dict = None
+) -> None:
+    """
+    It creates the logger used by a worker process and reads the schemas.
+
+    Args:
+      name (str): the name of the logger
+      level (int): the log level
+      log_queue: the queue the records of the worker are written to the log from
+      args (argparse.Namespace): argparse.Namespace
+      index (dict): the dependency index of all configs
+    """
+    WORKER["logger"] = ILogger(name, level=level, log_queue=log_queue)
+    WORKER["args"] = args
+    WORKER["index"] = index
+    enable_timings(bool(args.timings))
+    set_validator_cache(args.validator_cache)
+    WORKER["schemas"] = load_schemas(WORKER["logger"])
+
+    # compile the validators before the first config so its time is only
+    # the time to validate it
+    for schema in WORKER["schemas"].values():
+        if schema:
+            get_validator(schema)
+
+
+def validate_file_worker(cpath: str, config: dict = None) -> tuple:
+    """
+    It validates a single config inside a worker process.
+
+    Args:
+      cpath (str): the path of the config file.
+      config (dict): the content of the config file, where not supplied it is read from cpath.
+
+    Returns:
+      A tuple of the result of the config and the stage timings.
+    """
+    reset_timings()
+    result = validate_file(
+        WORKER["logger"],
+        WORKER["args"],
+        cpath,
+        WORKER["schemas"],
+        WORKER["index"],
+        config,
+    )
+    return (result, get_timings())
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -135,6 +523,34 @@ if __name__ == "__main__":
         dest="config_list",
         help="A list of paths to files to be validated.",
     )
+    parser.add_argument(
+        "--include",
+        required=False,
+        dest="include",
+        default=None,
+        help="A comma separated list of glob patterns of the config files to validate (default: cfg_*.json).",
+    )
+    parser.add_argument(
+        "--exclude",
+        required=False,
+        dest="exclude",
+        default=None,
+        help="A comma separated list of glob patterns of the config files not to validate.",
+    )
+    parser.add_argument(
+        "--shard",
+        required=False,
+        dest="shard",
+        default=None,
+        help="Specify the shard of the configs to validate as i/N, i.e. 1/4, so validation can be split across runners.",
+    )
+    parser.add_argument(
+        "--changed_since",
+        required=False,
+        dest="changed_since",
+        default=None,
+        help="Specify a git reference, i.e. origin/main, to validate only the configs changed since it and the configs which depend on them.",
+    )
     parser.add_argument(
         "--log_level",
         required=False,
@@ -149,8 +565,70 @@ if __name__ == "__main__":
         default=None,
         help="Specify the desired output directory for logs.  No dir means no log file will be output.",
     )
+    parser.add_argument(
+        "--log_queue",
+        required=False,
+        action="store_true",
+        dest="log_queue",
+        help="Write log records from a background thread, in batches, so validation does not wait on the terminal or log file.",
+    )
+    parser.add_argument(
+        "--log_format",
+        required=False,
+        choices=["text", "json"],
+        dest="log_format",
+        default="text",
+        help="Specify the format of the log, text or json; json writes each record as a line of JSON with the config, task, stage and elapsed time (default: text).",
+    )
+
+    parser.add_argument(
+        "--timings",
+        required=False,
+        dest="timings",
+        default=None,
+        help="Specify a directory to write the time of each stage of the validation to, as a JSON report and a Chrome trace.",
+    )
+    parser.add_argument(
+        "--profile",
+        required=False,
+        action="store_true",
+        dest="profile",
+        help="Write cProfile stats for each config to the timings directory (default: ./timings/).",
+    )
+    parser.add_argument(
+        "--workers",
+        required=False,
+        type=int,
+        dest="workers",
+        default=1,
+        help="Specify the number of worker processes used to validate configs (default: 1).",
+    )
+    parser.add_argument(
+        "--json_report",
+        required=False,
+        dest="json_report",
+        default=None,
+        help="Specify a file to write the result, time and errors of each config to as JSON.",
+    )
+    parser.add_argument(
+        "--junit_report",
+        required=False,
+        dest="junit_report",
+        default=None,
+        help="Specify a file to write the result, time and errors of each config to as JUnit XML.",
+    )
+    parser.add_argument(
+        "--validator_cache",
+        required=False,
+        dest="validator_cache",
+        default=None,
+        help="Specify a directory to compile the schema validators to, so later runs import them rather than compile them again.",
+    )
 
     known_args, args = parser.parse_known_args()
+    if known_args.profile and not known_args.timings:
+        known_args.timings = "./timings/"
+    enable_timings(bool(known_args.timings))
 
     log_file_name = (
         os.path.normpath(
@@ -159,7 +637,13 @@ if __name__ == "__main__":
         if known_args.log_dir
         else None
     )
-    logger = ILogger("Config Validate", log_file_name, level=known_args.level)
+    logger = ILogger(
+        "Config Validate",
+        log_file_name,
+        level=known_args.level,
+        queued=known_args.log_queue,
+        log_format=known_args.log_format,
+    )
 
     try:
         result = main(logger, known_args)